@@ -4,19 +4,47 @@ Definite SDK for Python
 A Python library for interacting with the Definite API and tools.
 """
 
+from definite_sdk.cache import DiskQueryCache, QueryCache
 from definite_sdk.client import DefiniteClient
+from definite_sdk.columns import CubeColumns, SqlColumns
+from definite_sdk.exceptions import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    KVStoreConflictError,
+    QueryJobError,
+)
+from definite_sdk.incremental import IncrementalQuery
 from definite_sdk.integration import DefiniteIntegrationStore
+from definite_sdk.jobs import QueryJob
 from definite_sdk.message import DefiniteMessageClient
+from definite_sdk.profile import QueryProfile, QueryProfileLog
 from definite_sdk.secret import DefiniteSecretStore
-from definite_sdk.sql import DefiniteSqlClient
-from definite_sdk.store import DefiniteKVStore
+from definite_sdk.sql import DefiniteSqlClient, QueryOutcome
+from definite_sdk.store import CommitOutcome, DefiniteKVStore
+from definite_sdk.transport import Deadline, RetryPolicy
 
 __version__ = "0.1.14"
 __all__ = [
+    "CircuitOpenError",
+    "CommitOutcome",
+    "CubeColumns",
+    "Deadline",
+    "DeadlineExceededError",
     "DefiniteClient",
     "DefiniteIntegrationStore",
     "DefiniteMessageClient",
     "DefiniteSecretStore",
     "DefiniteSqlClient",
     "DefiniteKVStore",
+    "DiskQueryCache",
+    "IncrementalQuery",
+    "KVStoreConflictError",
+    "QueryCache",
+    "QueryJob",
+    "QueryJobError",
+    "QueryOutcome",
+    "QueryProfile",
+    "QueryProfileLog",
+    "RetryPolicy",
+    "SqlColumns",
 ]
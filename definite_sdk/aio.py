@@ -0,0 +1,832 @@
+"""Asyncio versions of the Definite clients, built on httpx."""
+
+import asyncio
+import os
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, cast
+
+if TYPE_CHECKING:
+    import httpx
+else:
+    try:
+        import httpx
+    except ImportError:
+        httpx = None  # type: ignore
+
+from definite_sdk.client import API_URL, ducklake_attach_sql
+from definite_sdk.exceptions import DeadlineExceededError, KVStoreConflictError
+from definite_sdk.integration import INTEGRATION_ENDPOINT
+from definite_sdk.message import MESSAGE_ENDPOINT
+from definite_sdk.secret import SECRET_STORE_ENDPOINT
+from definite_sdk.sql import SQL_ENDPOINT
+from definite_sdk.store import (
+    PATCH_FALLBACK_STATUS_CODES,
+    PATCH_UNSUPPORTED_STATUS_CODES,
+    STORE_ENDPOINT,
+    KVStoreState,
+    MergePolicy,
+    validate_merge_policy,
+)
+from definite_sdk.transport import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_READ_TIMEOUT,
+    IDEMPOTENT_METHODS,
+    CircuitBreakers,
+    Deadline,
+    DeadlineLike,
+    RetryPolicy,
+)
+
+
+def _extensions(
+    deadline: DeadlineLike, idempotent: Optional[bool] = None
+) -> Dict[str, Any]:
+    """Builds the request extensions read by RetryTransport."""
+    extensions: Dict[str, Any] = {}
+    if idempotent is not None:
+        extensions["idempotent"] = idempotent
+    deadline = Deadline.coerce(deadline)
+    if deadline is not None:
+        extensions["deadline"] = deadline
+    return extensions
+
+
+class RetryTransport(httpx.AsyncBaseTransport if httpx else object):  # type: ignore
+    """
+    An httpx transport that retries failed calls and guards each endpoint with
+    a circuit breaker, following the same RetryPolicy as DefiniteSession.
+
+    POSTs that are safe to retry are marked with the `idempotent` request
+    extension, and a Deadline passed as the `deadline` extension bounds the
+    call, retries included.
+    """
+
+    def __init__(
+        self, transport: "httpx.AsyncBaseTransport", retry_policy: RetryPolicy
+    ):
+        self._transport = transport
+        self.retry_policy = retry_policy
+        self.circuit_breakers = CircuitBreakers(retry_policy)
+
+    async def handle_async_request(self, request: "httpx.Request") -> "httpx.Response":
+        idempotent = request.extensions.get(
+            "idempotent", request.method in IDEMPOTENT_METHODS
+        )
+        deadline: Optional[Deadline] = request.extensions.get("deadline")
+        timeout = dict(request.extensions.get("timeout", {}))
+        policy = self.retry_policy
+        breaker = self.circuit_breakers.for_url(str(request.url))
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if deadline is not None:
+                deadline.check()
+                remaining = deadline.remaining()
+                request.extensions["timeout"] = {
+                    key: remaining if value is None else min(value, remaining)
+                    for key, value in timeout.items()
+                }
+            if breaker is not None:
+                breaker.before_request()
+
+            try:
+                response = await self._transport.handle_async_request(request)
+            except (
+                httpx.TimeoutException,
+                httpx.NetworkError,
+                httpx.RemoteProtocolError,
+            ) as exc:
+                if breaker is not None:
+                    breaker.record_failure()
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceededError(
+                        f"Deadline of {deadline.seconds:g}s exceeded: {exc}"
+                    ) from exc
+                sent = not isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+                delay = policy.delay_for_error(attempt, sent, idempotent)
+                if delay is None or (breaker is not None and breaker.is_open):
+                    raise
+            except httpx.HTTPError:
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            except BaseException:
+                if breaker is not None:
+                    breaker.release_trial()
+                raise
+            else:
+                if breaker is not None:
+                    if response.status_code >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                delay = policy.delay_for_status(
+                    attempt,
+                    response.status_code,
+                    response.headers.get("Retry-After"),
+                    idempotent,
+                )
+                if delay is None or (breaker is not None and breaker.is_open):
+                    return response
+                await response.aclose()
+
+            if deadline is not None and delay >= deadline.remaining():
+                raise DeadlineExceededError(
+                    f"Deadline of {deadline.seconds:g}s leaves no time to retry "
+                    f"{request.method} {request.url}"
+                )
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class AsyncDefiniteKVStore(KVStoreState):
+    """
+    Asyncio version of DefiniteKVStore.
+
+    Reads and writes are local; only loading, committing and deleting the store
+    touch the network. Commits send only the dirty keys as a patch, and can
+    merge conflicting changes, like DefiniteKVStore. Stores are always loaded
+    when opened; there is no lazy loading or `refresh()`.
+
+    >>> store = await client.get_kv_store("my_store")
+    >>> store["key"] = "value"
+    >>> await store.commit()
+    """
+
+    def __init__(
+        self,
+        name: str,
+        api_key: str,
+        api_url: str,
+        http: "httpx.AsyncClient",
+        *,
+        retry_policy: Optional[RetryPolicy] = None,
+        patch_unsupported: Optional[Set[str]] = None,
+    ):
+        """
+        Initializes an empty store. Use `AsyncDefiniteKVStore.load` (or
+        AsyncDefiniteClient.get_kv_store) to fetch its contents.
+
+        Args:
+            name (str): The name of the key-value store.
+            api_key (str): The API key for authorization.
+            api_url (str): The base URL for the Definite API.
+            http (httpx.AsyncClient): The shared HTTP client.
+            retry_policy (Optional[RetryPolicy]): The backoff between commit
+                attempts when merging. Defaults to RetryPolicy().
+            patch_unsupported (Optional[Set[str]]): The store URLs known to
+                reject patches, shared by the stores of a client.
+        """
+        super().__init__(name)
+        self._api_key = api_key
+        self._store_url = api_url + STORE_ENDPOINT
+        self._http = http
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._patch_unsupported = (
+            patch_unsupported if patch_unsupported is not None else set()
+        )
+
+    @classmethod
+    async def load(
+        cls,
+        name: str,
+        api_key: str,
+        api_url: str,
+        http: "httpx.AsyncClient",
+        deadline: DeadlineLike = None,
+        **kwargs: Any,
+    ) -> "AsyncDefiniteKVStore":
+        """
+        Creates the store and loads its current contents.
+
+        Keyword arguments are passed to the constructor.
+
+        Raises:
+            Exception: If the store fails to load.
+        """
+        store = cls(name, api_key, api_url, http, **kwargs)
+        response = await http.get(
+            store._store_url + f"/{name}",
+            headers={"Authorization": "Bearer " + api_key},
+            extensions=_extensions(deadline),
+        )
+        store._data, store._version_id = store._read_latest(response)
+        return store
+
+    def dirty_keys(self) -> Set[str]:
+        """Returns the keys whose values differ from the loaded store."""
+        return self._dirty_keys()
+
+    async def commit(
+        self,
+        *,
+        merge: Optional[MergePolicy] = None,
+        max_attempts: int = 5,
+        deadline: DeadlineLike = None,
+    ) -> bool:
+        """
+        Commits the current state of the store to the remote server.
+
+        See DefiniteKVStore.commit.
+
+        Returns:
+            bool: Whether changes were sent to the server.
+
+        Raises:
+            KVStoreConflictError: If the store changed remotely and no merge
+                policy was given, or merging did not succeed in time.
+            Exception: If the commit fails.
+        """
+        validate_merge_policy(merge)
+        deadline = Deadline.coerce(deadline)
+
+        attempt = 1
+        while True:
+            if not self._dirty_keys():
+                self._base.clear()
+                return False
+            try:
+                await self._send(deadline)
+                return True
+            except KVStoreConflictError:
+                if merge is None or attempt >= max_attempts:
+                    raise
+                delay = self._retry_policy.backoff(attempt)
+                if deadline is not None and deadline.remaining() <= delay:
+                    raise
+                await asyncio.sleep(delay)
+                await self._merge(merge, deadline)
+                attempt += 1
+
+    async def _send(self, deadline: Optional[Deadline]) -> None:
+        """Sends the dirty keys, or the whole store, to the server."""
+        headers = {"Authorization": "Bearer " + self._api_key}
+        response = None
+        patch_supported = self._store_url not in self._patch_unsupported
+        if self._version_id is not None and patch_supported:
+            response = await self._http.patch(
+                self._store_url,
+                json=self._patch(),
+                headers=headers,
+                extensions=_extensions(deadline),
+            )
+            if response.status_code in PATCH_UNSUPPORTED_STATUS_CODES:
+                self._patch_unsupported.add(self._store_url)
+            if response.status_code in PATCH_FALLBACK_STATUS_CODES:
+                response = None
+
+        if response is None:
+            response = await self._http.post(
+                self._store_url,
+                json=self._full_write(),
+                headers=headers,
+                extensions=_extensions(deadline),
+            )
+        self._finish_commit(response)
+
+    async def _merge(self, policy: MergePolicy, deadline: Optional[Deadline]) -> None:
+        """Merges the dirty keys into the latest version of the store."""
+        response = await self._http.get(
+            self._store_url + f"/{self._name}",
+            headers={"Authorization": "Bearer " + self._api_key},
+            extensions=_extensions(deadline),
+        )
+        theirs, version_id = self._read_latest(response)
+        self._merge_latest(theirs, version_id, policy)
+
+    async def delete(self, *, deadline: DeadlineLike = None) -> None:
+        """
+        Deletes the store from the remote server.
+
+        Raises:
+            Exception: If the delete fails.
+        """
+        response = await self._http.request(
+            "DELETE",
+            self._store_url,
+            json={"name": self._name},
+            headers={"Authorization": "Bearer " + self._api_key},
+            extensions=_extensions(deadline),
+        )
+
+        if response.status_code != 200:
+            raise Exception("Failed to delete the DefiniteKVStore: " + response.text)
+
+        self._data = {}
+        self._version_id = None
+        self._base.clear()
+
+    def __getitem__(self, key: str) -> Optional[str]:
+        return self._data.get(key)
+
+    def __setitem__(self, key: str, value: str) -> None:
+        assert isinstance(key, str)
+        assert isinstance(value, str)
+        self._set(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self._delete(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return repr(self._data)
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return self._data.get(key, default)
+
+
+class AsyncDefiniteSqlClient:
+    """
+    Asyncio version of DefiniteSqlClient.
+
+    >>> sql_client = client.get_sql_client()
+    >>> result = await sql_client.execute("SELECT * FROM my_table LIMIT 10")
+    """
+
+    def __init__(self, api_key: str, api_url: str, http: "httpx.AsyncClient"):
+        self._api_key = api_key
+        self._sql_url = api_url + SQL_ENDPOINT
+        self._http = http
+
+    async def execute(
+        self,
+        sql: str,
+        integration_id: Optional[str] = None,
+        *,
+        deadline: DeadlineLike = None,
+    ) -> Dict[str, Any]:
+        """
+        Executes a SQL query against a database integration.
+
+        See DefiniteSqlClient.execute.
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails.
+        """
+        payload: Dict[str, Any] = {"sql": sql}
+        if integration_id:
+            payload["integration_id"] = integration_id
+
+        response = await self._http.post(
+            self._sql_url,
+            json=payload,
+            headers={"Authorization": "Bearer " + self._api_key},
+            extensions=_extensions(deadline, idempotent=True),
+        )
+        response.raise_for_status()
+        return cast(Dict[str, Any], response.json())
+
+    async def execute_cube_query(
+        self,
+        cube_query: Dict[str, Any],
+        integration_id: Optional[str] = None,
+        persist: bool = True,
+        invalidate: bool = False,
+        raw: bool = False,
+        *,
+        deadline: DeadlineLike = None,
+    ) -> Dict[str, Any]:
+        """
+        Executes a Cube query against a Cube integration.
+
+        See DefiniteSqlClient.execute_cube_query.
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails.
+        """
+        payload: Dict[str, Any] = {"cube_query": cube_query}
+        if integration_id:
+            payload["integration_id"] = integration_id
+        if persist:
+            payload["persist"] = persist
+        if invalidate:
+            payload["invalidate"] = invalidate
+
+        url = self._sql_url
+        if raw:
+            url += "?raw=true"
+
+        response = await self._http.post(
+            url,
+            json=payload,
+            headers={"Authorization": "Bearer " + self._api_key},
+            extensions=_extensions(deadline, idempotent=True),
+        )
+        response.raise_for_status()
+        return cast(Dict[str, Any], response.json())
+
+
+class AsyncDefiniteSecretStore:
+    """Asyncio version of DefiniteSecretStore."""
+
+    def __init__(self, api_key: str, api_url: str, http: "httpx.AsyncClient"):
+        self._api_key = api_key
+        self._secret_store_url = api_url + SECRET_STORE_ENDPOINT
+        self._http = http
+
+    async def list_secrets(self, *, deadline: DeadlineLike = None) -> Iterator[str]:
+        """Lists all secrets in the store."""
+        response = await self._http.get(
+            self._secret_store_url,
+            headers={"Authorization": "Bearer " + self._api_key},
+            extensions=_extensions(deadline),
+        )
+        response.raise_for_status()
+        return iter(response.json()["secrets"])
+
+    async def get_secret(self, key: str, *, deadline: DeadlineLike = None) -> str:
+        """Retrieves the value of a secret."""
+        response = await self._http.get(
+            self._secret_store_url + f"/{key}",
+            headers={"Authorization": "Bearer " + self._api_key},
+            extensions=_extensions(deadline),
+        )
+        response.raise_for_status()
+        return str(response.json()["value"])
+
+    async def set_secret(
+        self, key: str, value: str, *, deadline: DeadlineLike = None
+    ) -> None:
+        """Sets the value of a secret."""
+        response = await self._http.post(
+            self._secret_store_url + f"/{key}",
+            json={"value": value},
+            headers={"Authorization": "Bearer " + self._api_key},
+            extensions=_extensions(deadline, idempotent=True),
+        )
+        response.raise_for_status()
+
+    async def delete_secret(self, key: str, *, deadline: DeadlineLike = None) -> None:
+        """Deletes a secret."""
+        response = await self._http.delete(
+            self._secret_store_url + f"/{key}",
+            headers={"Authorization": "Bearer " + self._api_key},
+            extensions=_extensions(deadline),
+        )
+        response.raise_for_status()
+
+
+class AsyncDefiniteIntegrationStore:
+    """Asyncio version of DefiniteIntegrationStore."""
+
+    def __init__(self, api_key: str, api_url: str, http: "httpx.AsyncClient"):
+        self._api_key = api_key
+        self._integrations_url = api_url + INTEGRATION_ENDPOINT
+        self._http = http
+
+    async def _get_page(
+        self, url: str, params: Dict[str, Any], deadline: DeadlineLike
+    ) -> List[Dict]:
+        response = await self._http.get(
+            url,
+            params=params,
+            headers={"Authorization": "Bearer " + self._api_key},
+            extensions=_extensions(deadline),
+        )
+        response.raise_for_status()
+        return cast(List[Dict], response.json().get("data", []))
+
+    async def list_integrations(
+        self,
+        *,
+        integration_type: Optional[str] = None,
+        category: Optional[str] = None,
+        deadline: DeadlineLike = None,
+    ) -> List[Dict]:
+        """Lists all integrations in the store."""
+        params: Dict[str, Any] = {}
+        if integration_type:
+            params["type"] = integration_type
+        if category:
+            params["category"] = category
+
+        integrations = await self._get_page(self._integrations_url, params, deadline)
+        return [{"id": i.get("id"), **i.get("details", {})} for i in integrations]
+
+    async def get_integration(
+        self, name: str, *, deadline: DeadlineLike = None
+    ) -> Dict:
+        """Retrieves an integration by name."""
+        integrations = await self._get_page(
+            self._integrations_url, {"name": name, "limit": 1}, deadline
+        )
+        if len(integrations) == 0:
+            raise Exception(f"Integration with name {name} not found")
+        return cast(Dict, integrations[0].get("details", {}))
+
+    async def get_integration_by_id(
+        self, integration_id: str, *, deadline: DeadlineLike = None
+    ) -> Dict:
+        """Retrieves an integration by ID."""
+        integrations = await self._get_page(
+            self._integrations_url, {"id": integration_id, "limit": 1}, deadline
+        )
+        if len(integrations) == 0:
+            raise Exception(f"Integration with ID {integration_id} not found")
+        return cast(Dict, integrations[0].get("details", {}))
+
+    async def lookup_duckdb_integration(self, *, deadline: DeadlineLike = None) -> Dict:
+        """Look up the team's DuckDB integration."""
+        integrations = await self._get_page(
+            self._integrations_url, {"type": "duckdb", "limit": 1}, deadline
+        )
+        if len(integrations) == 0:
+            raise Exception("Integration with type `duckdb` not found")
+        return cast(Dict, integrations[0].get("details", {}))
+
+    async def get_syncs(
+        self,
+        integration_id: str,
+        *,
+        limit: int = 50,
+        offset: int = 0,
+        desc: bool = True,
+        status: Optional[str] = None,
+        deadline: DeadlineLike = None,
+    ) -> List[Dict]:
+        """Retrieves sync runs (DAG runs) for an integration."""
+        params: Dict[str, Any] = {
+            "limit": limit,
+            "offset": offset,
+            "desc": str(desc).lower(),
+        }
+        if status:
+            params["status"] = status
+
+        return await self._get_page(
+            f"{self._integrations_url}/{integration_id}/syncs", params, deadline
+        )
+
+    async def get_latest_sync(
+        self, integration_id: str, *, deadline: DeadlineLike = None
+    ) -> Optional[Dict]:
+        """Retrieves the most recent sync run for an integration."""
+        syncs = await self.get_syncs(
+            integration_id, limit=1, desc=True, deadline=deadline
+        )
+        return syncs[0] if syncs else None
+
+
+class AsyncDefiniteMessageClient:
+    """Asyncio version of DefiniteMessageClient."""
+
+    def __init__(self, api_key: str, api_url: str, http: "httpx.AsyncClient"):
+        self._api_key = api_key
+        self._message_url = api_url + MESSAGE_ENDPOINT
+        self._http = http
+
+    async def _post(
+        self, url: str, payload: Dict[str, Any], deadline: DeadlineLike
+    ) -> Dict[str, Any]:
+        response = await self._http.post(
+            url,
+            json=payload,
+            headers={"Authorization": "Bearer " + self._api_key},
+            extensions=_extensions(deadline),
+        )
+        response.raise_for_status()
+        return cast(Dict[str, Any], response.json())
+
+    async def send_message(
+        self,
+        channel: str,
+        integration_id: str,
+        to: str,
+        content: str,
+        subject: Optional[str] = None,
+        blocks: Optional[List[Dict[str, Any]]] = None,
+        thread_ts: Optional[str] = None,
+        deadline: DeadlineLike = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Sends a message through the specified channel.
+
+        See DefiniteMessageClient.send_message.
+
+        Raises:
+            httpx.HTTPStatusError: If the API request fails.
+            ValueError: If the channel is not supported.
+        """
+        channel_lower = channel.lower()
+
+        if channel_lower == "slack":
+            payload: Dict[str, Any] = {
+                "integration_id": integration_id,
+                "channel_id": to,
+                "text": content,
+            }
+            if blocks:
+                payload["blocks"] = blocks
+            if thread_ts:
+                payload["thread_ts"] = thread_ts
+            payload.update(kwargs)
+            return await self._post(
+                f"{self._message_url}/slack/message", payload, deadline
+            )
+        elif channel_lower == "email":
+            payload = {
+                "toEmails": [e.strip() for e in to.split(",") if e.strip()],
+                "subject": subject or "",
+                "body": content,
+            }
+            payload.update(kwargs)
+            return await self._post(
+                f"{self._message_url}/email/message", payload, deadline
+            )
+        else:
+            raise ValueError(f"Unsupported channel: {channel}")
+
+    async def send_slack_message(
+        self,
+        integration_id: str,
+        channel_id: str,
+        text: str,
+        blocks: Optional[List[Dict[str, Any]]] = None,
+        thread_ts: Optional[str] = None,
+        deadline: DeadlineLike = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Convenience method to send a Slack message directly."""
+        return await self.send_message(
+            channel="slack",
+            integration_id=integration_id,
+            to=channel_id,
+            content=text,
+            blocks=blocks,
+            thread_ts=thread_ts,
+            deadline=deadline,
+            **kwargs,
+        )
+
+    async def send_email_message(
+        self,
+        to_emails: List[str],
+        subject: str,
+        body: str,
+        deadline: DeadlineLike = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Convenience method to send an email directly via SendGrid."""
+        return await self.send_message(
+            channel="email",
+            integration_id="",
+            to=",".join(to_emails),
+            content=body,
+            subject=subject,
+            deadline=deadline,
+            **kwargs,
+        )
+
+
+class AsyncDefiniteClient:
+    """
+    Asyncio client for interacting with the Definite API.
+
+    Mirrors DefiniteClient, with `async def` methods running on a shared,
+    non-blocking httpx connection pool.
+
+    >>> async with AsyncDefiniteClient("MY_API_KEY") as client:
+    ...     sql_client = client.get_sql_client()
+    ...     results = await asyncio.gather(
+    ...         sql_client.execute("SELECT 1"),
+    ...         sql_client.execute("SELECT 2"),
+    ...     )
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_url: str = API_URL,
+        *,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        retry_policy: Optional[RetryPolicy] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+    ):
+        """Creates an async definite client with the provided API key.
+
+        Args:
+            api_key: API key for authentication. If not provided, will look for
+                    DEFINITE_API_KEY or DEF_API_KEY environment variables.
+            api_url: Base URL for the Definite API.
+            pool_connections: Number of idle keep-alive connections to keep.
+            pool_maxsize: Maximum number of concurrent connections.
+            retry_policy: How calls that fail with transient errors are
+                retried. Defaults to RetryPolicy().
+            connect_timeout: Seconds to wait for a connection to the API.
+            read_timeout: Seconds to wait for the API between bytes of a
+                response.
+        """
+        if httpx is None:
+            raise ImportError(
+                "httpx package not installed. "
+                "Install with: pip install definite-sdk[async]"
+            )
+
+        if api_key is None:
+            api_key = os.getenv("DEFINITE_API_KEY") or os.getenv("DEF_API_KEY")
+            if not api_key:
+                raise ValueError(
+                    "API key must be provided or set in DEFINITE_API_KEY "
+                    "or DEF_API_KEY environment variable"
+                )
+
+        self.api_key = api_key
+        self.api_url = api_url
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=pool_maxsize,
+                max_keepalive_connections=pool_connections,
+            )
+        )
+        self._retry_policy = retry_policy or RetryPolicy()
+        # The store URLs that answered a patch as unsupported.
+        self._patch_unsupported: Set[str] = set()
+        self._http = httpx.AsyncClient(
+            transport=RetryTransport(transport, self._retry_policy),
+            timeout=httpx.Timeout(
+                read_timeout, connect=connect_timeout, pool=connect_timeout
+            ),
+        )
+
+    async def aclose(self) -> None:
+        """Closes the pooled connections held by the client."""
+        await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncDefiniteClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def get_kv_store(
+        self, name: str, *, deadline: DeadlineLike = None
+    ) -> AsyncDefiniteKVStore:
+        """Loads the key-value store with the provided name."""
+        return await AsyncDefiniteKVStore.load(
+            name,
+            self.api_key,
+            self.api_url,
+            self._http,
+            deadline=deadline,
+            retry_policy=self._retry_policy,
+            patch_unsupported=self._patch_unsupported,
+        )
+
+    def get_secret_store(self) -> AsyncDefiniteSecretStore:
+        """Initializes the secret store."""
+        return AsyncDefiniteSecretStore(self.api_key, self.api_url, self._http)
+
+    def get_integration_store(self) -> AsyncDefiniteIntegrationStore:
+        """Initializes the integration store."""
+        return AsyncDefiniteIntegrationStore(self.api_key, self.api_url, self._http)
+
+    def get_sql_client(self) -> AsyncDefiniteSqlClient:
+        """Initializes the SQL client for executing SQL queries."""
+        return AsyncDefiniteSqlClient(self.api_key, self.api_url, self._http)
+
+    def get_message_client(self) -> AsyncDefiniteMessageClient:
+        """Initializes the message client."""
+        return AsyncDefiniteMessageClient(self.api_key, self.api_url, self._http)
+
+    async def attach_ducklake(
+        self, alias: str = "lake", *, deadline: DeadlineLike = None
+    ) -> str:
+        """Generates SQL statements to attach DuckLake to a DuckDB connection.
+
+        See DefiniteClient.attach_ducklake.
+        """
+        integrations = await self.get_integration_store().list_integrations(
+            integration_type="ducklake", deadline=Deadline.coerce(deadline)
+        )
+        return ducklake_attach_sql(integrations, alias)
+
+    # Alias methods for consistency
+    async def kv_store(
+        self, name: str, *, deadline: DeadlineLike = None
+    ) -> AsyncDefiniteKVStore:
+        """Alias for get_kv_store."""
+        return await self.get_kv_store(name, deadline=deadline)
+
+    def secret_store(self) -> AsyncDefiniteSecretStore:
+        """Alias for get_secret_store."""
+        return self.get_secret_store()
+
+    def integration_store(self) -> AsyncDefiniteIntegrationStore:
+        """Alias for get_integration_store."""
+        return self.get_integration_store()
+
+    def message_client(self) -> AsyncDefiniteMessageClient:
+        """Alias for get_message_client."""
+        return self.get_message_client()
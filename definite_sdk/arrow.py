@@ -0,0 +1,281 @@
+"""Apache Arrow helpers for query results."""
+
+import re
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+
+import requests
+import urllib3
+
+from definite_sdk.columns import result_schema, sql_type_kind
+from definite_sdk.exceptions import DeadlineExceededError
+from definite_sdk.transport import Deadline
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def import_pyarrow() -> Any:
+    """Imports pyarrow, which is an optional dependency of the SDK."""
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "pyarrow package not installed. "
+            "Install with: pip install definite-sdk[arrow]"
+        )
+    return pyarrow
+
+
+def is_arrow_response(response: requests.Response) -> bool:
+    """Whether the API answered with an Arrow IPC stream."""
+    content_type = response.headers.get("Content-Type", "")
+    return content_type.split(";")[0].strip() == ARROW_STREAM_MEDIA_TYPE
+
+
+def read_arrow_stream(
+    response: requests.Response, deadline: Optional[Deadline] = None
+) -> "pa.RecordBatchReader":
+    """
+    Reads an Arrow IPC stream response batch by batch.
+
+    The batches are read straight from the socket into Arrow buffers, without
+    going through Python objects. The response is closed once the reader is
+    exhausted. A `deadline` bounds reading the stream, as in
+    `iter_response_chunks`.
+    """
+    pa = import_pyarrow()
+    response.raw.decode_content = True
+
+    def read(step: Any) -> Any:
+        if deadline is not None:
+            deadline.check()
+        try:
+            return step()
+        except (urllib3.exceptions.HTTPError, OSError) as exc:
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceededError(
+                    f"Deadline of {deadline.seconds:g}s exceeded: {exc}"
+                ) from exc
+            raise
+
+    stream = read(lambda: pa.ipc.open_stream(response.raw))
+
+    def batches() -> Iterator[Any]:
+        with response:
+            while True:
+                try:
+                    yield read(stream.read_next_batch)
+                except StopIteration:
+                    return
+
+    return pa.RecordBatchReader.from_batches(stream.schema, batches())
+
+
+# The number of leading record batches held back, when converting JSON rows,
+# while some column has only nulls and so no inferred type yet.
+MAX_BUFFERED_BATCHES = 8
+
+# Leading words of the SQL types that are converted to Arrow strings. Other
+# types without an Arrow equivalent here are inferred from their values.
+_STRING_SQL_TYPES = {"VARCHAR", "TEXT", "STRING", "CHAR", "BPCHAR", "UUID", "ENUM"}
+
+
+def arrow_type(sql_type: Optional[str]) -> Optional["pa.DataType"]:
+    """
+    Maps a SQL type name reported by the API to an Arrow type, or None if
+    the type has no fixed Arrow equivalent.
+
+    Decimals are converted to float64, like `SqlColumns` does.
+    """
+    pa = import_pyarrow()
+    kind = sql_type_kind(sql_type)
+    if kind is None or sql_type is None:
+        return None
+    name = sql_type.strip().upper()
+    if kind == "int":
+        return pa.int64()
+    if kind in ("float", "decimal"):
+        return pa.float64()
+    if kind == "bool":
+        return pa.bool_()
+    if kind == "date":
+        return pa.date32()
+    if kind == "timestamp":
+        zoned = name.startswith("TIMESTAMPTZ") or "TIME ZONE" in name
+        return pa.timestamp("us", tz="UTC" if zoned else None)
+    if re.split(r"[^A-Z0-9_]", name, 1)[0] in _STRING_SQL_TYPES:
+        return pa.string()
+    return None
+
+
+def _column_array(values: List[Any], type: Optional["pa.DataType"]) -> "pa.Array":
+    pa = import_pyarrow()
+    if type is None:
+        return pa.array(values)
+    try:
+        return pa.array(values, type=type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Dates and timestamps arrive as ISO 8601 strings.
+        return pa.array(values).cast(type)
+
+
+def _record_batch(
+    rows: List[Dict[str, Any]],
+    names: Optional[List[str]],
+    types: Dict[str, "pa.DataType"],
+) -> "pa.RecordBatch":
+    pa = import_pyarrow()
+    if names is None:
+        names = list(dict.fromkeys(name for row in rows for name in row))
+    arrays = [
+        _column_array([row.get(name) for row in rows], types.get(name))
+        for name in names
+    ]
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+def _widen(schema: "pa.Schema", other: "pa.Schema") -> "pa.Schema":
+    """Unifies two schemas, promoting null columns and ints to doubles."""
+    pa = import_pyarrow()
+    try:
+        return pa.unify_schemas([schema, other], promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as exc:
+        raise ValueError(
+            f"The column types of the query result change between rows: {exc}"
+        ) from exc
+
+
+def _conform(batch: "pa.RecordBatch", schema: "pa.Schema") -> "pa.RecordBatch":
+    """
+    Casts a batch to the schema of the reader, adding null columns for the
+    columns it lacks.
+
+    Raises:
+        ValueError: If the batch has a column that is not in the schema, or
+            values that do not fit its type.
+    """
+    pa = import_pyarrow()
+    new = [name for name in batch.schema.names if schema.get_field_index(name) < 0]
+    if new:
+        raise ValueError(
+            f"Column {new[0]!r} first appears after the start of the query "
+            "result, and the response does not declare its schema"
+        )
+    if not _widen(schema, batch.schema).equals(schema):
+        changed = next(
+            field.name
+            for field in batch.schema
+            if not pa.types.is_null(field.type)
+            and field.type != schema.field(field.name).type
+        )
+        raise ValueError(
+            f"Column {changed!r} holds {batch.schema.field(changed).type} values "
+            f"after the start of the query result, where it was inferred to be "
+            f"{schema.field(changed).type}, and the response does not declare "
+            "its schema"
+        )
+    arrays = [
+        (
+            batch.column(field.name).cast(field.type)
+            if field.name in batch.schema.names
+            else pa.nulls(batch.num_rows, field.type)
+        )
+        for field in schema
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def rows_to_record_batches(
+    row_batches: Iterable[List[Dict[str, Any]]],
+    fields: Optional[Dict[str, Any]] = None,
+) -> "pa.RecordBatchReader":
+    """
+    Converts batches of row dicts into Arrow record batches.
+
+    Each batch is converted column-wise into Arrow. The columns and their
+    types are taken from the `schema` or `columns` field of the response
+    when `fields` holds one once the first batch is read, which is when it
+    precedes the rows or there are none; see `iter_json_array`. Columns
+    without a declared type are inferred from their values: the first
+    batches are held back until every column has a non-null type, and their
+    types are widened to fit all of them.
+    A later batch is never narrowed to the inferred types; if its values do
+    not fit them, or it has a new column, ValueError is raised.
+
+    Args:
+        row_batches (Iterable[List[Dict[str, Any]]]): The rows, in batches.
+        fields (Optional[Dict[str, Any]]): The top-level fields of the
+            response, as filled in by `iter_row_batches`.
+    """
+    pa = import_pyarrow()
+    row_batches = iter(row_batches)
+    fields = {} if fields is None else fields
+
+    # The fields preceding the rows are known once the first batch is read.
+    first = next(row_batches, None)
+    declared = result_schema(fields)
+    names = [name for name, _ in declared] or None
+    types = {name: arrow_type(sql_type) for name, sql_type in declared}
+    types = {name: type for name, type in types.items() if type is not None}
+
+    if first is None:
+        schema = pa.schema(
+            [(name, types.get(name, pa.string())) for name in names or []]
+        )
+        return pa.RecordBatchReader.from_batches(schema, iter([]))
+
+    buffered = [_record_batch(first, names, types)]
+    schema = buffered[0].schema
+    while len(buffered) < MAX_BUFFERED_BATCHES and any(
+        pa.types.is_null(field.type) for field in schema
+    ):
+        rows = next(row_batches, None)
+        if rows is None:
+            break
+        buffered.append(_record_batch(rows, names, types))
+        schema = _widen(schema, buffered[-1].schema)
+
+    def batches() -> Iterator[Any]:
+        for batch in buffered:
+            yield _conform(batch, schema)
+        for rows in row_batches:
+            yield _conform(_record_batch(rows, names, types), schema)
+
+    return pa.RecordBatchReader.from_batches(schema, batches())
+
+
+def write_record_batches(reader: "pa.RecordBatchReader", sink: Any, format: str) -> int:
+    """
+    Writes the batches of a reader to a CSV or Parquet file as they arrive.
+
+    Each record batch becomes one Parquet row group, so only one batch is in
+    memory at a time.
+
+    Args:
+        reader (pa.RecordBatchReader): The batches to write.
+        sink (Any): A path or a writable binary file.
+        format (str): "csv" or "parquet".
+
+    Returns:
+        int: The number of rows written.
+    """
+    import_pyarrow()
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(sink, reader.schema)
+    elif format == "csv":
+        import pyarrow.csv
+
+        writer = pyarrow.csv.CSVWriter(sink, reader.schema)
+    else:
+        raise ValueError(f"Unsupported format for Arrow data: {format}")
+
+    rows = 0
+    with writer:
+        for batch in reader:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
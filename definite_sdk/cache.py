@@ -0,0 +1,417 @@
+"""Client-side caching of query results."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from definite_sdk.arrow import import_pyarrow
+from definite_sdk.params import Params, params_key
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+DEFAULT_CACHE_TTL = 300.0
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_DISK_CACHE_TTL = 24 * 60 * 60.0
+DEFAULT_DISK_CACHE_MAX_BYTES = 4 * 1024 * 1024 * 1024
+DISK_CACHE_FORMATS = ("arrow", "parquet")
+
+
+class CacheStats(NamedTuple):
+    """A snapshot of a cache's counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    revalidations: int = 0
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Normalizes a SQL statement for use in a cache key.
+
+    Runs of whitespace outside of quoted literals and identifiers are
+    collapsed to a single space, and surrounding whitespace and trailing
+    semicolons are removed. Quoted text is kept exactly as written.
+    """
+    out: List[str] = []
+    quote = None
+    pending_space = False
+    for char in sql:
+        if quote is not None:
+            out.append(char)
+            if char == quote:
+                quote = None
+        elif char.isspace():
+            pending_space = True
+        else:
+            if pending_space and out:
+                out.append(" ")
+            pending_space = False
+            out.append(char)
+            if char in ("'", '"'):
+                quote = char
+    return "".join(out).rstrip("; ")
+
+
+def sql_cache_key(
+    sql: str, integration_id: Optional[str], params: Optional[Params] = None
+) -> Tuple[Hashable, ...]:
+    """Returns the cache key of a SQL query and its bound parameters."""
+    key: Tuple[Hashable, ...] = ("sql", normalize_sql(sql), integration_id)
+    if params is not None:
+        key += (params_key(params),)
+    return key
+
+
+def cube_cache_key(
+    cube_query: Dict[str, Any], integration_id: Optional[str], raw: bool
+) -> Tuple[Hashable, ...]:
+    """Returns the cache key of a Cube query."""
+    payload = json.dumps(cube_query, sort_keys=True, separators=(",", ":"))
+    return ("cube", payload, integration_id, raw)
+
+
+class QueryCache:
+    """
+    An in-process cache of query results with a TTL and LRU eviction.
+
+    The cache is bounded by the total size of the cached responses; the least
+    recently used results are evicted first. Cached results are shared
+    between callers and should be treated as read-only.
+
+    Results that came with an ETag are kept after they expire, so that the
+    next request for them can be sent as a conditional request. If the API
+    answers that the result is unchanged, the cached result is served again
+    without downloading it.
+
+    >>> client = DefiniteClient("MY_API_KEY", query_cache=QueryCache(ttl=60))
+    >>> sql_client = client.get_sql_client()
+    >>> sql_client.execute("SELECT 1")  # fetched from the API
+    >>> sql_client.execute("SELECT 1")  # served from the cache
+    >>> sql_client.execute("SELECT 1", use_cache=False)  # bypasses the cache
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_CACHE_TTL,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ):
+        """
+        Args:
+            ttl (float): Seconds a result stays fresh after it was fetched.
+            max_bytes (int): Upper bound on the total size of the cached
+                responses. Results larger than this are not cached.
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: (
+            "OrderedDict[Hashable, Tuple[Any, int, float, Optional[str]]]"
+        ) = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._revalidations = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Returns the fresh result cached under `key`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            result, size, expires_at, etag = entry
+            if expires_at <= time.monotonic():
+                if etag is None:
+                    self._remove(key)
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return dict(result)
+
+    def stale(self, key: Hashable) -> Optional[Tuple[Dict[str, Any], str]]:
+        """
+        Returns the expired result cached under `key` with its ETag, or None.
+
+        The result can be served again once the API confirms it is unchanged;
+        see `revalidate`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[3] is None:
+                return None
+            return entry[0], entry[3]
+
+    def revalidate(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Marks the result cached under `key` as fresh again, after the API
+        answered that it is unchanged, and returns it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            result, size, _, etag = entry
+            self._entries[key] = (result, size, time.monotonic() + self.ttl, etag)
+            self._entries.move_to_end(key)
+            self._revalidations += 1
+        return dict(result)
+
+    def put(
+        self,
+        key: Hashable,
+        result: Dict[str, Any],
+        size: int,
+        etag: Optional[str] = None,
+    ) -> None:
+        """
+        Caches `result` under `key`.
+
+        Args:
+            key (Hashable): The cache key.
+            result (Dict[str, Any]): The query result.
+            size (int): The size of the result in bytes, as received.
+            etag (Optional[str]): The ETag the API sent with the result.
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (result, size, time.monotonic() + self.ttl, etag)
+            self._size += size
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Removes the result cached under `key`, if any."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Removes every cached result."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> CacheStats:
+        """Returns the cache's hit, miss and eviction counters and its size."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size,
+                revalidations=self._revalidations,
+            )
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _, _ = self._entries.pop(key)
+        self._size -= size
+
+
+class DiskQueryCache:
+    """
+    A persistent cache of Arrow query results stored as files in a directory.
+
+    Each result is written to one Arrow IPC or Parquet file, and hits are read
+    back through a memory map instead of being downloaded again. Files are
+    written to a temporary name and renamed into place, so several processes
+    can share one cache directory. Entries expire `ttl` seconds after they
+    were written, and the least recently read files are removed once the
+    directory holds more than `max_bytes`.
+
+    Requires the `arrow` extra: pip install definite-sdk[arrow]
+
+    >>> client = DefiniteClient(
+    ...     "MY_API_KEY", disk_cache=DiskQueryCache("~/.cache/definite")
+    ... )
+    >>> sql_client = client.get_sql_client()
+    >>> table = sql_client.execute_arrow("SELECT * FROM countries")
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: float = DEFAULT_DISK_CACHE_TTL,
+        max_bytes: int = DEFAULT_DISK_CACHE_MAX_BYTES,
+        format: str = "arrow",
+    ):
+        """
+        Args:
+            directory (str): The cache directory. It is created if missing.
+            ttl (float): Seconds a result stays fresh after it was written.
+            max_bytes (int): Upper bound on the total size of the cache files.
+            format (str): "arrow" for uncompressed Arrow IPC files, which are
+                read without copying, or "parquet" for smaller files that are
+                decoded when read.
+        """
+        if format not in DISK_CACHE_FORMATS:
+            raise ValueError(f"format must be one of {DISK_CACHE_FORMATS}")
+        import_pyarrow()
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.format = format
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path_for(self, key: Hashable) -> str:
+        """Returns the path of the file that caches the result under `key`."""
+        digest = hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.{self.format}")
+
+    def get(self, key: Hashable) -> Optional["pa.Table"]:
+        """Returns the fresh result cached under `key`, or None."""
+        path = self.path_for(key)
+        try:
+            modified = os.stat(path).st_mtime
+            if modified + self.ttl <= time.time():
+                self._remove(path)
+                table = None
+            else:
+                table = self._read(path)
+                # The access time orders eviction; the write time is kept.
+                os.utime(path, (time.time(), modified))
+        except (OSError, ValueError):
+            table = None
+
+        with self._lock:
+            if table is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return table
+
+    def put(self, key: Hashable, table: "pa.Table") -> None:
+        """Caches `table` under `key`."""
+        for _ in self.tee(key, table.to_reader()):
+            pass
+
+    def tee(
+        self, key: Hashable, reader: "pa.RecordBatchReader"
+    ) -> "pa.RecordBatchReader":
+        """
+        Caches the batches of `reader` as they are read.
+
+        Returns a reader over the same batches. The result is written to the
+        cache once the returned reader is exhausted; nothing is cached if it
+        is released before then or the stream fails.
+        """
+        pa = import_pyarrow()
+        path = self.path_for(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        def batches() -> Iterator[Any]:
+            writer = self._open_writer(tmp_path, reader.schema)
+            try:
+                for batch in reader:
+                    writer.write_batch(batch)
+                    yield batch
+                writer.close()
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    writer.close()
+                    os.remove(tmp_path)
+            self._evict()
+
+        return pa.RecordBatchReader.from_batches(reader.schema, batches())
+
+    def invalidate(self, key: Hashable) -> None:
+        """Removes the result cached under `key`, if any."""
+        self._remove(self.path_for(key))
+
+    def clear(self) -> None:
+        """Removes every cached result."""
+        for path, _, _ in self._files():
+            self._remove(path)
+
+    def stats(self) -> CacheStats:
+        """Returns the cache's hit, miss and eviction counters and its size."""
+        files = self._files()
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(files),
+                size_bytes=sum(size for _, size, _ in files),
+            )
+
+    def _read(self, path: str) -> "pa.Table":
+        pa = import_pyarrow()
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+
+            return pq.read_table(path, memory_map=True)
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def _open_writer(self, path: str, schema: "pa.Schema") -> Any:
+        pa = import_pyarrow()
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+
+            return pq.ParquetWriter(path, schema)
+        return pa.ipc.new_file(path, schema)
+
+    def _files(self) -> List[Tuple[str, int, float]]:
+        """Lists the cache files with their sizes and access times."""
+        files = []
+        suffix = f".{self.format}"
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(suffix):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((entry.path, stat.st_size, stat.st_atime))
+        return files
+
+    def _evict(self) -> None:
+        files = sorted(self._files(), key=lambda file: file[2])
+        size = sum(file_size for _, file_size, _ in files)
+        for path, file_size, _ in files:
+            if size <= self.max_bytes:
+                break
+            self._remove(path)
+            size -= file_size
+            with self._lock:
+                self._evictions += 1
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
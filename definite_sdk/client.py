@@ -1,25 +1,110 @@
 import os
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Union
 
+from definite_sdk.cache import DiskQueryCache, QueryCache
 from definite_sdk.integration import DefiniteIntegrationStore
 from definite_sdk.message import DefiniteMessageClient
+from definite_sdk.profile import QueryProfileLog
 from definite_sdk.secret import DefiniteSecretStore
 from definite_sdk.sql import DefiniteSqlClient
-from definite_sdk.store import DefiniteKVStore
+from definite_sdk.store import CommitOutcome, DefiniteKVStore, MergePolicy
+from definite_sdk.transport import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_READ_TIMEOUT,
+    Deadline,
+    DefiniteSession,
+    RetryPolicy,
+)
 
 API_URL = "https://api.definite.app"
 
 
+def ducklake_attach_sql(integrations: List[Dict], alias: str) -> str:
+    """Builds the DuckDB statements that attach DuckLake from its integrations.
+
+    Args:
+        integrations: The team's DuckLake integrations as returned by
+            DefiniteIntegrationStore.list_integrations.
+        alias: The alias name for the attached DuckLake database.
+
+    Returns:
+        str: SQL statements to execute for attaching DuckLake
+    """
+    if len(integrations) == 0:
+        raise Exception(
+            "DuckLake integration not found. Please make sure one is"
+            "created for your team at https://ui.definite.app/settings/integrations"
+        )
+
+    integration = integrations.pop()
+
+    # Generate SQL statements
+    create_secret_sql = f"""CREATE SECRET (
+            TYPE gcs,
+            KEY_ID '{integration["gcs_access_key_id"]}',
+            SECRET '{integration["gcs_secret_access_key"]}'
+        );"""
+
+    # Build PostgreSQL connection string
+    pg_conn_str = (
+        f"postgresql://{integration['pg_user']}:"
+        f"{integration['pg_password']}@"
+        f"{integration['pg_host']}:"
+        f"{integration['pg_port']}/"
+        f"{integration['pg_database']}"
+    )
+
+    attach_sql = (
+        f"ATTACH 'ducklake:postgres:{pg_conn_str}' AS {alias} "
+        f"(DATA_PATH 'gs://{integration['gcs_bucket_path']}', "
+        f"METADATA_SCHEMA '{integration['pg_schema']}');"
+    )
+
+    return f"{create_secret_sql}\n\n{attach_sql}"
+
+
 class DefiniteClient:
     """Client for interacting with the Definite API."""
 
-    def __init__(self, api_key: Optional[str] = None, api_url: str = API_URL):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_url: str = API_URL,
+        *,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        retry_policy: Optional[RetryPolicy] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        query_cache: Optional[QueryCache] = None,
+        disk_cache: Optional[DiskQueryCache] = None,
+        profile_log: Optional[QueryProfileLog] = None,
+    ):
         """Creates a definite client with the provided API key.
 
+        The client owns a single keep-alive connection pool that is shared by
+        every store and client it creates.
+
         Args:
             api_key: API key for authentication. If not provided, will look for
                     DEFINITE_API_KEY or DEF_API_KEY environment variables.
             api_url: Base URL for the Definite API.
+            pool_connections: Number of host connection pools to cache.
+            pool_maxsize: Maximum number of connections kept open per host.
+            retry_policy: How calls that fail with transient errors are
+                retried. Defaults to RetryPolicy().
+            connect_timeout: Seconds to wait for a connection to the API.
+            read_timeout: Seconds to wait for the API between bytes of a
+                response.
+            query_cache: Opt-in cache for query results, shared by every SQL
+                client created by this client.
+            disk_cache: Opt-in persistent cache for Arrow query results,
+                shared by every SQL client created by this client.
+            profile_log: Opt-in log of the timings and sizes of the queries
+                run by every SQL client created by this client.
 
         See: https://docs.definite.app/definite-api for how to obtain an API key.
         """
@@ -33,14 +118,150 @@ class DefiniteClient:
 
         self.api_key = api_key
         self.api_url = api_url
-
-    def get_kv_store(self, name: str) -> DefiniteKVStore:
+        self._session = DefiniteSession(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            retry_policy=retry_policy,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+        self.query_cache = query_cache
+        self.disk_cache = disk_cache
+        self.profile_log = profile_log
+
+    def close(self) -> None:
+        """Closes the pooled connections held by the client."""
+        self._session.close()
+
+    def __enter__(self) -> "DefiniteClient":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def get_kv_store(
+        self,
+        name: str,
+        *,
+        lazy: bool = False,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> DefiniteKVStore:
         """Initializes a key-value store with the provided name.
 
+        With `lazy=True` the store is not fetched until it is first read or
+        committed, or `prefetch()` is called.
+
         See DefiniteKVStore for more how to interact with the store.
         """
 
-        return DefiniteKVStore(name, self.api_key, self.api_url)
+        return DefiniteKVStore(
+            name,
+            self.api_key,
+            self.api_url,
+            self._session,
+            deadline=deadline,
+            lazy=lazy,
+        )
+
+    def get_kv_stores(
+        self,
+        names: Iterable[str],
+        *,
+        max_workers: Optional[int] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Dict[str, DefiniteKVStore]:
+        """Opens many key-value stores, loading them concurrently.
+
+        The stores are loaded on up to `max_workers` threads that share the
+        client's connection pool.
+
+        Args:
+            names: The names of the stores.
+            max_workers: The maximum number of stores loaded at once.
+                Defaults to the connection pool size.
+            deadline: Time limit for loading all the stores in seconds, or a
+                Deadline shared with other calls.
+
+        Returns:
+            The stores by name, in the order given.
+
+        Raises:
+            Exception: If a store fails to load.
+
+        Example:
+            >>> stores = client.get_kv_stores(
+            ...     f"dlt_state_{name}" for name in pipeline_names
+            ... )
+        """
+        if max_workers is None:
+            max_workers = self._session.pool_maxsize
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        stores = {name: self.get_kv_store(name, lazy=True) for name in names}
+        if not stores:
+            return stores
+
+        shared_deadline = Deadline.coerce(deadline)
+        workers = min(max_workers, len(stores))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(store.prefetch, deadline=shared_deadline)
+                for store in stores.values()
+            ]
+            for future in futures:
+                future.result()
+        return stores
+
+    def commit_all(
+        self,
+        stores: Iterable[DefiniteKVStore],
+        *,
+        merge: Optional[MergePolicy] = None,
+        max_workers: Optional[int] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> List[CommitOutcome]:
+        """Commits many key-value stores concurrently.
+
+        Stores without changes are skipped without a request, as are lazy
+        stores that were never loaded or written to. A failing commit does not
+        stop the others; its error is returned in its outcome instead.
+
+        Args:
+            stores: The stores to commit.
+            merge: The conflict policy passed to each store's commit().
+            max_workers: The maximum number of commits in flight at once.
+                Defaults to the connection pool size.
+            deadline: Time limit for the whole batch in seconds, or a Deadline
+                shared with other calls.
+
+        Returns:
+            One outcome per store, in the order given.
+
+        Example:
+            >>> for outcome in client.commit_all(stores.values()):
+            ...     if not outcome.ok:
+            ...         print(outcome.name, outcome.error)
+        """
+        if max_workers is None:
+            max_workers = self._session.pool_maxsize
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        stores = list(stores)
+        if not stores:
+            return []
+
+        shared_deadline = Deadline.coerce(deadline)
+
+        def commit(store: DefiniteKVStore) -> CommitOutcome:
+            try:
+                committed = store.commit(merge=merge, deadline=shared_deadline)
+            except Exception as exc:
+                return CommitOutcome(store.name, False, exc)
+            return CommitOutcome(store.name, committed, None)
+
+        workers = min(max_workers, len(stores))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(commit, stores))
 
     def get_secret_store(self) -> DefiniteSecretStore:
         """Initializes the secret store.
@@ -48,7 +269,7 @@ class DefiniteClient:
         See DefiniteSecretStore for more how to interact with the store.
         """
 
-        return DefiniteSecretStore(self.api_key, self.api_url)
+        return DefiniteSecretStore(self.api_key, self.api_url, self._session)
 
     def get_integration_store(self) -> DefiniteIntegrationStore:
         """Initializes the integration store.
@@ -56,7 +277,7 @@ class DefiniteClient:
         See DefiniteIntegrationStore for more how to interact with the store.
         """
 
-        return DefiniteIntegrationStore(self.api_key, self.api_url)
+        return DefiniteIntegrationStore(self.api_key, self.api_url, self._session)
 
     def get_sql_client(self) -> DefiniteSqlClient:
         """Initializes the SQL client for executing SQL queries.
@@ -64,9 +285,18 @@ class DefiniteClient:
         See DefiniteSqlClient for more how to execute SQL queries.
         """
 
-        return DefiniteSqlClient(self.api_key, self.api_url)
+        return DefiniteSqlClient(
+            self.api_key,
+            self.api_url,
+            self._session,
+            cache=self.query_cache,
+            disk_cache=self.disk_cache,
+            profile_log=self.profile_log,
+        )
 
-    def attach_ducklake(self, alias: str = "lake") -> str:
+    def attach_ducklake(
+        self, alias: str = "lake", *, deadline: Union[float, Deadline, None] = None
+    ) -> str:
         """Generates SQL statements to attach DuckLake to a DuckDB connection.
 
         This method fetches the team's DuckLake integration credentials and generates
@@ -75,6 +305,8 @@ class DefiniteClient:
 
         Args:
             alias: The alias name for the attached DuckLake database (default: "lake")
+            deadline: Time limit in seconds (or a Deadline) for fetching the
+                integration credentials.
 
         Returns:
             str: SQL statements to execute for attaching DuckLake
@@ -87,44 +319,20 @@ class DefiniteClient:
         # Fetch DuckLake integration details
         integrations_client = self.get_integration_store()
         integrations = integrations_client.list_integrations(
-            integration_type="ducklake"
-        )
-        if len(integrations) == 0:
-            raise Exception(
-                "DuckLake integration not found. Please make sure one is"
-                "created for your team at https://ui.definite.app/settings/integrations"
-            )
-
-        integration = integrations.pop()
-
-        # Generate SQL statements
-        create_secret_sql = f"""CREATE SECRET (
-            TYPE gcs,
-            KEY_ID '{integration["gcs_access_key_id"]}',
-            SECRET '{integration["gcs_secret_access_key"]}'
-        );"""
-
-        # Build PostgreSQL connection string
-        pg_conn_str = (
-            f"postgresql://{integration['pg_user']}:"
-            f"{integration['pg_password']}@"
-            f"{integration['pg_host']}:"
-            f"{integration['pg_port']}/"
-            f"{integration['pg_database']}"
+            integration_type="ducklake", deadline=Deadline.coerce(deadline)
         )
-
-        attach_sql = (
-            f"ATTACH 'ducklake:postgres:{pg_conn_str}' AS {alias} "
-            f"(DATA_PATH 'gs://{integration['gcs_bucket_path']}', "
-            f"METADATA_SCHEMA '{integration['pg_schema']}');"
-        )
-
-        return f"{create_secret_sql}\n\n{attach_sql}"
+        return ducklake_attach_sql(integrations, alias)
 
     # Alias methods for consistency
-    def kv_store(self, name: str) -> DefiniteKVStore:
+    def kv_store(
+        self,
+        name: str,
+        *,
+        lazy: bool = False,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> DefiniteKVStore:
         """Alias for get_kv_store."""
-        return self.get_kv_store(name)
+        return self.get_kv_store(name, lazy=lazy, deadline=deadline)
 
     def secret_store(self) -> DefiniteSecretStore:
         """Alias for get_secret_store."""
@@ -140,7 +348,7 @@ class DefiniteClient:
         See DefiniteMessageClient for more how to send messages.
         """
 
-        return DefiniteMessageClient(self.api_key, self.api_url)
+        return DefiniteMessageClient(self.api_key, self.api_url, self._session)
 
     def message_client(self) -> DefiniteMessageClient:
         """Alias for get_message_client."""
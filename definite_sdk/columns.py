@@ -0,0 +1,525 @@
+"""Decoding of query results into NumPy column arrays."""
+
+import decimal
+import re
+import warnings
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Column kinds decoded by `decode_column`, keyed by the leading word of the
+# SQL type names reported by the API.
+_SQL_TYPE_KINDS = {
+    "TINYINT": "int",
+    "SMALLINT": "int",
+    "INTEGER": "int",
+    "INT": "int",
+    "INT2": "int",
+    "INT4": "int",
+    "INT8": "int",
+    "BIGINT": "int",
+    "HUGEINT": "int",
+    "UTINYINT": "int",
+    "USMALLINT": "int",
+    "UINTEGER": "int",
+    "UBIGINT": "int",
+    "REAL": "float",
+    "FLOAT": "float",
+    "FLOAT4": "float",
+    "FLOAT8": "float",
+    "DOUBLE": "float",
+    "DECIMAL": "decimal",
+    "NUMERIC": "decimal",
+    "BOOLEAN": "bool",
+    "BOOL": "bool",
+    "DATE": "date",
+    "TIMESTAMP": "timestamp",
+    "TIMESTAMPTZ": "timestamp",
+    "DATETIME": "timestamp",
+}
+
+
+def import_numpy() -> Any:
+    """Imports numpy, which is an optional dependency of the SDK."""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "numpy package not installed. "
+            "Install with: pip install definite-sdk[numpy]"
+        )
+    return numpy
+
+
+def to_datetime64(values: Sequence[Any], unit: str = "ms") -> "np.ndarray":
+    """
+    Converts ISO 8601 strings to a datetime64 array in one call.
+
+    Nulls become NaT. Timestamps with a "Z" suffix or a UTC offset are
+    converted to naive UTC values.
+    """
+    np = import_numpy()
+    text = np.array(["NaT" if value is None else value for value in values])
+    if text.dtype.kind == "U" and text.size:
+        text = np.char.rstrip(text, "Z")
+    with warnings.catch_warnings():
+        # numpy warns that it drops the offset after applying it.
+        warnings.simplefilter("ignore", UserWarning)
+        return text.astype(f"datetime64[{unit}]")
+
+
+def to_numeric(values: Sequence[Any]) -> "np.ndarray":
+    """
+    Converts numbers, or numbers serialized as strings, to a numeric array.
+
+    The result is int64 when every value is an integer, and float64 with NaN
+    for nulls otherwise.
+    """
+    np = import_numpy()
+    floats = np.array(
+        ["nan" if value is None else value for value in values], dtype=np.float64
+    )
+    first = next((value for value in values if value is not None), None)
+    integral = isinstance(first, int) or (
+        isinstance(first, str) and first.lstrip("-").isdigit()
+    )
+    if (
+        integral
+        and not np.isnan(floats).any()
+        and np.array_equal(floats, np.trunc(floats))
+    ):
+        return np.array(values, dtype=np.int64)
+    return floats
+
+
+def factorize(values: Sequence[Any]) -> "Categorical":
+    """
+    Encodes values as integer codes into their distinct values.
+
+    Categories keep the order in which they first appear. Nulls get the
+    code -1.
+    """
+    np = import_numpy()
+    mapping: Dict[Any, int] = {}
+    codes = np.fromiter(
+        (
+            -1 if value is None else mapping.setdefault(value, len(mapping))
+            for value in values
+        ),
+        dtype=np.int32,
+        count=len(values),
+    )
+    categories = np.empty(len(mapping), dtype=object)
+    categories[:] = list(mapping)
+    return Categorical(codes, categories)
+
+
+class Categorical(NamedTuple):
+    """A column stored as integer codes into an array of categories."""
+
+    codes: "np.ndarray"
+    categories: "np.ndarray"
+
+    def values(self) -> "np.ndarray":
+        """Returns the decoded values, with None for nulls."""
+        np = import_numpy()
+        values = np.empty(len(self.codes), dtype=object)
+        present = self.codes >= 0
+        values[present] = self.categories[self.codes[present]]
+        return values
+
+
+class Pivot(NamedTuple):
+    """A measure pivoted into a 2D array of row labels by column labels."""
+
+    rows: "np.ndarray"
+    columns: "np.ndarray"
+    values: "np.ndarray"
+
+
+class CubeColumns:
+    """
+    A Cube query result decoded into one NumPy array per member.
+
+    Time dimensions are datetime64 arrays, measures are int64 or float64
+    arrays (NaN for nulls), and dimensions are Categorical codes.
+
+    >>> columns = sql_client.execute_cube_columns(cube_query)
+    >>> columns["sales.date.month"]
+    array(['2024-01-01T00:00:00.000', ...], dtype='datetime64[ms]')
+    >>> pivot = columns.pivot("sales.date.month", "sales.region", "sales.total")
+    >>> growth = pivot.values[1:] / pivot.values[:-1] - 1
+    """
+
+    def __init__(
+        self,
+        time_dimensions: Dict[str, "np.ndarray"],
+        measures: Dict[str, "np.ndarray"],
+        dimensions: Dict[str, Categorical],
+        length: int,
+    ):
+        """
+        Args:
+            time_dimensions (Dict[str, np.ndarray]): datetime64 arrays.
+            measures (Dict[str, np.ndarray]): Numeric arrays.
+            dimensions (Dict[str, Categorical]): Categorically encoded arrays.
+            length (int): The number of rows.
+        """
+        self.time_dimensions = time_dimensions
+        self.measures = measures
+        self.dimensions = dimensions
+        self._length = length
+
+    @classmethod
+    def from_result(
+        cls, result: Dict[str, Any], cube_query: Optional[Dict[str, Any]] = None
+    ) -> "CubeColumns":
+        """
+        Decodes the rows of an `execute_cube_query` result.
+
+        Members are classified using the query if given, and otherwise using
+        the result's annotation. Members that cannot be classified are
+        treated as dimensions.
+
+        Args:
+            result (Dict[str, Any]): The result of `execute_cube_query`.
+            cube_query (Optional[Dict[str, Any]]): The query that produced it.
+
+        Returns:
+            CubeColumns: The decoded columns.
+        """
+        rows: List[Dict[str, Any]] = result.get("data") or []
+        measure_names, time_names = _classify_members(result, cube_query)
+
+        names: Dict[str, None] = dict.fromkeys(rows[0]) if rows else {}
+        for name in list(measure_names) + list(time_names):
+            names.setdefault(name, None)
+
+        time_dimensions = {}
+        measures = {}
+        dimensions = {}
+        for name in names:
+            values = [row.get(name) for row in rows]
+            if name in measure_names:
+                measures[name] = to_numeric(values)
+            elif name in time_names:
+                time_dimensions[name] = to_datetime64(values)
+            else:
+                dimensions[name] = factorize(values)
+        return cls(time_dimensions, measures, dimensions, len(rows))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, name: object) -> bool:
+        return (
+            name in self.time_dimensions
+            or name in self.measures
+            or name in self.dimensions
+        )
+
+    def __getitem__(self, name: str) -> "np.ndarray":
+        """
+        Returns the array of a member. Dimensions are returned as their
+        decoded values; use `dimensions[name].codes` for the codes.
+        """
+        if name in self.time_dimensions:
+            return self.time_dimensions[name]
+        if name in self.measures:
+            return self.measures[name]
+        if name in self.dimensions:
+            return self.dimensions[name].values()
+        raise KeyError(name)
+
+    def pivot(
+        self,
+        index: str,
+        columns: Optional[str],
+        values: str,
+        fill_value: float = float("nan"),
+    ) -> Pivot:
+        """
+        Pivots a measure into a 2D array, typically with time as the index.
+
+        Rows are sorted by the index member and columns by the column member.
+        Cells without a row in the result hold `fill_value`; when several rows
+        share a cell, the last one wins.
+
+        Args:
+            index (str): The member whose values label the rows.
+            columns (Optional[str]): The member whose values label the
+                columns, or None for a single column.
+            values (str): The measure to pivot.
+            fill_value (float): The value of empty cells.
+
+        Returns:
+            Pivot: The row labels, column labels and a float64 array of shape
+                (len(rows), len(columns)).
+
+        Example:
+            >>> pivot = columns.pivot("sales.date.month", "sales.region",
+            ...                       "sales.total_amount")
+            >>> rolling = np.cumsum(pivot.values, axis=0)
+        """
+        np = import_numpy()
+        row_labels, row_codes = self._codes(index)
+        if columns is None:
+            column_labels = np.array([values], dtype=object)
+            column_codes = np.zeros(len(self), dtype=np.intp)
+        else:
+            column_labels, column_codes = self._codes(columns)
+
+        matrix = np.full((len(row_labels), len(column_labels)), fill_value)
+        matrix[row_codes, column_codes] = self.measures[values]
+        return Pivot(row_labels, column_labels, matrix)
+
+    def _codes(self, name: str) -> Any:
+        """Returns the sorted distinct values of a member and each row's code."""
+        np = import_numpy()
+        if name in self.dimensions:
+            # Sort the categories rather than the rows, with nulls last.
+            categorical = self.dimensions[name]
+            order = np.argsort(categorical.categories.astype(str), kind="stable")
+            ranks = np.empty(len(order) + 1, dtype=np.intp)
+            ranks[order] = np.arange(len(order))
+            ranks[-1] = len(order)
+            labels = np.append(categorical.categories[order], None)
+            used, codes = np.unique(ranks[categorical.codes], return_inverse=True)
+            return labels[used], codes
+        return np.unique(self[name], return_inverse=True)
+
+
+def _classify_members(
+    result: Dict[str, Any], cube_query: Optional[Dict[str, Any]]
+) -> Any:
+    """Returns the names of the measures and time dimension members."""
+    if cube_query is not None:
+        measures = set(cube_query.get("measures") or [])
+        times = set()
+        for time_dimension in cube_query.get("timeDimensions") or []:
+            granularity = time_dimension.get("granularity")
+            if granularity:
+                times.add(time_dimension["dimension"])
+                times.add(f"{time_dimension['dimension']}.{granularity}")
+        return measures, times
+
+    annotation = result.get("annotation") or {}
+    measures = set(annotation.get("measures") or {})
+    times = set(annotation.get("timeDimensions") or {})
+    return measures, times
+
+
+def sql_type_kind(sql_type: Optional[str]) -> Optional[str]:
+    """
+    Maps a SQL type name such as "DECIMAL(18,2)" or "TIMESTAMP WITH TIME ZONE"
+    to the kind of array it is decoded into, or None if it is not known.
+    """
+    if not sql_type:
+        return None
+    match = re.match(r"[A-Za-z0-9_]+", sql_type.strip())
+    if match is None:
+        return None
+    return _SQL_TYPE_KINDS.get(match.group(0).upper(), "string")
+
+
+def infer_kind(values: Sequence[Any]) -> str:
+    """Infers the kind of a column without a type from its JSON values."""
+    types = {type(value) for value in values if value is not None}
+    if types == {bool}:
+        return "bool"
+    if types == {int}:
+        return "int"
+    if types and types <= {int, float}:
+        return "float"
+    return "string"
+
+
+def decode_column(
+    values: Sequence[Any], kind: str, decimals: str = "float"
+) -> "np.ma.MaskedArray":
+    """
+    Decodes the JSON values of one column into a typed masked array.
+
+    Nulls are masked. Each kind is converted in a single NumPy call:
+    "int" to int64, "float" to float64, "bool" to bool, "date" to
+    datetime64[D], "timestamp" to datetime64[us] and "string" to object.
+    "decimal" becomes float64, or an object array of decimal.Decimal when
+    `decimals` is "decimal".
+
+    Args:
+        values (Sequence[Any]): The column's values, with None for nulls.
+        kind (str): The kind of the column, see `sql_type_kind`.
+        decimals (str): "float" or "decimal".
+
+    Returns:
+        np.ma.MaskedArray: The decoded column.
+    """
+    np = import_numpy()
+    mask = np.fromiter(
+        (value is None for value in values), dtype=bool, count=len(values)
+    )
+    if kind == "decimal":
+        if decimals == "decimal":
+            data = np.empty(len(values), dtype=object)
+            data[:] = [
+                None if value is None else decimal.Decimal(str(value))
+                for value in values
+            ]
+            return np.ma.MaskedArray(data, mask=mask)
+        kind = "float"
+
+    if kind == "int":
+        data = np.array([0 if value is None else value for value in values])
+        data = data.astype(np.int64)
+    elif kind == "float":
+        data = np.array(
+            ["nan" if value is None else value for value in values], dtype=np.float64
+        )
+    elif kind == "bool":
+        data = np.array([bool(value) for value in values], dtype=bool)
+    elif kind == "date":
+        data = to_datetime64(values, "D")
+    elif kind == "timestamp":
+        data = to_datetime64(values, "us")
+    else:
+        data = np.empty(len(values), dtype=object)
+        data[:] = values
+    return np.ma.MaskedArray(data, mask=mask)
+
+
+def result_schema(result: Dict[str, Any]) -> List[Tuple[str, Optional[str]]]:
+    """
+    Returns the (name, type) of each column described by a query result.
+
+    The schema is read from a `schema` or `columns` field holding column
+    names or objects with a `name` and a `type`. Types are None when the
+    result does not report them.
+    """
+    for field in ("schema", "columns"):
+        described = result.get(field)
+        if not isinstance(described, list):
+            continue
+        schema: List[Tuple[str, Optional[str]]] = []
+        for column in described:
+            if isinstance(column, dict):
+                sql_type = column.get("type") or column.get("data_type")
+                schema.append((column["name"], sql_type))
+            else:
+                schema.append((str(column), None))
+        return schema
+    return []
+
+
+class SqlColumns:
+    """
+    A SQL query result decoded into one typed, null-masked NumPy array per
+    column.
+
+    Column types are taken from the schema in the response when it has one,
+    and inferred from the JSON values otherwise.
+
+    >>> columns = sql_client.execute_columns("SELECT * FROM orders")
+    >>> columns["created_at"]
+    masked_array(data=['2024-01-01T09:30:00.000000', --], ...)
+    >>> df = columns.to_pandas()
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, "np.ma.MaskedArray"],
+        types: Dict[str, Optional[str]],
+        length: int,
+    ):
+        """
+        Args:
+            columns (Dict[str, np.ma.MaskedArray]): The decoded columns.
+            types (Dict[str, Optional[str]]): The SQL type of each column, if
+                known.
+            length (int): The number of rows.
+        """
+        self.columns = columns
+        self.types = types
+        self._length = length
+
+    @classmethod
+    def from_result(
+        cls, result: Dict[str, Any], decimals: str = "float"
+    ) -> "SqlColumns":
+        """
+        Decodes the rows of an `execute` result.
+
+        Args:
+            result (Dict[str, Any]): The result of `execute`.
+            decimals (str): "float" to decode DECIMAL columns as float64, or
+                "decimal" for exact decimal.Decimal values.
+
+        Returns:
+            SqlColumns: The decoded columns.
+        """
+        if decimals not in ("float", "decimal"):
+            raise ValueError('decimals must be "float" or "decimal"')
+
+        rows: List[Dict[str, Any]] = result.get("data") or []
+        schema = result_schema(result)
+        if not schema and rows:
+            schema = [(name, None) for name in rows[0]]
+
+        columns = {}
+        for name, sql_type in schema:
+            values = [row.get(name) for row in rows]
+            kind = sql_type_kind(sql_type) or infer_kind(values)
+            columns[name] = decode_column(values, kind, decimals)
+        return cls(columns, dict(schema), len(rows))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> "np.ma.MaskedArray":
+        return self.columns[name]
+
+    def to_pandas(self) -> "pd.DataFrame":
+        """
+        Returns the columns as a pandas DataFrame.
+
+        Integer, float and boolean columns use pandas' nullable dtypes, so
+        nulls stay missing values instead of turning integers into floats.
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError(
+                "pandas package not installed. Install with: pip install pandas"
+            )
+
+        np = import_numpy()
+        frame = {}
+        for name, column in self.columns.items():
+            data = column.data
+            mask = np.ma.getmaskarray(column)
+            if data.dtype.kind == "i":
+                frame[name] = pd.arrays.IntegerArray(data, mask)
+            elif data.dtype.kind == "f":
+                frame[name] = pd.arrays.FloatingArray(data, mask)
+            elif data.dtype.kind == "b":
+                frame[name] = pd.arrays.BooleanArray(data, mask)
+            else:
+                frame[name] = data
+        return pd.DataFrame(frame, index=pd.RangeIndex(self._length))
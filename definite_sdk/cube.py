@@ -0,0 +1,120 @@
+"""Merging of compatible Cube queries into shared requests."""
+
+import json
+from typing import Any, Dict, List, Tuple
+
+# Keys that limit the rows a query returns. Without an explicit order, Cube
+# orders rows by the first time dimension with a granularity, or else by the
+# first measure, so the rows of a query can depend on its measures.
+_ROW_LIMIT_KEYS = ("limit", "offset")
+
+
+def _order_fields(cube_query: Dict[str, Any]) -> List[str]:
+    order = cube_query.get("order")
+    if isinstance(order, dict):
+        return list(order)
+    if isinstance(order, list):
+        return [item[0] for item in order if isinstance(item, (list, tuple))]
+    return []
+
+
+def is_mergeable(cube_query: Dict[str, Any]) -> bool:
+    """
+    Whether the query returns the same rows, in the same order, when other
+    measures are added to it, so it can share a request with queries that
+    differ only in measures.
+
+    The query needs an explicit `order` that does not use its measures. A
+    query without a `limit` or `offset` can instead rely on Cube's default
+    order by a time dimension with a granularity.
+    """
+    if not cube_query.get("measures") or cube_query.get("ungrouped"):
+        return False
+    order_fields = _order_fields(cube_query)
+    if order_fields:
+        return not set(cube_query["measures"]).intersection(order_fields)
+    if any(key in cube_query for key in _ROW_LIMIT_KEYS):
+        return False
+    return any(
+        isinstance(time_dimension, dict) and time_dimension.get("granularity")
+        for time_dimension in cube_query.get("timeDimensions") or []
+    )
+
+
+def merge_key(cube_query: Dict[str, Any]) -> str:
+    """Returns a key shared by queries that differ only in their measures."""
+    rest = {key: value for key, value in cube_query.items() if key != "measures"}
+    return json.dumps(rest, sort_keys=True, separators=(",", ":"))
+
+
+def plan_cube_queries(
+    cube_queries: List[Dict[str, Any]],
+) -> List[Tuple[Dict[str, Any], List[int]]]:
+    """
+    Groups queries that can be answered by one request.
+
+    Returns:
+        List[Tuple[Dict[str, Any], List[int]]]: The queries to send, each with
+            the indexes of the original queries it answers. Identical queries
+            always share a request; mergeable queries that differ only in
+            measures are sent as one query with the union of their measures.
+    """
+    plan: List[Tuple[Dict[str, Any], List[int]]] = []
+    groups: Dict[str, int] = {}
+    for index, cube_query in enumerate(cube_queries):
+        if is_mergeable(cube_query):
+            key = "merge:" + merge_key(cube_query)
+        else:
+            key = "exact:" + json.dumps(cube_query, sort_keys=True)
+
+        position = groups.get(key)
+        if position is None:
+            groups[key] = len(plan)
+            plan.append((dict(cube_query), [index]))
+            continue
+
+        merged, indexes = plan[position]
+        indexes.append(index)
+        measures = merged["measures"]
+        for measure in cube_query.get("measures", []):
+            if measure not in measures:
+                measures = measures + [measure]
+        merged["measures"] = measures
+    return plan
+
+
+def can_split(result: Dict[str, Any]) -> bool:
+    """Whether the rows of a merged result can be split per query."""
+    data = result.get("data")
+    return isinstance(data, list) and all(isinstance(row, dict) for row in data)
+
+
+def split_cube_result(
+    result: Dict[str, Any],
+    cube_query: Dict[str, Any],
+    merged_query: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Extracts the result of one of the queries merged into `merged_query`.
+
+    The measures that were only added by other queries are removed from the
+    rows and from the result's annotation, if it has one.
+    """
+    extra = set(merged_query.get("measures", [])) - set(cube_query.get("measures", []))
+    if not extra:
+        return result
+
+    split = dict(result)
+    split["data"] = [
+        {key: value for key, value in row.items() if key not in extra}
+        for row in result["data"]
+    ]
+    annotation = result.get("annotation")
+    if isinstance(annotation, dict) and isinstance(annotation.get("measures"), dict):
+        split["annotation"] = dict(annotation)
+        split["annotation"]["measures"] = {
+            key: value
+            for key, value in annotation["measures"].items()
+            if key not in extra
+        }
+    return split
@@ -0,0 +1,37 @@
+"""Exceptions raised by the Definite SDK."""
+
+from typing import Optional
+
+import requests
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without contacting the API while an endpoint's circuit is open.
+
+    The circuit opens after repeated server errors or connection failures on an
+    endpoint, and closes again once a trial request succeeds.
+    """
+
+
+class DeadlineExceededError(requests.Timeout):
+    """Raised when a call's deadline runs out, including time spent retrying."""
+
+
+class QueryJobError(Exception):
+    """Raised when the result of a query job that failed or was cancelled is
+    requested."""
+
+    def __init__(self, message: str, job_id: str, status: str):
+        super().__init__(message)
+        self.job_id = job_id
+        self.status = status
+
+
+class KVStoreConflictError(Exception):
+    """Raised when a DefiniteKVStore commit is rejected because the store was
+    modified since it was loaded."""
+
+    def __init__(self, message: str, name: str, version_id: Optional[str]):
+        super().__init__(message)
+        self.name = name
+        self.version_id = version_id
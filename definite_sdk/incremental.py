@@ -0,0 +1,192 @@
+"""Incremental fetching of query results past a stored watermark."""
+
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Union
+
+from definite_sdk.store import DefiniteKVStore
+from definite_sdk.transport import Deadline
+
+if TYPE_CHECKING:
+    from definite_sdk.sql import DefiniteSqlClient
+
+
+def sql_literal(value: Any) -> str:
+    """
+    Renders a watermark value as a SQL literal.
+
+    Raises:
+        TypeError: If the value is not a string, number or boolean.
+    """
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    raise TypeError(f"Unsupported watermark type: {type(value).__name__}")
+
+
+class IncrementalQuery:
+    """
+    A query that only fetches the rows past the last stored watermark.
+
+    The watermark is the largest value of the cursor column seen so far. It
+    is kept in a DefiniteKVStore as JSON, and is only saved by `commit()`, so
+    a run that fails before committing is fetched again on the next run.
+    Rows are selected with `cursor > watermark`; rows that arrive later with
+    a cursor value equal to the watermark are not fetched.
+
+    >>> store = client.get_kv_store("sync_state")
+    >>> sync = sql_client.incremental(
+    ...     "SELECT * FROM orders", "updated_at", store, key="orders"
+    ... )
+    >>> result = sync.fetch()
+    >>> load(result["data"])
+    >>> sync.commit()
+    """
+
+    def __init__(
+        self,
+        sql_client: "DefiniteSqlClient",
+        sql: str,
+        cursor_column: str,
+        store: DefiniteKVStore,
+        key: str,
+        integration_id: Optional[str] = None,
+        initial: Any = None,
+    ):
+        """
+        Args:
+            sql_client (DefiniteSqlClient): The client that runs the query.
+            sql (str): The query. Its rows are filtered on the cursor column.
+            cursor_column (str): A column that increases as rows are added or
+                updated, such as an ID or an `updated_at` timestamp.
+            store (DefiniteKVStore): The store that keeps the watermark.
+            key (str): The store key of the watermark.
+            integration_id (Optional[str]): The integration ID to query against.
+            initial (Any): The watermark to start from when none is stored.
+                All rows are fetched if not provided.
+        """
+        self.sql = sql
+        self.cursor_column = cursor_column
+        self.store = store
+        self.key = key
+        self.integration_id = integration_id
+        self.initial = initial
+        self.pending_watermark: Any = None
+        self._sql_client = sql_client
+
+    @property
+    def watermark(self) -> Any:
+        """The stored watermark, or `initial` if none is stored."""
+        stored = self.store.get(self.key)
+        if stored is None:
+            return self.initial
+        return json.loads(stored)
+
+    def build_sql(self, watermark: Any = None) -> str:
+        """Returns the query that selects the rows past `watermark`."""
+        column = '"' + self.cursor_column.replace('"', '""') + '"'
+        query = f"SELECT * FROM ({self.sql}) AS incremental"
+        if watermark is not None:
+            query += f" WHERE {column} > {sql_literal(watermark)}"
+        return query + f" ORDER BY {column}"
+
+    def fetch(self, *, deadline: Union[float, Deadline, None] = None) -> Dict[str, Any]:
+        """
+        Fetches the rows past the stored watermark.
+
+        Args:
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
+
+        Returns:
+            Dict[str, Any]: The query result as returned by the API.
+
+        Raises:
+            requests.HTTPError: If the API request fails.
+        """
+        result = self._sql_client.execute(
+            self.build_sql(self.watermark),
+            self.integration_id,
+            use_cache=False,
+            deadline=deadline,
+        )
+        self._advance(self._cursor_values(result.get("data") or []))
+        return result
+
+    def fetch_iter(
+        self,
+        *,
+        batch_size: int = 1000,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Streams the rows past the stored watermark in batches.
+
+        The pending watermark advances past each batch once the next one is
+        requested, so `commit()` after a partial run saves the progress made
+        on the batches that were processed. The last cursor value of a batch
+        is held back until a batch with a larger value arrives or the stream
+        ends, since more rows with that value may follow.
+
+        Args:
+            batch_size (int): The maximum number of rows per batch.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                request in seconds, or a Deadline shared with other calls.
+
+        Yields:
+            List[Dict[str, Any]]: Lists of up to `batch_size` rows.
+        """
+        held: Any = None
+        for rows in self._sql_client.execute_iter(
+            self.build_sql(self.watermark),
+            self.integration_id,
+            batch_size=batch_size,
+            deadline=deadline,
+        ):
+            values = self._cursor_values(rows)
+            # Rows arrive ordered by the cursor, so every row with the held
+            # back value has been seen once a larger value arrives.
+            if held is not None and values and min(values) > held:
+                self._advance([held])
+                held = None
+            yield rows
+            if values:
+                last = max(values)
+                self._advance([value for value in values if value < last])
+                held = last if held is None else max(held, last)
+        if held is not None:
+            self._advance([held])
+
+    def commit(self, *, deadline: Union[float, Deadline, None] = None) -> bool:
+        """
+        Saves the watermark of the fetched rows to the store.
+
+        Args:
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
+
+        Returns:
+            bool: Whether a new watermark was saved. Nothing is saved when no
+                new rows were fetched.
+
+        Raises:
+            Exception: If the store commit fails.
+        """
+        if self.pending_watermark is None:
+            return False
+        self.store[self.key] = json.dumps(self.pending_watermark)
+        self.store.commit(deadline=deadline)
+        self.pending_watermark = None
+        return True
+
+    def _cursor_values(self, rows: List[Dict[str, Any]]) -> List[Any]:
+        values = [row.get(self.cursor_column) for row in rows]
+        return [value for value in values if value is not None]
+
+    def _advance(self, values: List[Any]) -> None:
+        if self.pending_watermark is not None:
+            values = values + [self.pending_watermark]
+        if values:
+            self.pending_watermark = max(values)
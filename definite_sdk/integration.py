@@ -1,6 +1,6 @@
-from typing import Dict, List, Optional, cast
+from typing import Dict, List, Optional, Union, cast
 
-import requests
+from definite_sdk.transport import Deadline, DefiniteSession, resolve_session
 
 INTEGRATION_ENDPOINT = "/v1/api/integrations"
 
@@ -19,21 +19,27 @@ class DefiniteIntegrationStore:
     >>> integration_store.get_integration_by_id("integration_id")
     """
 
-    def __init__(self, api_key: str, api_url: str):
+    def __init__(
+        self, api_key: str, api_url: str, session: Optional[DefiniteSession] = None
+    ):
         """
         Initializes the DefiniteSecretStore
 
         Args:
             api_key (str): The API key for authorization.
+            session (Optional[DefiniteSession]): The shared HTTP session. A new
+                one is created if not provided.
         """
         self._api_key = api_key
         self._integrations_url = api_url + INTEGRATION_ENDPOINT
+        self._session = resolve_session(session)
 
     def list_integrations(
         self,
         *,
         integration_type: Optional[str] = None,
         category: Optional[str] = None,
+        deadline: Union[float, Deadline, None] = None,
     ) -> List[Dict]:
         """
         Lists all integrations in the store.
@@ -41,6 +47,8 @@ class DefiniteIntegrationStore:
         Args:
             integration_type (str): Optional type filter
             category (str): Optional category filter
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
 
         Returns:
             Iterator[str]: An iterator of integrations.
@@ -51,10 +59,11 @@ class DefiniteIntegrationStore:
         if category:
             params |= {"category": category}
 
-        response = requests.get(
+        response = self._session.get(
             self._integrations_url,
             params=params,
             headers={"Authorization": "Bearer " + self._api_key},
+            deadline=deadline,
         )
         response.raise_for_status()
         cursor_page = response.json()
@@ -62,20 +71,25 @@ class DefiniteIntegrationStore:
         details = [{"id": i.get("id"), **i.get("details", {})} for i in integrations]
         return cast(List[Dict], details)
 
-    def get_integration(self, name: str) -> Dict:
+    def get_integration(
+        self, name: str, *, deadline: Union[float, Deadline, None] = None
+    ) -> Dict:
         """
         Retrieves an integration by name.
 
         Args:
             name (str): The name of the integration.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
 
         Returns:
             str: The value of the integration.
         """
-        response = requests.get(
+        response = self._session.get(
             self._integrations_url,
             params={"name": name, "limit": 1},
             headers={"Authorization": "Bearer " + self._api_key},
+            deadline=deadline,
         )
         response.raise_for_status()
         cursor_page = response.json()
@@ -85,20 +99,25 @@ class DefiniteIntegrationStore:
         integration = integrations[0]
         return integration.get("details", {})
 
-    def get_integration_by_id(self, integration_id: str) -> Dict:
+    def get_integration_by_id(
+        self, integration_id: str, *, deadline: Union[float, Deadline, None] = None
+    ) -> Dict:
         """
         Retrieves an integration by ID.
 
         Args:
             integration_id (str): The ID of the integration.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
 
         Returns:
             dict: The integration details.
         """
-        response = requests.get(
+        response = self._session.get(
             self._integrations_url,
             params={"id": integration_id, "limit": 1},
             headers={"Authorization": "Bearer " + self._api_key},
+            deadline=deadline,
         )
         response.raise_for_status()
         cursor_page = response.json()
@@ -108,18 +127,25 @@ class DefiniteIntegrationStore:
         integration = integrations[0]
         return integration.get("details", {})
 
-    def lookup_duckdb_integration(self) -> Dict:
+    def lookup_duckdb_integration(
+        self, *, deadline: Union[float, Deadline, None] = None
+    ) -> Dict:
         """
         Look up the team's DuckDB integration.
 
+        Args:
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
+
         Returns:
             Optional[Tuple[str, str]]: Tuple of (integration_id, connection_uri)
                 if found, None if no DuckDB integration exists.
         """
-        response = requests.get(
+        response = self._session.get(
             self._integrations_url,
             params={"type": "duckdb", "limit": 1},
             headers={"Authorization": "Bearer " + self._api_key},
+            deadline=deadline,
         )
         response.raise_for_status()
         cursor_page = response.json()
@@ -137,6 +163,7 @@ class DefiniteIntegrationStore:
         offset: int = 0,
         desc: bool = True,
         status: Optional[str] = None,
+        deadline: Union[float, Deadline, None] = None,
     ) -> List[Dict]:
         """
         Retrieves sync runs (DAG runs) for an integration.
@@ -147,6 +174,8 @@ class DefiniteIntegrationStore:
             offset (int): Number of results to skip for pagination (default: 0).
             desc (bool): Sort by created_at descending if True (default: True).
             status (str): Optional filter by status ("STARTED", "SUCCESS", "FAILED").
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
 
         Returns:
             List[Dict]: List of DAG run records with keys:
@@ -167,24 +196,29 @@ class DefiniteIntegrationStore:
         if status:
             params["status"] = status
 
-        response = requests.get(
+        response = self._session.get(
             f"{self._integrations_url}/{integration_id}/syncs",
             params=params,
             headers={"Authorization": "Bearer " + self._api_key},
+            deadline=deadline,
         )
         response.raise_for_status()
         cursor_page = response.json()
         return cast(List[Dict], cursor_page.get("data", []))
 
-    def get_latest_sync(self, integration_id: str) -> Optional[Dict]:
+    def get_latest_sync(
+        self, integration_id: str, *, deadline: Union[float, Deadline, None] = None
+    ) -> Optional[Dict]:
         """
         Retrieves the most recent sync run for an integration.
 
         Args:
             integration_id (str): The ID of the integration.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
 
         Returns:
             Optional[Dict]: The most recent DAG run, or None if no syncs exist.
         """
-        syncs = self.get_syncs(integration_id, limit=1, desc=True)
+        syncs = self.get_syncs(integration_id, limit=1, desc=True, deadline=deadline)
         return syncs[0] if syncs else None
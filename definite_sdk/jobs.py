@@ -0,0 +1,229 @@
+"""Long-running SQL queries executed as server-side jobs."""
+
+import time
+from typing import Any, Dict, Iterator, List, Optional, Union, cast
+
+from definite_sdk.exceptions import DeadlineExceededError, QueryJobError
+from definite_sdk.streaming import iter_row_batches, read_json_response
+from definite_sdk.transport import Deadline, DefiniteSession, parse_retry_after
+
+JOBS_ENDPOINT = "/v1/query/jobs"
+
+JOB_PENDING_STATES = frozenset({"queued", "running"})
+JOB_SUCCEEDED = "succeeded"
+
+DEFAULT_POLL_INTERVAL = 0.25
+DEFAULT_MAX_POLL_INTERVAL = 5.0
+POLL_BACKOFF = 1.5
+
+
+class QueryJob:
+    """
+    A handle to a SQL query running as a job on the Definite API.
+
+    Submitting a job returns as soon as the query is queued, so no connection
+    or thread is held while it runs. The handle polls for completion, starting
+    quickly and backing off to `max_poll_interval` for long queries.
+
+    >>> job = sql_client.submit("SELECT * FROM large_table")
+    >>> job.status()
+    'running'
+    >>> result = job.result(timeout=600)
+    >>> job.cancel()
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        api_key: str,
+        api_url: str,
+        session: DefiniteSession,
+        info: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            job_id (str): The job's ID.
+            api_key (str): The API key for authorization.
+            api_url (str): The base URL for the Definite API.
+            session (DefiniteSession): The shared HTTP session.
+            info (Optional[Dict[str, Any]]): The job's last known description.
+        """
+        self.job_id = job_id
+        self.info: Dict[str, Any] = info or {"job_id": job_id, "status": "queued"}
+        self._api_key = api_key
+        self._job_url = f"{api_url}{JOBS_ENDPOINT}/{job_id}"
+        self._session = session
+        self._poll_after: Optional[float] = None
+
+    def __repr__(self) -> str:
+        return f"QueryJob({self.job_id!r}, status={self.info.get('status')!r})"
+
+    @property
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": "Bearer " + self._api_key}
+
+    def status(self, *, deadline: Union[float, Deadline, None] = None) -> str:
+        """
+        Fetches the job's current status.
+
+        Args:
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
+
+        Returns:
+            str: One of "queued", "running", "succeeded", "failed" or
+                "cancelled".
+
+        Raises:
+            requests.HTTPError: If the API request fails.
+        """
+        response = self._session.get(
+            self._job_url, headers=self._headers, deadline=deadline
+        )
+        response.raise_for_status()
+        self.info = response.json()
+        retry_after = response.headers.get("Retry-After")
+        self._poll_after = parse_retry_after(retry_after) if retry_after else None
+        return cast(str, self.info["status"])
+
+    def done(self, *, deadline: Union[float, Deadline, None] = None) -> bool:
+        """Fetches the job's status and returns whether it has finished."""
+        return self.status(deadline=deadline) not in JOB_PENDING_STATES
+
+    def wait(
+        self,
+        timeout: Optional[float] = None,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+    ) -> str:
+        """
+        Polls the job until it finishes.
+
+        The delay between polls starts at `poll_interval` and grows with each
+        poll up to `max_poll_interval`. A `Retry-After` header on a status
+        response overrides the delay.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait before giving up.
+                Waits indefinitely if not provided.
+            poll_interval (float): Seconds before the second poll.
+            max_poll_interval (float): Upper bound on the delay between polls.
+
+        Returns:
+            str: The job's final status.
+
+        Raises:
+            DeadlineExceededError: If the job is still running after
+                `timeout` seconds. The job itself keeps running.
+        """
+        deadline = Deadline.coerce(timeout)
+        delay = poll_interval
+        while True:
+            status = self.status(deadline=deadline)
+            if status not in JOB_PENDING_STATES:
+                return status
+
+            sleep_for = self._poll_after if self._poll_after is not None else delay
+            if deadline is not None:
+                if deadline.remaining() <= 0:
+                    raise DeadlineExceededError(
+                        f"Query job {self.job_id} still {status} after {timeout:g}s"
+                    )
+                sleep_for = min(sleep_for, deadline.remaining())
+            time.sleep(sleep_for)
+            delay = min(delay * POLL_BACKOFF, max_poll_interval)
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Waits for the job to finish and returns its result.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for the job to finish
+                and its result to download.
+
+        Returns:
+            Dict[str, Any]: The query result, as returned by `execute`.
+
+        Raises:
+            QueryJobError: If the job failed or was cancelled.
+            DeadlineExceededError: If the job does not finish in time.
+            requests.HTTPError: If the API request fails.
+        """
+        deadline = Deadline.coerce(timeout)
+        self._wait_for_success(deadline)
+        response = self._session.get(
+            self._job_url + "/result",
+            headers=self._headers,
+            deadline=deadline,
+            stream=True,
+        )
+        return cast(Dict[str, Any], read_json_response(response, deadline).value)
+
+    def iter_result(
+        self, timeout: Optional[float] = None, *, batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Waits for the job to finish and streams its result rows in batches.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for the job to finish.
+            batch_size (int): The maximum number of rows per batch.
+
+        Yields:
+            List[Dict[str, Any]]: Lists of up to `batch_size` rows.
+
+        Raises:
+            QueryJobError: If the job failed or was cancelled.
+            DeadlineExceededError: If the job does not finish in time.
+            requests.HTTPError: If the API request fails.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        deadline = Deadline.coerce(timeout)
+        self._wait_for_success(deadline)
+        response = self._session.get(
+            self._job_url + "/result",
+            headers=self._headers,
+            deadline=deadline,
+            stream=True,
+        )
+        try:
+            response.raise_for_status()
+        except BaseException:
+            response.close()
+            raise
+        yield from iter_row_batches(response, batch_size, deadline=deadline)
+
+    def cancel(self, *, deadline: Union[float, Deadline, None] = None) -> bool:
+        """
+        Cancels the job.
+
+        Args:
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
+
+        Returns:
+            bool: True if the job was cancelled, False if it had already
+                finished.
+
+        Raises:
+            requests.HTTPError: If the API request fails.
+        """
+        response = self._session.delete(
+            self._job_url, headers=self._headers, deadline=deadline
+        )
+        if response.status_code == 409:
+            return False
+        response.raise_for_status()
+        self.info["status"] = "cancelled"
+        return True
+
+    def _wait_for_success(self, deadline: Optional[Deadline]) -> None:
+        status = self.info.get("status")
+        if status in JOB_PENDING_STATES:
+            status = self.wait(deadline.remaining() if deadline else None)
+        if status != JOB_SUCCEEDED:
+            error = self.info.get("error") or f"Query job {self.job_id} {status}"
+            raise QueryJobError(error, self.job_id, str(status))
@@ -1,6 +1,6 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-import requests
+from definite_sdk.transport import Deadline, DefiniteSession, resolve_session
 
 MESSAGE_ENDPOINT = "/v3"
 
@@ -33,16 +33,21 @@ class DefiniteMessageClient:
     ... )
     """
 
-    def __init__(self, api_key: str, api_url: str):
+    def __init__(
+        self, api_key: str, api_url: str, session: Optional[DefiniteSession] = None
+    ):
         """
         Initializes the DefiniteMessageClient.
 
         Args:
             api_key (str): The API key for authorization.
             api_url (str): The base URL for the Definite API.
+            session (Optional[DefiniteSession]): The shared HTTP session. A new
+                one is created if not provided.
         """
         self._api_key = api_key
         self._message_url = api_url + MESSAGE_ENDPOINT
+        self._session = resolve_session(session)
 
     def send_message(
         self,
@@ -53,6 +58,7 @@ class DefiniteMessageClient:
         subject: Optional[str] = None,
         blocks: Optional[List[Dict[str, Any]]] = None,
         thread_ts: Optional[str] = None,
+        deadline: Union[float, Deadline, None] = None,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """
@@ -66,6 +72,8 @@ class DefiniteMessageClient:
             subject (Optional[str]): Subject line (used for email).
             blocks (Optional[List[Dict[str, Any]]]): Slack Block Kit blocks for formatting.
             thread_ts (Optional[str]): Slack thread timestamp to reply to.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
             **kwargs: Additional channel-specific parameters.
 
         Returns:
@@ -105,6 +113,7 @@ class DefiniteMessageClient:
                 text=content,
                 blocks=blocks,
                 thread_ts=thread_ts,
+                deadline=deadline,
                 **kwargs,
             )
         elif channel_lower == "email":
@@ -113,6 +122,7 @@ class DefiniteMessageClient:
                 to_emails=to_emails,
                 subject=subject or "",
                 body=content,
+                deadline=deadline,
                 **kwargs,
             )
         else:
@@ -125,6 +135,7 @@ class DefiniteMessageClient:
         text: str,
         blocks: Optional[List[Dict[str, Any]]] = None,
         thread_ts: Optional[str] = None,
+        deadline: Union[float, Deadline, None] = None,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """
@@ -136,6 +147,8 @@ class DefiniteMessageClient:
             text (str): The message text.
             blocks (Optional[List[Dict[str, Any]]]): Slack blocks for formatting.
             thread_ts (Optional[str]): Thread timestamp for replies.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
             **kwargs: Additional Slack-specific parameters.
 
         Returns:
@@ -157,10 +170,11 @@ class DefiniteMessageClient:
         # Add any additional kwargs to the payload
         payload.update(kwargs)
 
-        response = requests.post(
+        response = self._session.post(
             url,
             json=payload,
             headers={"Authorization": "Bearer " + self._api_key},
+            deadline=deadline,
         )
         response.raise_for_status()
         return response.json()
@@ -172,6 +186,7 @@ class DefiniteMessageClient:
         text: str,
         blocks: Optional[List[Dict[str, Any]]] = None,
         thread_ts: Optional[str] = None,
+        deadline: Union[float, Deadline, None] = None,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """
@@ -183,6 +198,8 @@ class DefiniteMessageClient:
             text (str): The message text.
             blocks (Optional[List[Dict[str, Any]]]): Slack blocks for formatting.
             thread_ts (Optional[str]): Thread timestamp for replies.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
             **kwargs: Additional Slack-specific parameters.
 
         Returns:
@@ -203,6 +220,7 @@ class DefiniteMessageClient:
             content=text,
             blocks=blocks,
             thread_ts=thread_ts,
+            deadline=deadline,
             **kwargs,
         )
 
@@ -211,6 +229,7 @@ class DefiniteMessageClient:
         to_emails: List[str],
         subject: str,
         body: str,
+        deadline: Union[float, Deadline, None] = None,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """
@@ -220,6 +239,8 @@ class DefiniteMessageClient:
             to_emails (List[str]): List of recipient email addresses.
             subject (str): The email subject line.
             body (str): The email body (HTML supported).
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
             **kwargs: Additional email-specific parameters.
 
         Returns:
@@ -235,10 +256,11 @@ class DefiniteMessageClient:
 
         payload.update(kwargs)
 
-        response = requests.post(
+        response = self._session.post(
             url,
             json=payload,
             headers={"Authorization": "Bearer " + self._api_key},
+            deadline=deadline,
         )
         response.raise_for_status()
         return response.json()
@@ -248,6 +270,7 @@ class DefiniteMessageClient:
         to_emails: List[str],
         subject: str,
         body: str,
+        deadline: Union[float, Deadline, None] = None,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """
@@ -257,6 +280,8 @@ class DefiniteMessageClient:
             to_emails (List[str]): List of recipient email addresses.
             subject (str): The email subject line.
             body (str): The email body (HTML supported).
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
             **kwargs: Additional email-specific parameters.
 
         Returns:
@@ -276,5 +301,6 @@ class DefiniteMessageClient:
             to=",".join(to_emails),
             content=body,
             subject=subject,
+            deadline=deadline,
             **kwargs,
         )
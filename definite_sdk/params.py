@@ -0,0 +1,54 @@
+"""Bound parameters of SQL queries."""
+
+import datetime
+import decimal
+import json
+import uuid
+from typing import Any, Dict, List, Mapping, Sequence, Union
+
+Params = Union[Sequence[Any], Mapping[str, Any]]
+
+
+def encode_param(value: Any) -> Any:
+    """
+    Converts a parameter value to its JSON representation.
+
+    Dates and times are sent as ISO 8601 strings, and decimals and UUIDs as
+    strings, so that no precision is lost.
+
+    Raises:
+        TypeError: If the value has no JSON representation.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [encode_param(item) for item in value]
+    raise TypeError(f"Unsupported parameter type: {type(value).__name__}")
+
+
+def encode_params(params: Params) -> Union[List[Any], Dict[str, Any]]:
+    """
+    Converts the parameters of a query to JSON.
+
+    Args:
+        params (Params): Positional parameters as a sequence, or named
+            parameters as a mapping.
+
+    Raises:
+        TypeError: If a value has no JSON representation, or `params` is a
+            string.
+    """
+    if isinstance(params, Mapping):
+        return {str(name): encode_param(value) for name, value in params.items()}
+    if isinstance(params, (str, bytes)):
+        raise TypeError("params must be a sequence or a mapping, not a string")
+    return [encode_param(value) for value in params]
+
+
+def params_key(params: Params) -> str:
+    """Returns a canonical form of `params` for use in a cache key."""
+    return json.dumps(encode_params(params), sort_keys=True, separators=(",", ":"))
@@ -0,0 +1,187 @@
+"""Profiling of query requests."""
+
+import re
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Mapping, NamedTuple, Optional
+
+DEFAULT_PROFILE_LOG_SIZE = 1000
+
+# Response headers other than Server-Timing that report server-side timings.
+TIMING_HEADER_PATTERN = re.compile(r"^x-[\w-]*-(time|duration|elapsed)$", re.IGNORECASE)
+
+# A timing header value: a number of milliseconds, with an optional "ms" or
+# "s" unit.
+TIMING_VALUE_PATTERN = re.compile(
+    r"^\s*([0-9]*\.?[0-9]+(?:e[-+]?[0-9]+)?)\s*(ms|s)?\s*$", re.IGNORECASE
+)
+
+
+class QueryProfile(NamedTuple):
+    """
+    The timings and sizes of one query request.
+
+    Times are in seconds. `transfer_time` is the time spent waiting for the
+    response body after the headers arrived, and `decode_time` the time
+    spent parsing it.
+    """
+
+    kind: str
+    query: str
+    started_at: float
+    total_time: float
+    time_to_first_byte: float
+    transfer_time: float
+    decode_time: float
+    request_bytes: int
+    response_bytes: int
+    row_count: Optional[int]
+    status_code: Optional[int]
+    server_timing: Dict[str, float]
+    cached: bool = False
+    error: Optional[str] = None
+
+
+def parse_server_timing(headers: Mapping[str, str]) -> Dict[str, float]:
+    """
+    Collects the server-side timings reported in response headers.
+
+    Reads the `dur` of each metric of the `Server-Timing` header, and any
+    `X-...-Time`/`X-...-Duration` header with a numeric value, read as
+    milliseconds unless it ends in "s". Values are in milliseconds.
+    """
+    timings: Dict[str, float] = {}
+    for name, value in headers.items():
+        if name.lower() == "server-timing":
+            for metric in value.split(","):
+                parts = [part.strip() for part in metric.split(";")]
+                for param in parts[1:]:
+                    key, _, duration = param.partition("=")
+                    if key.strip().lower() == "dur" and parts[0]:
+                        try:
+                            timings[parts[0]] = float(duration.strip('" '))
+                        except ValueError:
+                            pass
+        elif TIMING_HEADER_PATTERN.match(name):
+            match = TIMING_VALUE_PATTERN.match(value)
+            if match is not None:
+                number, unit = match.groups()
+                scale = 1000.0 if (unit or "").lower() == "s" else 1.0
+                timings[name.lower()] = float(number) * scale
+    return timings
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class QueryProfileLog:
+    """
+    An in-process log of query profiles.
+
+    The log keeps the latest `maxlen` profiles and can be shared between
+    threads and clients.
+
+    >>> log = QueryProfileLog()
+    >>> client = DefiniteClient("MY_API_KEY", profile_log=log)
+    >>> client.get_sql_client().execute("SELECT * FROM orders")
+    >>> log.last().time_to_first_byte
+    >>> log.slowest(5)
+    >>> log.summary()
+    """
+
+    def __init__(self, maxlen: int = DEFAULT_PROFILE_LOG_SIZE):
+        """
+        Args:
+            maxlen (int): The number of profiles to keep. The oldest profiles
+                are dropped first.
+        """
+        self._profiles: Deque[QueryProfile] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, profile: QueryProfile) -> None:
+        """Adds a profile to the log."""
+        with self._lock:
+            self._profiles.append(profile)
+
+    def profiles(
+        self,
+        kind: Optional[str] = None,
+        since: Optional[float] = None,
+        min_total_time: Optional[float] = None,
+        cached: Optional[bool] = None,
+    ) -> List[QueryProfile]:
+        """
+        Returns the logged profiles, oldest first.
+
+        Args:
+            kind (Optional[str]): Only return "sql" or "cube" profiles.
+            since (Optional[float]): Only return requests started at or after
+                this UNIX timestamp.
+            min_total_time (Optional[float]): Only return requests that took
+                at least this many seconds.
+            cached (Optional[bool]): Only return cache hits, or only requests
+                sent to the API.
+        """
+        with self._lock:
+            profiles = list(self._profiles)
+        return [
+            profile
+            for profile in profiles
+            if (kind is None or profile.kind == kind)
+            and (since is None or profile.started_at >= since)
+            and (min_total_time is None or profile.total_time >= min_total_time)
+            and (cached is None or profile.cached == cached)
+        ]
+
+    def last(self) -> Optional[QueryProfile]:
+        """Returns the latest profile, or None if the log is empty."""
+        with self._lock:
+            return self._profiles[-1] if self._profiles else None
+
+    def slowest(self, n: int = 10) -> List[QueryProfile]:
+        """Returns the `n` slowest requests, slowest first."""
+        profiles = self.profiles()
+        profiles.sort(key=lambda profile: profile.total_time, reverse=True)
+        return profiles[:n]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarizes the logged requests by kind.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For each kind, the number of requests,
+                cache hits and errors, the mean, median and 95th percentile of
+                the total time, and the bytes sent and received.
+        """
+        by_kind: Dict[str, List[QueryProfile]] = {}
+        for profile in self.profiles():
+            by_kind.setdefault(profile.kind, []).append(profile)
+
+        summary = {}
+        for kind, profiles in by_kind.items():
+            times = [profile.total_time for profile in profiles]
+            summary[kind] = {
+                "count": len(profiles),
+                "cached": sum(profile.cached for profile in profiles),
+                "errors": sum(profile.error is not None for profile in profiles),
+                "mean_time": sum(times) / len(times),
+                "p50_time": _percentile(times, 0.5),
+                "p95_time": _percentile(times, 0.95),
+                "request_bytes": sum(profile.request_bytes for profile in profiles),
+                "response_bytes": sum(profile.response_bytes for profile in profiles),
+            }
+        return summary
+
+    def clear(self) -> None:
+        """Removes every profile from the log."""
+        with self._lock:
+            self._profiles.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._profiles)
+
+    def __iter__(self) -> Iterator[QueryProfile]:
+        return iter(self.profiles())
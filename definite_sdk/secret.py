@@ -1,6 +1,6 @@
-from typing import Iterator
+from typing import Iterator, Optional, Union
 
-import requests
+from definite_sdk.transport import Deadline, DefiniteSession, resolve_session
 
 SECRET_STORE_ENDPOINT = "/v1/api/secret"
 
@@ -24,71 +24,97 @@ class DefiniteSecretStore:
     >>> secret_store.delete_secret("key")
     """
 
-    def __init__(self, api_key: str, api_url: str):
+    def __init__(
+        self, api_key: str, api_url: str, session: Optional[DefiniteSession] = None
+    ):
         """
         Initializes the DefiniteSecretStore
 
         Args:
             api_key (str): The API key for authorization.
+            session (Optional[DefiniteSession]): The shared HTTP session. A new
+                one is created if not provided.
         """
         self._api_key = api_key
         self._secret_store_url = api_url + SECRET_STORE_ENDPOINT
+        self._session = resolve_session(session)
 
-    def list_secrets(self) -> Iterator[str]:
+    def list_secrets(
+        self, *, deadline: Union[float, Deadline, None] = None
+    ) -> Iterator[str]:
         """
         Lists all secrets in the store.
 
+        Args:
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
+
         Returns:
             Iterator[str]: An iterator of secret keys.
         """
-        response = requests.get(
+        response = self._session.get(
             self._secret_store_url,
             headers={"Authorization": "Bearer " + self._api_key},
+            deadline=deadline,
         )
         response.raise_for_status()
         return iter(response.json()["secrets"])
 
-    def get_secret(self, key: str) -> str:
+    def get_secret(
+        self, key: str, *, deadline: Union[float, Deadline, None] = None
+    ) -> str:
         """
         Retrieves the value of a secret.
 
         Args:
             key (str): The key of the secret.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
 
         Returns:
             str: The value of the secret.
         """
-        response = requests.get(
+        response = self._session.get(
             self._secret_store_url + f"/{key}",
             headers={"Authorization": "Bearer " + self._api_key},
+            deadline=deadline,
         )
         response.raise_for_status()
         return str(response.json()["value"])
 
-    def set_secret(self, key: str, value: str):
+    def set_secret(
+        self, key: str, value: str, *, deadline: Union[float, Deadline, None] = None
+    ):
         """
         Sets the value of a secret.
 
         Args:
             key (str): The key of the secret.
             value (str): The value of the secret.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
         """
-        response = requests.post(
+        response = self._session.post(
             self._secret_store_url + f"/{key}",
             json={"value": value},
             headers={"Authorization": "Bearer " + self._api_key},
+            idempotent=True,
+            deadline=deadline,
         )
         response.raise_for_status()
 
-    def delete_secret(self, key: str):
+    def delete_secret(self, key: str, *, deadline: Union[float, Deadline, None] = None):
         """
         Deletes a secret.
 
         Args:
             key (str): The key of the secret.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
         """
-        response = requests.delete(
+        response = self._session.delete(
             self._secret_store_url + f"/{key}",
             headers={"Authorization": "Bearer " + self._api_key},
+            deadline=deadline,
         )
         response.raise_for_status()
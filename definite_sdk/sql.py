@@ -1,9 +1,81 @@
-from typing import Any, Dict, Optional
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 import requests
 
+from definite_sdk.arrow import (
+    ARROW_STREAM_MEDIA_TYPE,
+    import_pyarrow,
+    is_arrow_response,
+    read_arrow_stream,
+    rows_to_record_batches,
+    write_record_batches,
+)
+from definite_sdk.cache import (
+    DiskQueryCache,
+    QueryCache,
+    cube_cache_key,
+    normalize_sql,
+    sql_cache_key,
+)
+from definite_sdk.columns import CubeColumns, SqlColumns, import_numpy
+from definite_sdk.cube import can_split, plan_cube_queries, split_cube_result
+from definite_sdk.incremental import IncrementalQuery
+from definite_sdk.jobs import JOBS_ENDPOINT, QueryJob
+from definite_sdk.params import Params, encode_params
+from definite_sdk.profile import QueryProfile, QueryProfileLog, parse_server_timing
+from definite_sdk.streaming import JsonBody, iter_row_batches, read_json_response
+from definite_sdk.transport import Deadline, DefiniteSession, resolve_session
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from definite_sdk.store import DefiniteKVStore
+
 SQL_ENDPOINT = "/v1/query"
 
+# A SQL query, or a SQL query and its bound parameters.
+Query = Union[str, Tuple[str, Optional[Params]]]
+
+
+def quote_identifier(name: str) -> str:
+    """Quotes each part of a dotted SQL identifier such as `db.schema.table`."""
+    return ".".join('"' + part.replace('"', '""') + '"' for part in name.split("."))
+
+
+class QueryOutcome(NamedTuple):
+    """
+    The outcome of one query of a batch run by `execute_many`. `position` is
+    the query's position in the batch.
+    """
+
+    position: int
+    sql: str
+    result: Optional[Dict[str, Any]]
+    error: Optional[Exception]
+    params: Optional[Params] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the query succeeded."""
+        return self.error is None
+
 
 class DefiniteSqlClient:
     """
@@ -24,6 +96,23 @@ class DefiniteSqlClient:
     ... )
     >>> print(result)
 
+    Streaming large results in batches of rows:
+    >>> for rows in sql_client.execute_iter("SELECT * FROM events"):
+    ...     process(rows)
+
+    Running independent queries concurrently:
+    >>> outcomes = sql_client.execute_many(["SELECT 1", "SELECT 2"])
+
+    Running long queries as jobs:
+    >>> job = sql_client.submit("SELECT * FROM events")
+    >>> result = job.result(timeout=600)
+
+    Fetching results as Apache Arrow:
+    >>> table = sql_client.execute_arrow("SELECT * FROM events")
+
+    Downloading results to a file:
+    >>> sql_client.execute_to_file("SELECT * FROM events", "events.parquet")
+
     Executing Cube queries:
     >>> cube_query = {
     ...     "dimensions": [],
@@ -37,47 +126,814 @@ class DefiniteSqlClient:
     >>> print(result)
     """
 
-    def __init__(self, api_key: str, api_url: str):
+    def __init__(
+        self,
+        api_key: str,
+        api_url: str,
+        session: Optional[DefiniteSession] = None,
+        cache: Optional[QueryCache] = None,
+        disk_cache: Optional[DiskQueryCache] = None,
+        profile_log: Optional[QueryProfileLog] = None,
+    ):
         """
         Initializes the DefiniteSqlClient.
 
         Args:
             api_key (str): The API key for authorization.
             api_url (str): The base URL for the Definite API.
+            session (Optional[DefiniteSession]): The shared HTTP session. A new
+                one is created if not provided.
+            cache (Optional[QueryCache]): Cache for the results of `execute`
+                and `execute_cube_query`. Results are not cached if not
+                provided.
+            disk_cache (Optional[DiskQueryCache]): Persistent cache for the
+                results of `execute_arrow`.
+            profile_log (Optional[QueryProfileLog]): Log that records a
+                QueryProfile for each `execute` and `execute_cube_query` call.
+                Requests are not profiled if not provided.
         """
         self._api_key = api_key
+        self._api_url = api_url
         self._sql_url = api_url + SQL_ENDPOINT
+        self._session = resolve_session(session)
+        self._cache = cache
+        self._disk_cache = disk_cache
+        self._profile_log = profile_log
 
-    def execute(self, sql: str, integration_id: Optional[str] = None) -> Dict[str, Any]:
+    def execute(
+        self,
+        sql: str,
+        integration_id: Optional[str] = None,
+        *,
+        params: Optional[Params] = None,
+        use_cache: bool = True,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Dict[str, Any]:
         """
         Executes a SQL query against a database integration.
 
+        The whole result is held in memory; use `execute_iter` to stream the
+        rows of large results in batches instead.
+
         Args:
             sql (str): The SQL query to execute.
             integration_id (Optional[str]): The integration ID to query against.
                 If not provided, the default integration will be used.
+            params (Optional[Params]): Values bound to the query's
+                placeholders, as a sequence for positional or a mapping for
+                named parameters. They are sent separately from the SQL, so
+                calls that differ only in their values share one statement.
+            use_cache (bool): Whether to serve and store the result with the
+                client's QueryCache, if it has one.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
 
         Returns:
             Dict[str, Any]: The query result as returned by the API.
 
         Raises:
             requests.HTTPError: If the API request fails.
+            DeadlineExceededError: If the deadline runs out.
 
         Example:
             >>> result = sql_client.execute("SELECT COUNT(*) FROM users")
             >>> print(result)
+
+            >>> result = sql_client.execute(
+            ...     "SELECT * FROM orders WHERE region = $region AND total > $min",
+            ...     params={"region": "EMEA", "min": 100},
+            ... )
+        """
+        started_at = time.time()
+        started = time.perf_counter()
+        cache_key = None
+        if self._cache is not None and use_cache:
+            cache_key = sql_cache_key(sql, integration_id, params)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._record_profile("sql", sql, started_at, started, cached=cached)
+                return cached
+
+        payload = self._sql_payload(sql, integration_id, params)
+
+        return self._post_query(
+            self._sql_url,
+            payload,
+            "sql",
+            sql,
+            cache_key,
+            started_at,
+            started,
+            deadline,
+        )
+
+    def execute_columns(
+        self,
+        sql: str,
+        integration_id: Optional[str] = None,
+        *,
+        params: Optional[Params] = None,
+        decimals: str = "float",
+        use_cache: bool = True,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> SqlColumns:
+        """
+        Executes a SQL query and decodes the result into typed NumPy arrays.
+
+        Each column is decoded in one pass using the column types reported in
+        the response: dates and timestamps become datetime64 arrays, integers
+        int64 and decimals float64 (or decimal.Decimal), with nulls masked.
+
+        Requires the `numpy` extra: pip install definite-sdk[numpy]
+
+        Args:
+            sql (str): The SQL query to execute.
+            integration_id (Optional[str]): The integration ID to query against.
+                If not provided, the default integration will be used.
+            params (Optional[Params]): Values bound to the query's
+                placeholders; see `execute`.
+            decimals (str): "float" to decode DECIMAL columns as float64, or
+                "decimal" for exact decimal.Decimal values.
+            use_cache (bool): Whether to serve and store the result with the
+                client's QueryCache, if it has one.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
+
+        Returns:
+            SqlColumns: The decoded result.
+
+        Raises:
+            requests.HTTPError: If the API request fails.
+            ImportError: If numpy is not installed.
+
+        Example:
+            >>> columns = sql_client.execute_columns("SELECT * FROM orders")
+            >>> columns["created_at"].max()
+            >>> df = columns.to_pandas()
+        """
+        import_numpy()
+        result = self.execute(
+            sql, integration_id, params=params, use_cache=use_cache, deadline=deadline
+        )
+        return SqlColumns.from_result(result, decimals)
+
+    def incremental(
+        self,
+        sql: str,
+        cursor_column: str,
+        store: "DefiniteKVStore",
+        key: str,
+        integration_id: Optional[str] = None,
+        *,
+        initial: Any = None,
+    ) -> IncrementalQuery:
+        """
+        Returns a query that fetches only the rows past a watermark kept in a
+        DefiniteKVStore.
+
+        Call `fetch()` or `fetch_iter()` on it, process the rows, then
+        `commit()` to save the new watermark.
+
+        Args:
+            sql (str): The query. Its rows are filtered on the cursor column.
+            cursor_column (str): A column that increases as rows are added or
+                updated, such as an ID or an `updated_at` timestamp.
+            store (DefiniteKVStore): The store that keeps the watermark.
+            key (str): The store key of the watermark.
+            integration_id (Optional[str]): The integration ID to query against.
+                If not provided, the default integration will be used.
+            initial (Any): The watermark to start from when none is stored.
+
+        Returns:
+            IncrementalQuery: The incremental query.
+
+        Example:
+            >>> sync = sql_client.incremental(
+            ...     "SELECT * FROM orders", "updated_at", store, key="orders"
+            ... )
+            >>> for rows in sync.fetch_iter(batch_size=10_000):
+            ...     upsert(rows)
+            >>> sync.commit()
+        """
+        return IncrementalQuery(
+            self, sql, cursor_column, store, key, integration_id, initial
+        )
+
+    def execute_incremental(
+        self,
+        sql: str,
+        cursor_column: str,
+        store: "DefiniteKVStore",
+        key: str,
+        integration_id: Optional[str] = None,
+        *,
+        initial: Any = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Dict[str, Any]:
+        """
+        Fetches the rows past the watermark kept in a DefiniteKVStore, then
+        saves the new watermark.
+
+        Use `incremental()` instead to save the watermark only after the rows
+        have been processed.
+
+        Args:
+            sql (str): The query. Its rows are filtered on the cursor column.
+            cursor_column (str): A column that increases as rows are added or
+                updated, such as an ID or an `updated_at` timestamp.
+            store (DefiniteKVStore): The store that keeps the watermark.
+            key (str): The store key of the watermark.
+            integration_id (Optional[str]): The integration ID to query against.
+                If not provided, the default integration will be used.
+            initial (Any): The watermark to start from when none is stored.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                fetch and commit in seconds, or a Deadline shared with other
+                calls.
+
+        Returns:
+            Dict[str, Any]: The new rows, as returned by `execute`.
+
+        Raises:
+            requests.HTTPError: If the API request fails.
+            Exception: If the store commit fails.
+
+        Example:
+            >>> store = client.get_kv_store("sync_state")
+            >>> result = sql_client.execute_incremental(
+            ...     "SELECT * FROM events", "id", store, key="events"
+            ... )
+        """
+        deadline = Deadline.coerce(deadline)
+        query = self.incremental(
+            sql, cursor_column, store, key, integration_id, initial=initial
+        )
+        result = query.fetch(deadline=deadline)
+        query.commit(deadline=deadline)
+        return result
+
+    def submit(
+        self,
+        sql: str,
+        integration_id: Optional[str] = None,
+        *,
+        params: Optional[Params] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> QueryJob:
         """
+        Submits a SQL query to run as a job and returns without waiting for it.
+
+        Use the returned QueryJob to poll, fetch or cancel the query. Unlike
+        `execute`, no connection is held open while the query runs.
+
+        Args:
+            sql (str): The SQL query to execute.
+            integration_id (Optional[str]): The integration ID to query against.
+                If not provided, the default integration will be used.
+            params (Optional[Params]): Values bound to the query's
+                placeholders; see `execute`.
+            deadline (Optional[Union[float, Deadline]]): Time limit for
+                submitting the job in seconds, or a Deadline shared with other
+                calls.
+
+        Returns:
+            QueryJob: A handle to the running query.
+
+        Raises:
+            requests.HTTPError: If the API request fails.
+
+        Example:
+            >>> jobs = [sql_client.submit(sql) for sql in heavy_queries]
+            >>> results = [job.result() for job in jobs]
+        """
+        payload = self._sql_payload(sql, integration_id, params)
+
+        response = self._session.post(
+            self._api_url + JOBS_ENDPOINT,
+            json=payload,
+            headers={"Authorization": "Bearer " + self._api_key},
+            deadline=deadline,
+        )
+        response.raise_for_status()
+        info = response.json()
+        return QueryJob(
+            info["job_id"], self._api_key, self._api_url, self._session, info
+        )
+
+    @staticmethod
+    def _sql_payload(
+        sql: str, integration_id: Optional[str], params: Optional[Params]
+    ) -> Dict[str, Any]:
         payload: Dict[str, Any] = {"sql": sql}
         if integration_id:
             payload["integration_id"] = integration_id
+        if params is not None:
+            payload["params"] = encode_params(params)
+        return payload
+
+    def get_job(self, job_id: str) -> QueryJob:
+        """
+        Returns a handle to a previously submitted job, for example one
+        submitted by another process.
 
-        response = requests.post(
+        Args:
+            job_id (str): The job's ID.
+
+        Returns:
+            QueryJob: A handle to the job. Its status is fetched on first use.
+        """
+        return QueryJob(job_id, self._api_key, self._api_url, self._session)
+
+    def execute_many(
+        self,
+        queries: Iterable[Query],
+        max_workers: Optional[int] = None,
+        integration_id: Optional[str] = None,
+        *,
+        use_cache: bool = True,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> List[QueryOutcome]:
+        """
+        Executes independent SQL queries concurrently.
+
+        The queries run on up to `max_workers` threads that share the client's
+        connection pool. A failing query does not stop the others; its error
+        is returned in its outcome instead.
+
+        Queries can be given as `(sql, params)` pairs to bind parameters.
+        They are submitted grouped by SQL template, but queries that share a
+        template still run concurrently on different threads.
+
+        Args:
+            queries (Iterable[Query]): The SQL queries to execute, as strings
+                or `(sql, params)` pairs.
+            max_workers (Optional[int]): The maximum number of queries in
+                flight at once. Defaults to the size of the client's
+                connection pool.
+            integration_id (Optional[str]): The integration ID to query against.
+                If not provided, the default integration will be used.
+            use_cache (bool): Whether to serve and store the results with the
+                client's QueryCache, if it has one.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                whole batch in seconds, or a Deadline shared with other calls.
+
+        Returns:
+            List[QueryOutcome]: One outcome per query, in the order given.
+
+        Example:
+            >>> outcomes = sql_client.execute_many(
+            ...     ["SELECT COUNT(*) FROM users", "SELECT SUM(total) FROM orders"]
+            ... )
+            >>> for outcome in outcomes:
+            ...     print(outcome.sql, outcome.result if outcome.ok else outcome.error)
+
+            >>> outcomes = sql_client.execute_many(
+            ...     [("SELECT * FROM orders WHERE id = $1", [i]) for i in ids]
+            ... )
+        """
+        outcomes = self.execute_many_iter(
+            queries,
+            max_workers,
+            integration_id,
+            use_cache=use_cache,
+            deadline=deadline,
+        )
+        return sorted(outcomes, key=lambda outcome: outcome.position)
+
+    def execute_many_iter(
+        self,
+        queries: Iterable[Query],
+        max_workers: Optional[int] = None,
+        integration_id: Optional[str] = None,
+        *,
+        use_cache: bool = True,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Iterator[QueryOutcome]:
+        """
+        Executes independent SQL queries concurrently, yielding each outcome as
+        soon as its query finishes.
+
+        Takes the same arguments as `execute_many`. Use `QueryOutcome.position` to
+        match outcomes to queries.
+
+        Yields:
+            QueryOutcome: The outcome of each query, in completion order.
+
+        Example:
+            >>> for outcome in sql_client.execute_many_iter(queries, max_workers=4):
+            ...     if outcome.ok:
+            ...         publish(outcome.position, outcome.result)
+        """
+        if max_workers is None:
+            max_workers = self._session.pool_maxsize
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        # Submit the queries grouped by template, in order of first appearance.
+        groups: Dict[str, List[Tuple[int, str, Optional[Params]]]] = {}
+        for position, query in enumerate(queries):
+            sql, params = (query, None) if isinstance(query, str) else query
+            groups.setdefault(normalize_sql(sql), []).append((position, sql, params))
+        ordered = [query for group in groups.values() for query in group]
+        return self._run_many(
+            ordered,
+            max_workers,
+            integration_id,
+            use_cache,
+            Deadline.coerce(deadline),
+        )
+
+    def _run_many(
+        self,
+        ordered: List[Tuple[int, str, Optional[Params]]],
+        max_workers: int,
+        integration_id: Optional[str],
+        use_cache: bool,
+        deadline: Optional[Deadline],
+    ) -> Iterator[QueryOutcome]:
+        """Runs the queries of `execute_many_iter` and yields their outcomes."""
+
+        def run(position: int, sql: str, params: Optional[Params]) -> QueryOutcome:
+            try:
+                result = self.execute(
+                    sql,
+                    integration_id,
+                    params=params,
+                    use_cache=use_cache,
+                    deadline=deadline,
+                )
+            except Exception as exc:
+                return QueryOutcome(position, sql, None, exc, params)
+            return QueryOutcome(position, sql, result, None, params)
+
+        if not ordered:
+            return
+        workers = min(max_workers, len(ordered))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run, *query) for query in ordered]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def execute_iter(
+        self,
+        sql: str,
+        integration_id: Optional[str] = None,
+        *,
+        params: Optional[Params] = None,
+        batch_size: int = 1000,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Executes a SQL query and streams the result rows in batches.
+
+        The response body is parsed incrementally as it is downloaded, so only
+        one batch of rows is held in memory at a time, however large the
+        result is.
+
+        Args:
+            sql (str): The SQL query to execute.
+            integration_id (Optional[str]): The integration ID to query against.
+                If not provided, the default integration will be used.
+            params (Optional[Params]): Values bound to the query's
+                placeholders; see `execute`.
+            batch_size (int): The maximum number of rows per batch.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                request in seconds, or a Deadline shared with other calls.
+
+        Yields:
+            List[Dict[str, Any]]: Lists of up to `batch_size` rows.
+
+        Raises:
+            requests.HTTPError: If the API request fails.
+            ValueError: If the response body is not valid JSON.
+
+        Example:
+            >>> for rows in sql_client.execute_iter(
+            ...     "SELECT * FROM events", batch_size=10_000
+            ... ):
+            ...     writer.write_rows(rows)
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        payload = self._sql_payload(sql, integration_id, params)
+        deadline = Deadline.coerce(deadline)
+
+        response = self._session.post(
             self._sql_url,
             json=payload,
             headers={"Authorization": "Bearer " + self._api_key},
+            idempotent=True,
+            deadline=deadline,
+            stream=True,
         )
-        response.raise_for_status()
-        return response.json()
+        try:
+            response.raise_for_status()
+        except BaseException:
+            response.close()
+            raise
+        yield from iter_row_batches(response, batch_size, deadline=deadline)
+
+    def execute_arrow(
+        self,
+        sql: str,
+        integration_id: Optional[str] = None,
+        *,
+        params: Optional[Params] = None,
+        as_reader: bool = False,
+        batch_size: int = 65536,
+        use_cache: bool = True,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Union["pa.Table", "pa.RecordBatchReader"]:
+        """
+        Executes a SQL query and returns the result as Apache Arrow data.
+
+        The API is asked for an Arrow IPC stream, which is read directly into
+        Arrow buffers. If the API answers with JSON instead, the rows are
+        streamed and converted to Arrow column-wise, `batch_size` rows at a
+        time, using the column types declared by the response's `schema`
+        when it precedes the rows. Other types are inferred from the values,
+        and so are all of them when the `schema` follows the rows, since the
+        first batches are converted before it is read. A result whose later
+        rows do not fit the inferred types raises ValueError while reading.
+
+        Requires the `arrow` extra: pip install definite-sdk[arrow]
+
+        Args:
+            sql (str): The SQL query to execute.
+            integration_id (Optional[str]): The integration ID to query against.
+                If not provided, the default integration will be used.
+            params (Optional[Params]): Values bound to the query's
+                placeholders; see `execute`.
+            as_reader (bool): Return a `pyarrow.RecordBatchReader` that streams
+                the result instead of reading it into a `pyarrow.Table`.
+            batch_size (int): Rows per record batch when converting JSON.
+            use_cache (bool): Whether to serve and store the result with the
+                client's DiskQueryCache, if it has one.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                request in seconds, or a Deadline shared with other calls.
+
+        Returns:
+            Union[pa.Table, pa.RecordBatchReader]: The query result.
+
+        Raises:
+            requests.HTTPError: If the API request fails.
+            ImportError: If pyarrow is not installed.
+
+        Example:
+            >>> table = sql_client.execute_arrow("SELECT * FROM orders")
+            >>> df = table.to_pandas()
+        """
+        reader, _ = self._arrow_reader(
+            sql, integration_id, params, batch_size, use_cache, deadline
+        )
+        return reader if as_reader else reader.read_all()
+
+    def _arrow_reader(
+        self,
+        sql: str,
+        integration_id: Optional[str],
+        params: Optional[Params],
+        batch_size: int,
+        use_cache: bool,
+        deadline: Union[float, Deadline, None],
+    ) -> Tuple["pa.RecordBatchReader", Optional[requests.Response]]:
+        """
+        Returns a reader over the Arrow result of a SQL query, and the
+        response it streams from, or None if it was served from the disk
+        cache.
+        """
+        import_pyarrow()
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        cache_key = None
+        disk_cache = self._disk_cache if use_cache else None
+        if disk_cache is not None:
+            cache_key = sql_cache_key(sql, integration_id, params)
+            cached = disk_cache.get(cache_key)
+            if cached is not None:
+                return cached.to_reader(), None
+
+        payload = self._sql_payload(sql, integration_id, params)
+        deadline = Deadline.coerce(deadline)
+
+        response = self._session.post(
+            self._sql_url,
+            json=payload,
+            headers={
+                "Authorization": "Bearer " + self._api_key,
+                "Accept": f"{ARROW_STREAM_MEDIA_TYPE}, application/json;q=0.9",
+            },
+            idempotent=True,
+            deadline=deadline,
+            stream=True,
+        )
+        try:
+            response.raise_for_status()
+            if is_arrow_response(response):
+                reader = read_arrow_stream(response, deadline)
+            else:
+                fields: Dict[str, Any] = {}
+                reader = rows_to_record_batches(
+                    iter_row_batches(response, batch_size, fields, deadline), fields
+                )
+        except BaseException:
+            response.close()
+            raise
+
+        if disk_cache is not None:
+            reader = disk_cache.tee(cache_key, reader)
+        return reader, response
+
+    def execute_to_file(
+        self,
+        sql: str,
+        path: str,
+        format: str = "parquet",
+        integration_id: Optional[str] = None,
+        *,
+        params: Optional[Params] = None,
+        batch_size: int = 65536,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> int:
+        """
+        Executes a SQL query and streams the result into a file.
+
+        The result is written batch by batch as it downloads: Parquet files
+        get one row group per batch, and CSV and NDJSON files are appended to.
+        The file is written under a temporary name and moved to `path` once
+        complete, so a failed download never leaves a partial file behind.
+
+        CSV and Parquet require the `arrow` extra:
+        pip install definite-sdk[arrow]
+
+        Args:
+            sql (str): The SQL query to execute.
+            path (str): The file to write.
+            format (str): "parquet", "csv" or "ndjson".
+            integration_id (Optional[str]): The integration ID to query against.
+                If not provided, the default integration will be used.
+            params (Optional[Params]): Values bound to the query's
+                placeholders; see `execute`.
+            batch_size (int): Rows per batch, and per Parquet row group when
+                the API answers with JSON.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                request in seconds, or a Deadline shared with other calls.
+
+        Returns:
+            int: The number of rows written.
+
+        Raises:
+            requests.HTTPError: If the API request fails.
+            ImportError: If pyarrow is needed for the format and not installed.
+
+        Example:
+            >>> sql_client.execute_to_file(
+            ...     "SELECT * FROM events", "events.parquet", format="parquet"
+            ... )
+            1250000
+        """
+        if format not in ("parquet", "csv", "ndjson"):
+            raise ValueError('format must be "parquet", "csv" or "ndjson"')
+
+        tmp_path = f"{path}.part"
+        try:
+            if format == "ndjson":
+                rows = 0
+                with open(tmp_path, "w", encoding="utf-8") as file:
+                    for batch in self.execute_iter(
+                        sql,
+                        integration_id,
+                        params=params,
+                        batch_size=batch_size,
+                        deadline=deadline,
+                    ):
+                        file.writelines(json.dumps(row) + "\n" for row in batch)
+                        rows += len(batch)
+            else:
+                reader = self.execute_arrow(
+                    sql,
+                    integration_id,
+                    params=params,
+                    as_reader=True,
+                    batch_size=batch_size,
+                    deadline=deadline,
+                )
+                rows = write_record_batches(reader, tmp_path, format)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return rows
+
+    def execute_into_duckdb(
+        self,
+        sql: str,
+        conn: Any,
+        table: str,
+        integration_id: Optional[str] = None,
+        *,
+        params: Optional[Params] = None,
+        if_exists: str = "replace",
+        batch_size: int = 65536,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> int:
+        """
+        Executes a SQL query and loads the result into a local DuckDB table.
+
+        The result's Arrow batches are registered with DuckDB as a view and
+        read by a single `CREATE TABLE ... AS` or `INSERT ... SELECT`
+        statement while they download, without going through Python rows.
+
+        Requires the `arrow` extra: pip install definite-sdk[arrow]
+
+        Args:
+            sql (str): The SQL query to execute against the API.
+            conn (duckdb.DuckDBPyConnection): The local DuckDB connection.
+            table (str): The table to load, optionally qualified with its
+                database and schema, such as "lake.my_schema.orders".
+            integration_id (Optional[str]): The integration ID to query against.
+                If not provided, the default integration will be used.
+            params (Optional[Params]): Values bound to the query's
+                placeholders; see `execute`.
+            if_exists (str): "replace" to replace an existing table, "append"
+                to insert into it, or "fail" to raise if it exists.
+            batch_size (int): Rows per record batch when converting JSON.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                request in seconds, or a Deadline shared with other calls.
+
+        Returns:
+            int: The number of rows loaded.
+
+        Raises:
+            requests.HTTPError: If the API request fails.
+            ValueError: If the table would be created from an empty result
+                whose response does not declare its columns.
+            duckdb.Error: If the table cannot be created or appended to.
+
+        Example:
+            >>> conn = duckdb.connect()
+            >>> conn.execute(client.attach_ducklake())
+            >>> sql_client.execute_into_duckdb(
+            ...     "SELECT region, SUM(amount) AS total FROM sales GROUP BY 1",
+            ...     conn,
+            ...     "region_totals",
+            ... )
+            >>> conn.sql(
+            ...     "SELECT * FROM region_totals JOIN lake.main.targets USING (region)"
+            ... )
+        """
+        statements = {
+            "replace": "CREATE OR REPLACE TABLE {table} AS SELECT * FROM {view}",
+            "fail": "CREATE TABLE {table} AS SELECT * FROM {view}",
+            "append": "INSERT INTO {table} SELECT * FROM {view}",
+        }
+        if if_exists not in statements:
+            raise ValueError('if_exists must be "replace", "append" or "fail"')
+
+        pa = import_pyarrow()
+        reader, response = self._arrow_reader(
+            sql, integration_id, params, batch_size, True, deadline
+        )
+        rows = 0
+
+        def counted() -> Iterator[Any]:
+            nonlocal rows
+            for batch in reader:
+                rows += batch.num_rows
+                yield batch
+
+        view = f"__definite_result_{uuid.uuid4().hex}"
+        try:
+            if not reader.schema.names:
+                # An empty JSON result without a schema has no columns, and
+                # DuckDB cannot read or create a table without any.
+                if if_exists == "append":
+                    return 0
+                raise ValueError(
+                    "The query result is empty and the response does not "
+                    f"declare its columns, so table {table!r} cannot be created"
+                )
+            conn.register(
+                view, pa.RecordBatchReader.from_batches(reader.schema, counted())
+            )
+            try:
+                conn.execute(
+                    statements[if_exists].format(
+                        table=quote_identifier(table), view=view
+                    )
+                )
+            finally:
+                conn.unregister(view)
+        finally:
+            # The statement may fail before reading the result.
+            if response is not None:
+                response.close()
+        return rows
 
     def execute_cube_query(
         self,
@@ -86,6 +942,9 @@ class DefiniteSqlClient:
         persist: bool = True,
         invalidate: bool = False,
         raw: bool = False,
+        *,
+        use_cache: bool = True,
+        deadline: Union[float, Deadline, None] = None,
     ) -> Dict[str, Any]:
         """
         Executes a Cube query against a Cube integration.
@@ -95,14 +954,20 @@ class DefiniteSqlClient:
             integration_id (Optional[str]): The Cube integration ID to query against.
                 If not provided, the default integration will be used.
             persist (bool): Whether to persist the query result to the cache.
-            invalidate (bool): Whether to invalidate the cached result.
+            invalidate (bool): Whether to invalidate the cached result. This
+                also refreshes the client's QueryCache entry for the query.
             raw (bool): Whether to return raw/unformatted cube results.
+            use_cache (bool): Whether to serve and store the result with the
+                client's QueryCache, if it has one.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
 
         Returns:
             Dict[str, Any]: The query result as returned by the API.
 
         Raises:
             requests.HTTPError: If the API request fails.
+            DeadlineExceededError: If the deadline runs out.
 
         Example:
             >>> cube_query = {
@@ -125,6 +990,18 @@ class DefiniteSqlClient:
             ... )
             >>> print(raw_result)
         """
+        started_at = time.time()
+        started = time.perf_counter()
+        cache_key = None
+        if self._cache is not None and use_cache:
+            cache_key = cube_cache_key(cube_query, integration_id, raw)
+            cached = None if invalidate else self._cache.get(cache_key)
+            if cached is not None:
+                self._record_profile(
+                    "cube", json.dumps(cube_query), started_at, started, cached=cached
+                )
+                return cached
+
         payload: Dict[str, Any] = {"cube_query": cube_query}
         if integration_id:
             payload["integration_id"] = integration_id
@@ -138,10 +1015,295 @@ class DefiniteSqlClient:
         if raw:
             url += "?raw=true"
 
-        response = requests.post(
+        return self._post_query(
             url,
-            json=payload,
-            headers={"Authorization": "Bearer " + self._api_key},
+            payload,
+            "cube",
+            json.dumps(cube_query),
+            cache_key,
+            started_at,
+            started,
+            deadline,
+            conditional=not invalidate,
         )
-        response.raise_for_status()
-        return response.json()
+
+    def _post_query(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        kind: str,
+        query: str,
+        cache_key: Any,
+        started_at: float,
+        started: float,
+        deadline: Union[float, Deadline, None],
+        *,
+        conditional: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Sends a query, caches its result and records its profile.
+
+        If the cache holds an expired result with an ETag, the query is sent
+        with If-None-Match and a 304 answer serves the cached result again.
+        """
+        deadline = Deadline.coerce(deadline)
+        headers = {"Authorization": "Bearer " + self._api_key}
+        cache = self._cache if cache_key is not None else None
+        stale = None
+        if cache is not None and conditional:
+            stale = cache.stale(cache_key)
+            if stale is not None:
+                headers["If-None-Match"] = stale[1]
+
+        response = None
+        time_to_first_byte = 0.0
+        try:
+            response = self._session.post(
+                url,
+                json=payload,
+                headers=headers,
+                idempotent=True,
+                deadline=deadline,
+                stream=True,
+            )
+            time_to_first_byte = time.perf_counter() - started
+            if cache is not None and stale is not None and response.status_code == 304:
+                response.close()
+                result = cache.revalidate(cache_key)
+                if result is None:
+                    # Evicted while the request was in flight.
+                    result = dict(stale[0])
+                self._record_profile(
+                    kind,
+                    query,
+                    started_at,
+                    started,
+                    payload=payload,
+                    response=response,
+                    time_to_first_byte=time_to_first_byte,
+                    cached=result,
+                )
+                return result
+            body = read_json_response(response, deadline)
+        except Exception as e:
+            self._record_profile(
+                kind,
+                query,
+                started_at,
+                started,
+                payload=payload,
+                response=response,
+                time_to_first_byte=time_to_first_byte,
+                error=e,
+            )
+            raise
+
+        if cache is not None:
+            cache.put(cache_key, body.value, body.size, response.headers.get("ETag"))
+        self._record_profile(
+            kind,
+            query,
+            started_at,
+            started,
+            payload=payload,
+            response=response,
+            time_to_first_byte=time_to_first_byte,
+            body=body,
+        )
+        if cache is not None:
+            # Like cache hits, return a copy so callers cannot alter the entry.
+            return dict(body.value)
+        return cast(Dict[str, Any], body.value)
+
+    def _record_profile(
+        self,
+        kind: str,
+        query: str,
+        started_at: float,
+        started: float,
+        *,
+        payload: Optional[Dict[str, Any]] = None,
+        response: Any = None,
+        time_to_first_byte: float = 0.0,
+        body: Optional[JsonBody] = None,
+        cached: Optional[Dict[str, Any]] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Records the profile of a query request, if the client has a log."""
+        if self._profile_log is None:
+            return
+        result = body.value if body is not None else cached
+        data = result.get("data") if isinstance(result, dict) else None
+        self._profile_log.record(
+            QueryProfile(
+                kind=kind,
+                query=query,
+                started_at=started_at,
+                total_time=time.perf_counter() - started,
+                time_to_first_byte=time_to_first_byte,
+                transfer_time=body.transfer_time if body is not None else 0.0,
+                decode_time=body.decode_time if body is not None else 0.0,
+                request_bytes=(
+                    len(json.dumps(payload).encode("utf-8")) if payload else 0
+                ),
+                response_bytes=body.size if body is not None else 0,
+                row_count=len(data) if isinstance(data, list) else None,
+                status_code=getattr(response, "status_code", None),
+                server_timing=(
+                    parse_server_timing(response.headers)
+                    if response is not None
+                    else {}
+                ),
+                cached=cached is not None,
+                error=repr(error) if error is not None else None,
+            )
+        )
+
+    def execute_cube_columns(
+        self,
+        cube_query: Dict[str, Any],
+        integration_id: Optional[str] = None,
+        persist: bool = True,
+        invalidate: bool = False,
+        raw: bool = False,
+        *,
+        use_cache: bool = True,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> CubeColumns:
+        """
+        Executes a Cube query and decodes the result into NumPy arrays.
+
+        Time dimensions become datetime64 arrays, measures int64 or float64
+        arrays and dimensions categorical codes, ready for vectorized math.
+        Takes the same arguments as `execute_cube_query`.
+
+        Requires the `numpy` extra: pip install definite-sdk[numpy]
+
+        Returns:
+            CubeColumns: The decoded result.
+
+        Raises:
+            requests.HTTPError: If the API request fails.
+            ImportError: If numpy is not installed.
+
+        Example:
+            >>> columns = sql_client.execute_cube_columns(cube_query)
+            >>> pivot = columns.pivot(
+            ...     "sales.date.month", "sales.region", "sales.total_amount"
+            ... )
+            >>> month_over_month = pivot.values[1:] / pivot.values[:-1] - 1
+        """
+        import_numpy()
+        result = self.execute_cube_query(
+            cube_query,
+            integration_id,
+            persist,
+            invalidate,
+            raw,
+            use_cache=use_cache,
+            deadline=deadline,
+        )
+        return CubeColumns.from_result(result, cube_query)
+
+    def execute_cube_queries(
+        self,
+        cube_queries: List[Dict[str, Any]],
+        integration_id: Optional[str] = None,
+        persist: bool = True,
+        invalidate: bool = False,
+        raw: bool = False,
+        *,
+        merge: bool = True,
+        max_workers: Optional[int] = None,
+        use_cache: bool = True,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Executes a batch of Cube queries with as few requests as possible.
+
+        Queries that differ only in their measures are merged into one query
+        with all of their measures, and the merged result is split back out
+        per query. Identical queries are sent once. The remaining requests
+        run concurrently.
+
+        Queries are only merged when they have an explicit `order` that does
+        not use their measures, or, without a `limit` or `offset`, a time
+        dimension with a granularity, since the rows they select and their
+        order could otherwise depend on the measures.
+
+        Args:
+            cube_queries (List[Dict[str, Any]]): The Cube queries in JSON format.
+            integration_id (Optional[str]): The Cube integration ID to query
+                against. If not provided, the default integration will be used.
+            persist (bool): Whether to persist the query results to the cache.
+            invalidate (bool): Whether to invalidate the cached results.
+            raw (bool): Whether to return raw/unformatted cube results.
+            merge (bool): Whether to merge queries that differ only in their
+                measures.
+            max_workers (Optional[int]): The maximum number of requests in
+                flight at once. Defaults to the size of the client's
+                connection pool.
+            use_cache (bool): Whether to serve and store the results with the
+                client's QueryCache, if it has one.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                whole batch in seconds, or a Deadline shared with other calls.
+
+        Returns:
+            List[Dict[str, Any]]: One result per query, in the order given.
+
+        Raises:
+            requests.HTTPError: If an API request fails.
+            DeadlineExceededError: If the deadline runs out.
+
+        Example:
+            >>> base = {"dimensions": ["sales.region"], "limit": 1000}
+            >>> totals, counts = sql_client.execute_cube_queries([
+            ...     {**base, "measures": ["sales.total_amount"]},
+            ...     {**base, "measures": ["sales.count"]},
+            ... ])
+        """
+        if max_workers is None:
+            max_workers = self._session.pool_maxsize
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if not cube_queries:
+            return []
+
+        if merge:
+            plan = plan_cube_queries(cube_queries)
+        else:
+            plan = [(cube_query, [i]) for i, cube_query in enumerate(cube_queries)]
+        shared_deadline = Deadline.coerce(deadline)
+
+        def run(cube_query: Dict[str, Any]) -> Dict[str, Any]:
+            return self.execute_cube_query(
+                cube_query,
+                integration_id,
+                persist,
+                invalidate,
+                raw,
+                use_cache=use_cache,
+                deadline=shared_deadline,
+            )
+
+        workers = min(max_workers, len(plan))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            merged_results = list(executor.map(run, [query for query, _ in plan]))
+
+            results: List[Optional[Dict[str, Any]]] = [None] * len(cube_queries)
+            unsplit: List[int] = []
+            for (merged_query, indexes), result in zip(plan, merged_results):
+                if len(indexes) > 1 and not can_split(result):
+                    unsplit.extend(indexes)
+                    continue
+                for index in indexes:
+                    results[index] = split_cube_result(
+                        result, cube_queries[index], merged_query
+                    )
+
+            # Results that cannot be split are fetched for each query instead.
+            fallback = executor.map(run, [cube_queries[i] for i in unsplit])
+            for index, result in zip(unsplit, fallback):
+                results[index] = result
+
+        return cast(List[Dict[str, Any]], results)
@@ -1,11 +1,164 @@
-from typing import Iterator, Union, Optional
-
-import requests
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from definite_sdk.exceptions import KVStoreConflictError
+from definite_sdk.transport import Deadline, DefiniteSession, resolve_session
 
 STORE_ENDPOINT = "/v1/store"
 
+# Answers to a patch from servers that cannot apply patches to a store.
+PATCH_UNSUPPORTED_STATUS_CODES = frozenset({405, 501})
+
+# Answers to a patch after which the whole store is written instead, without
+# concluding that the server cannot apply patches: a 404 can also mean that
+# the store was deleted remotely.
+PATCH_FALLBACK_STATUS_CODES = PATCH_UNSUPPORTED_STATUS_CODES | {404}
+
+# Answers to a commit against a version that is no longer the latest.
+CONFLICT_STATUS_CODES = frozenset({409, 412})
+
+# "ours", "theirs", or a callable that takes a key and its base, local and
+# remote values (None for missing keys) and returns the value to keep.
+MergePolicy = Union[
+    str, Callable[[str, Optional[str], Optional[str], Optional[str]], Optional[str]]
+]
+
+
+class CommitOutcome(NamedTuple):
+    """The outcome of committing one store of a batch with `commit_all`."""
+
+    name: str
+    committed: bool
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        """Whether the commit succeeded."""
+        return self.error is None
+
+
+def validate_merge_policy(merge: Optional[MergePolicy]) -> None:
+    """
+    Raises:
+        ValueError: If `merge` is not None, "ours", "theirs" or a callable.
+    """
+    if merge is not None and merge not in ("ours", "theirs") and not callable(merge):
+        raise ValueError('merge must be "ours", "theirs" or a callable')
+
+
+class KVStoreState:
+    """
+    The local contents of a key-value store and the keys changed since it was
+    loaded. Shared by DefiniteKVStore and AsyncDefiniteKVStore, which add the
+    requests.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._data: Dict[str, str] = {}
+        self._version_id: Optional[str] = None
+        # The loaded value of each key set or deleted since the store was
+        # loaded or last committed, or None if the key did not exist.
+        self._base: Dict[str, Optional[str]] = {}
+
+    def _set(self, key: str, value: str) -> None:
+        self._base.setdefault(key, self._data.get(key))
+        self._data[key] = value
+
+    def _delete(self, key: str) -> None:
+        value = self._data.pop(key)
+        self._base.setdefault(key, value)
+
+    def _dirty_keys(self) -> Set[str]:
+        return {key for key, base in self._base.items() if self._data.get(key) != base}
+
+    def _patch(self) -> Dict[str, Any]:
+        """Returns the changes since the store was loaded, as a patch."""
+        dirty = self._dirty_keys()
+        return {
+            "name": self._name,
+            "existing_version_id": self._version_id,
+            "set": {key: self._data[key] for key in dirty if key in self._data},
+            "delete": sorted(key for key in dirty if key not in self._data),
+        }
+
+    def _full_write(self) -> Dict[str, Any]:
+        """Returns the body of a commit that writes the whole store."""
+        return {
+            "name": self._name,
+            "data": self._data,
+            "existing_version_id": self._version_id,
+        }
+
+    def _finish_commit(self, response: Any) -> None:
+        """
+        Records the answer to a commit.
+
+        Raises:
+            KVStoreConflictError: If the store changed remotely.
+            Exception: If the commit failed otherwise.
+        """
+        if response.status_code in CONFLICT_STATUS_CODES:
+            raise KVStoreConflictError(
+                "The DefiniteKVStore was modified since it was loaded: "
+                + response.text,
+                self._name,
+                self._version_id,
+            )
+        elif response.status_code != 200:
+            raise Exception("Failed to commit the DefiniteKVStore: " + response.text)
+        self._version_id = response.json().get("version_id")
+        self._base.clear()
 
-class DefiniteKVStore:
+    @staticmethod
+    def _read_latest(response: Any) -> Tuple[Dict[str, str], Optional[str]]:
+        """Returns the data and version ID of a loaded store, if it exists."""
+        if response.status_code == 404:
+            return {}, None
+        elif response.status_code == 200:
+            response_json = response.json()
+            return response_json["data"], response_json["version_id"]
+        raise Exception("Failed to load the store: " + response.text)
+
+    def _merge_latest(
+        self, theirs: Dict[str, str], version_id: Optional[str], policy: MergePolicy
+    ) -> None:
+        """Merges the dirty keys into the latest version of the store."""
+        merged = dict(theirs)
+        for key in self._dirty_keys():
+            base = self._base[key]
+            ours = self._data.get(key)
+            their_value = theirs.get(key)
+            if their_value == base:
+                value = ours
+            elif their_value == ours:
+                continue
+            elif callable(policy):
+                value = policy(key, base, ours, their_value)
+            else:
+                value = ours if policy == "ours" else their_value
+            if value is None:
+                merged.pop(key, None)
+            else:
+                merged[key] = value
+
+        # The merged keys are now dirty against the latest version.
+        self._base = {key: theirs.get(key) for key in self._base}
+        self._data = merged
+        self._version_id = version_id
+
+
+class DefiniteKVStore(KVStoreState):
     """
     A key-value store hosted by Definite.
 
@@ -27,80 +180,320 @@ class DefiniteKVStore:
 
     The store uses versioning to prevent conflicts/stomping. If the store has
     been modified since you last loaded it, the commit will fail.
+
+    Commits only send the keys whose values changed since the store was
+    loaded, as a patch against the loaded version. Committing a store without
+    changes does nothing:
+    >>> store.dirty_keys()
+    set()
+
+    To pick up changes made elsewhere, refresh the store. The request is
+    conditional, so an unchanged store is not downloaded again:
+    >>> store.refresh()
+
+    A lazy store is not fetched until it is first read or committed, so
+    opening it costs nothing. Values can be set before it is fetched:
+    >>> store = client.get_kv_store("my_store", lazy=True)
+    >>> store["key"] = "value"  # no request yet
+    >>> store.prefetch()  # fetch it now, for example from a worker thread
     """
 
-    def __init__(self, name: str, api_key: str, api_url: str):
+    def __init__(
+        self,
+        name: str,
+        api_key: str,
+        api_url: str,
+        session: Optional[DefiniteSession] = None,
+        deadline: Union[float, Deadline, None] = None,
+        lazy: bool = False,
+    ):
         """
         Initializes the DefiniteKVStore with the provided name and API key.
 
         Args:
             name (str): The name of the key-value store.
             api_key (str): The API key for authorization.
+            session (Optional[DefiniteSession]): The shared HTTP session. A new
+                one is created if not provided.
+            deadline (Optional[Union[float, Deadline]]): Time limit for loading
+                the store in seconds, or a Deadline shared with other calls.
+            lazy (bool): Whether to defer loading the store until it is first
+                read or committed, or `prefetch()` is called.
 
         Raises:
             Exception: If the store fails to load.
         """
 
+        super().__init__(name)
         self._api_key = api_key
-        self._name = name
+        self._session = resolve_session(session)
         self._store_url = api_url + STORE_ENDPOINT
-        response = requests.get(
-            self._store_url + f"/{name}",
-            headers={"Authorization": "Bearer " + self._api_key},
+        self._etag: Optional[str] = None
+        self._loaded = False
+        # Values set before a lazy store was loaded.
+        self._pending: Dict[str, str] = {}
+        self._load_deadline = deadline
+        if not lazy:
+            self.refresh(deadline=deadline)
+
+    @property
+    def name(self) -> str:
+        """The name of the store."""
+        return self._name
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the store has been fetched from the remote server."""
+        return self._loaded
+
+    def prefetch(self, *, deadline: Union[float, Deadline, None] = None) -> None:
+        """
+        Loads a lazy store now, if it has not been loaded yet.
+
+        Args:
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
+
+        Raises:
+            Exception: If the store fails to load.
+
+        Example:
+            with ThreadPoolExecutor() as pool:
+                pool.map(lambda store: store.prefetch(), stores)
+        """
+        if not self._loaded:
+            self.refresh(deadline=deadline)
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.refresh(deadline=self._load_deadline)
+
+    def _apply_pending(self) -> None:
+        """Marks the store loaded and replays the values set before then."""
+        self._loaded = True
+        pending, self._pending = self._pending, {}
+        for key, value in pending.items():
+            self[key] = value
+
+    def refresh(self, *, deadline: Union[float, Deadline, None] = None) -> bool:
+        """
+        Reloads the store from the remote server.
+
+        Once the store has been loaded, the request carries its ETag (or its
+        version ID, if the server sent no ETag) in an If-None-Match header,
+        and an unchanged store is answered with a 304 without a body. Servers
+        that ignore the header send the full store, which is loaded as usual.
+
+        Changes that were not committed are kept if the store is unchanged on
+        the server, and discarded otherwise. Values set on a lazy store before
+        its first load are kept.
+
+        Args:
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
+
+        Returns:
+            bool: Whether the store changed since it was last loaded.
+
+        Raises:
+            Exception: If the store fails to load.
+
+        Example:
+            if store.refresh():
+                print("store changed")
+        """
+        headers = {"Authorization": "Bearer " + self._api_key}
+        validator = self._validator()
+        if validator is not None:
+            headers["If-None-Match"] = validator
+        response = self._session.get(
+            self._store_url + f"/{self._name}",
+            headers=headers,
+            deadline=deadline,
         )
 
-        if response.status_code == 404:
+        if response.status_code == 304 and validator is not None:
+            # Store unchanged since it was last loaded.
+            return False
+        elif response.status_code == 404:
             # Store not found. Create a new one.
+            changed = self._version_id is not None
             self._data = {}
             self._version_id = None
+            self._etag = None
+            self._base.clear()
+            self._apply_pending()
+            return changed
         elif response.status_code == 200:
             # Store found. Load the data.
             response_json = response.json()
+            self._etag = response.headers.get("ETag")
+            if (
+                validator is not None
+                and response_json["version_id"] == self._version_id
+            ):
+                return False
             self._data = response_json["data"]
             self._version_id = response_json["version_id"]
+            self._base.clear()
+            self._apply_pending()
+            return True
         else:
             raise Exception("Failed to load the store: " + response.text)
 
-    def commit(self):
+    def _validator(self) -> Optional[str]:
+        """Returns the entity tag to revalidate the loaded store with."""
+        if self._etag:
+            return self._etag
+        if self._version_id is not None:
+            return f'"{self._version_id}"'
+        return None
+
+    def dirty_keys(self) -> Set[str]:
+        """
+        Returns the keys whose values differ from the loaded store.
+
+        Keys that were set back to their loaded value, or set and deleted
+        again, are not dirty.
+
+        Example:
+            store["key1"] = "value1"
+            print(store.dirty_keys())  # {"key1"}
+        """
+        self._ensure_loaded()
+        return self._dirty_keys()
+
+    def commit(
+        self,
+        *,
+        merge: Optional[MergePolicy] = None,
+        max_attempts: int = 5,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> bool:
         """
         Commits the current state of the store to the remote server.
 
+        The dirty keys are sent as a patch against the loaded version. The
+        whole store is written instead if it was never committed, or if the
+        server cannot apply patches, which is remembered by the client's
+        session for every store. Nothing is sent if no key is dirty.
+
+        If another commit landed since the store was loaded, the commit fails
+        with a KVStoreConflictError, unless a `merge` policy is given. The
+        latest version is then fetched and the dirty keys are merged into it:
+        keys that only changed here or only changed remotely take that
+        change, and keys that changed on both sides are resolved by the
+        policy. The merged store is committed again, with a backoff between
+        attempts.
+
+        Args:
+            merge (Optional[MergePolicy]): How to resolve keys changed both
+                here and remotely: "ours" keeps the local value, "theirs" the
+                remote one, and a callable `(key, base, ours, theirs)` returns
+                the value to keep. Values are None for missing keys, and a
+                callable returns None to delete the key. Conflicts raise if
+                not provided.
+            max_attempts (int): The maximum number of commit attempts when
+                merging.
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
+
+        Returns:
+            bool: Whether changes were sent to the server.
+
         Raises:
+            KVStoreConflictError: If the store changed remotely and no merge
+                policy was given, or merging did not succeed in time.
             Exception: If the commit fails.
 
         Example:
             store.commit()
+            store.commit(merge="ours")
         """
-        response = requests.post(
-            self._store_url,
-            json={
-                "name": self._name,
-                "data": self._data,
-                "existing_version_id": self._version_id,
-            },
+        validate_merge_policy(merge)
+        deadline = Deadline.coerce(deadline)
+        if not self._loaded:
+            if not self._pending:
+                # A lazy store that was never read or written has no changes.
+                return False
+            self.refresh(deadline=deadline)
+
+        attempt = 1
+        while True:
+            if not self.dirty_keys():
+                self._base.clear()
+                return False
+            try:
+                self._send(deadline)
+                return True
+            except KVStoreConflictError:
+                if merge is None or attempt >= max_attempts:
+                    raise
+                delay = self._session.retry_policy.backoff(attempt)
+                if deadline is not None and deadline.remaining() <= delay:
+                    raise
+                time.sleep(delay)
+                self._merge(merge, deadline)
+                attempt += 1
+
+    def _send(self, deadline: Optional[Deadline]) -> None:
+        """Sends the dirty keys, or the whole store, to the server."""
+        response = None
+        patch_supported = self._store_url not in self._session.patch_unsupported
+        if self._version_id is not None and patch_supported:
+            response = self._session.patch(
+                self._store_url,
+                json=self._patch(),
+                headers={"Authorization": "Bearer " + self._api_key},
+                deadline=deadline,
+            )
+            if response.status_code in PATCH_UNSUPPORTED_STATUS_CODES:
+                self._session.patch_unsupported.add(self._store_url)
+            if response.status_code in PATCH_FALLBACK_STATUS_CODES:
+                response = None
+
+        if response is None:
+            response = self._session.post(
+                self._store_url,
+                json=self._full_write(),
+                headers={"Authorization": "Bearer " + self._api_key},
+                deadline=deadline,
+            )
+
+        self._finish_commit(response)
+        # The ETag of the commit response does not describe the store.
+        self._etag = None
+
+    def _merge(self, policy: MergePolicy, deadline: Optional[Deadline]) -> None:
+        """Merges the dirty keys into the latest version of the store."""
+        response = self._session.get(
+            self._store_url + f"/{self._name}",
             headers={"Authorization": "Bearer " + self._api_key},
+            deadline=deadline,
         )
+        theirs, version_id = self._read_latest(response)
+        self._merge_latest(theirs, version_id, policy)
+        self._etag = response.headers.get("ETag")
 
-        if response.status_code != 200:
-            raise Exception("Failed to commit the DefiniteKVStore: " + response.text)
-        else:
-            response_json = response.json()
-            self._version_id = response_json.get("version_id")
-
-    def delete(self):
+    def delete(self, *, deadline: Union[float, Deadline, None] = None):
         """
         Deletes the store from the remote server.
 
+        Args:
+            deadline (Optional[Union[float, Deadline]]): Time limit for the
+                call in seconds, or a Deadline shared with other calls.
+
         Raises:
             Exception: If the delete fails.
 
         Example:
             store.delete()
         """
-        response = requests.delete(
+        response = self._session.delete(
             self._store_url,
             json={"name": self._name},
             headers={"Authorization": "Bearer " + self._api_key},
+            deadline=deadline,
         )
 
         if response.status_code != 200:
@@ -108,6 +501,10 @@ class DefiniteKVStore:
 
         self._data = {}
         self._version_id = None
+        self._etag = None
+        self._base.clear()
+        self._pending.clear()
+        self._loaded = True
 
     def __getitem__(self, key: str) -> Optional[str]:
         """
@@ -122,6 +519,7 @@ class DefiniteKVStore:
         Example:
             value = store["key1"]
         """
+        self._ensure_loaded()
         return self._data.get(key)
 
     def __setitem__(self, key: str, value: str):
@@ -140,7 +538,10 @@ class DefiniteKVStore:
         """
         assert isinstance(key, str)
         assert isinstance(value, str)
-        self._data[key] = value
+        if not self._loaded:
+            self._pending[key] = value
+            return
+        self._set(key, value)
 
     def __delitem__(self, key: str) -> None:
         """
@@ -152,7 +553,8 @@ class DefiniteKVStore:
         Example:
             del store["key1"]
         """
-        del self._data[key]
+        self._ensure_loaded()
+        self._delete(key)
 
     def __iter__(self) -> Iterator[str]:
         """
@@ -165,6 +567,7 @@ class DefiniteKVStore:
             for key in store:
                 print(key)
         """
+        self._ensure_loaded()
         return iter(self._data)
 
     def __len__(self) -> int:
@@ -177,6 +580,7 @@ class DefiniteKVStore:
         Example:
             length = len(store)
         """
+        self._ensure_loaded()
         return len(self._data)
 
     def __repr__(self) -> str:
@@ -189,6 +593,8 @@ class DefiniteKVStore:
         Example:
             print(store)
         """
+        if not self._loaded:
+            return f"<DefiniteKVStore {self._name!r} (not loaded)>"
         return repr(self._data)
 
     def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
@@ -205,4 +611,5 @@ class DefiniteKVStore:
         Example:
             value = store.get("key1", "default_value")
         """
+        self._ensure_loaded()
         return self._data.get(key, default)
@@ -0,0 +1,437 @@
+"""Incremental parsing of JSON API responses."""
+
+import codecs
+import json
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+import requests
+
+from definite_sdk.exceptions import DeadlineExceededError
+from definite_sdk.transport import Deadline
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# The parser used to stream rows out of response bodies: ijson, which picks
+# its fastest installed backend (the yajl2 C extension when available), or the
+# pure Python JsonArrayStream. Whole bodies are parsed with json.loads, which
+# is faster than either.
+JSON_BACKEND = f"ijson-{ijson.backend}" if ijson is not None else "python"
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class JsonArrayStream:
+    """
+    Parses a JSON object incrementally, yielding the items of one of its array
+    fields as soon as they are complete.
+
+    The other top-level fields are collected into `fields`, and those that
+    precede the array into `preceding`. `found` tells whether the array field
+    was seen. Only the current partial item is buffered, so memory use does
+    not grow with the size of the array.
+
+    >>> stream = JsonArrayStream("data")
+    >>> stream.feed(b'{"columns": ["a"], "data": [{"a": 1}, {"a"')
+    [{'a': 1}]
+    >>> stream.feed(b': 2}]}')
+    [{'a': 2}]
+    >>> stream.close()
+    []
+    >>> stream.fields
+    {'columns': ['a']}
+    """
+
+    def __init__(self, key: str = "data"):
+        """
+        Args:
+            key (str): The top-level field whose array items are streamed.
+        """
+        self.key = key
+        self.fields: Dict[str, Any] = {}
+        self.preceding: Dict[str, Any] = {}
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._field = ""
+        self.found = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Parses the next chunk of the body and returns the completed items."""
+        self._buf = self._remaining() + self._text.decode(chunk)
+        self._pos = 0
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Parses whatever is left of the body and returns the completed items.
+
+        Raises:
+            ValueError: If the body is not a complete JSON object.
+        """
+        self._buf = self._remaining() + self._text.decode(b"", final=True)
+        self._pos = 0
+        items = self._parse(final=True)
+        if self._state != "done" or self._remaining().strip(_WHITESPACE):
+            raise ValueError("Incomplete or invalid JSON response body")
+        return items
+
+    def _remaining(self) -> str:
+        pos = self._pos
+        return self._buf[pos:]
+
+    def _skip_whitespace(self) -> bool:
+        """Advances past whitespace; returns whether any input is left."""
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return pos < len(buf)
+
+    def _decode_value(self, final: bool) -> Any:
+        """
+        Decodes the JSON value at the current position.
+
+        Raises:
+            _NeedMoreData: If the value may continue in the next chunk.
+        """
+        try:
+            value, end = _decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError("Invalid JSON in response body")
+            raise _NeedMoreData()
+        # A number at the very end of the buffer may still have more digits.
+        if end == len(self._buf) and not final:
+            raise _NeedMoreData()
+        self._pos = end
+        return value
+
+    def _parse(self, final: bool) -> List[Any]:
+        items: List[Any] = []
+        try:
+            while self._skip_whitespace():
+                char = self._buf[self._pos]
+                if self._state == "start":
+                    if char != "{":
+                        raise ValueError("Expected a JSON object response body")
+                    self._pos += 1
+                    self._state = "key"
+                elif self._state == "key":
+                    if char == "}":
+                        self._pos += 1
+                        self._state = "done"
+                    elif char == ",":
+                        self._pos += 1
+                    else:
+                        self._field = self._decode_value(final)
+                        self._state = "colon"
+                elif self._state == "colon":
+                    if char != ":":
+                        raise ValueError("Invalid JSON in response body")
+                    self._pos += 1
+                    self._state = "value"
+                elif self._state == "value":
+                    if self._field == self.key and char == "[":
+                        self._pos += 1
+                        self._state = "items"
+                        self.found = True
+                        self.preceding = dict(self.fields)
+                    else:
+                        self.fields[self._field] = self._decode_value(final)
+                        self._state = "key"
+                elif self._state == "items":
+                    if char == "]":
+                        self._pos += 1
+                        self._state = "key"
+                    elif char == ",":
+                        self._pos += 1
+                    else:
+                        items.append(self._decode_value(final))
+                else:
+                    break
+        except _NeedMoreData:
+            pass
+        return items
+
+
+class _NeedMoreData(Exception):
+    pass
+
+
+def iter_json_array(
+    chunks: Iterable[bytes],
+    key: str = "data",
+    fields: Optional[Dict[str, Any]] = None,
+) -> Iterator[Any]:
+    """
+    Yields the items of the `key` array of a streamed JSON object body.
+
+    Args:
+        chunks (Iterable[bytes]): The body.
+        key (str): The top-level field whose array items are yielded.
+        fields (Optional[Dict[str, Any]]): If given, filled with the other
+            top-level fields. The fields that precede the array are filled in
+            before its first item is yielded. Those that follow it are only
+            filled in when the array is empty or missing, once the body has
+            been read, so that which fields are known never depends on how
+            the body is split into chunks.
+    """
+    parser: Any
+    if ijson is not None and "." not in key:
+        parser = _IjsonFields(key)
+        items = _ijson_items(
+            _require_object(chunks),
+            f"{key}.item",
+            parser if fields is not None else None,
+        )
+    else:
+        parser = JsonArrayStream(key)
+        items = _stream_items(parser, chunks)
+
+    empty = True
+    for item in items:
+        if empty and fields is not None:
+            fields.update(parser.preceding)
+        empty = False
+        yield item
+    if empty and fields is not None:
+        fields.update(parser.fields)
+
+
+def _stream_items(stream: JsonArrayStream, chunks: Iterable[bytes]) -> Iterator[Any]:
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+    yield from stream.close()
+
+
+def load_json(chunks: Iterable[bytes]) -> Any:
+    """
+    Parses a JSON body read in chunks.
+
+    Raises:
+        ValueError: If the body is not valid JSON.
+    """
+    return json.loads(b"".join(chunks))
+
+
+class JsonBody(NamedTuple):
+    """A parsed response body, with the time spent downloading and parsing."""
+
+    value: Any
+    size: int
+    transfer_time: float
+    decode_time: float
+
+
+def iter_response_chunks(
+    response: requests.Response, deadline: Optional[Deadline] = None
+) -> Iterator[bytes]:
+    """
+    Yields the body of a streamed response in chunks, stopping when the
+    deadline of its call runs out.
+
+    Raises:
+        DeadlineExceededError: If the deadline runs out, or the connection
+            times out or drops once it has, while the body is being read.
+    """
+    content = iter(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+    while True:
+        if deadline is not None:
+            deadline.check()
+        try:
+            chunk = next(content, None)
+        except (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ) as exc:
+            # The read timeout was clamped to the deadline when the call was
+            # sent, so a stalled body times out once the deadline has passed.
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceededError(
+                    f"Deadline of {deadline.seconds:g}s exceeded: {exc}"
+                ) from exc
+            raise
+        if chunk is None:
+            return
+        yield chunk
+
+
+def read_json_response(
+    response: requests.Response, deadline: Optional[Deadline] = None
+) -> JsonBody:
+    """
+    Checks the status of a streamed response and reads and parses its JSON
+    body.
+
+    Args:
+        response (requests.Response): The streamed response.
+        deadline (Optional[Deadline]): The deadline of the call, which also
+            bounds reading the body.
+
+    Returns:
+        JsonBody: The parsed body, its size in bytes, and the seconds spent
+            waiting for the body and parsing it.
+
+    Raises:
+        requests.HTTPError: If the response has an error status.
+        ValueError: If the body is not valid JSON.
+        DeadlineExceededError: If the deadline runs out while the body is
+            being read.
+    """
+    size = 0
+    transfer_time = 0.0
+
+    def chunks() -> Iterator[bytes]:
+        nonlocal size, transfer_time
+        content = iter_response_chunks(response, deadline)
+        while True:
+            started = time.perf_counter()
+            chunk = next(content, None)
+            transfer_time += time.perf_counter() - started
+            if chunk is None:
+                return
+            size += len(chunk)
+            yield chunk
+
+    with response:
+        response.raise_for_status()
+        started = time.perf_counter()
+        value = load_json(chunks())
+        elapsed = time.perf_counter() - started
+    return JsonBody(value, size, transfer_time, max(0.0, elapsed - transfer_time))
+
+
+def _require_object(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Passes chunks through, checking that the body is a JSON object."""
+    checked = False
+    for chunk in chunks:
+        if not checked:
+            start = chunk.lstrip(b" \t\n\r")
+            if start:
+                if start[:1] != b"{":
+                    raise ValueError("Expected a JSON object response body")
+                checked = True
+        yield chunk
+
+
+def _ijson_items(
+    chunks: Iterable[bytes],
+    prefix: str,
+    collector: Optional["_IjsonFields"] = None,
+) -> Iterator[Any]:
+    """
+    Yields the values at `prefix` of a streamed JSON body using ijson.
+
+    If a collector is given, it is fed the body at least up to the first
+    value, so that it holds the fields that precede it, or all the fields
+    when there is no value.
+    """
+    reader = _ChunkReader(chunks, collector)
+    try:
+        for item in ijson.items(
+            reader, prefix, use_float=True, buf_size=STREAM_CHUNK_SIZE
+        ):
+            reader.collector = None
+            yield item
+    except ijson.JSONError as exc:
+        raise ValueError(f"Invalid JSON in response body: {exc}") from exc
+
+
+class _ChunkReader:
+    """
+    A file-like view of a body's chunks for ijson, which parses much faster
+    when it pulls the body itself than when the chunks are pushed to it.
+    """
+
+    def __init__(
+        self, chunks: Iterable[bytes], collector: Optional["_IjsonFields"] = None
+    ):
+        self.collector = collector
+        self._chunks = iter(chunks)
+        self._buf = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buf) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            if self.collector is not None:
+                self.collector.feed(chunk)
+            self._buf += chunk
+        if size < 0:
+            size = len(self._buf)
+        data = self._buf[:size]
+        self._buf = self._buf[size:]
+        return data
+
+
+# ijson events at a field's prefix that do not complete its value.
+_OPENING_EVENTS = ("start_map", "start_array", "map_key")
+
+
+class _IjsonFields:
+    """
+    Collects the top-level fields of a JSON object body from ijson parse
+    events, skipping the value of one of its fields. Like JsonArrayStream,
+    it also keeps the fields that precede that one in `preceding`.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.fields: Dict[str, Any] = {}
+        self.preceding: Dict[str, Any] = {}
+        self._events = ijson.sendable_list()
+        self._parser = ijson.parse_coro(self._events, use_float=True)
+        self._name: Optional[str] = None
+        self._builder: Any = None
+
+    def feed(self, chunk: bytes) -> None:
+        self._parser.send(chunk)
+        for prefix, event, value in self._events:
+            if prefix == "" and event == "map_key":
+                self._name = value
+                if value == self.key:
+                    self.preceding = dict(self.fields)
+                    self._builder = None
+                else:
+                    self._builder = ijson.ObjectBuilder()
+            elif self._builder is not None and self._name is not None:
+                self._builder.event(event, value)
+                if prefix == self._name and event not in _OPENING_EVENTS:
+                    self.fields[self._name] = self._builder.value
+                    self._builder = None
+        del self._events[:]
+
+
+def iter_row_batches(
+    response: requests.Response,
+    batch_size: int,
+    fields: Optional[Dict[str, Any]] = None,
+    deadline: Optional[Deadline] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Parses a streamed query response into batches of rows.
+
+    If `fields` is given, it is filled with the response's other top-level
+    fields, such as its `schema`; see `iter_json_array`. A `deadline` bounds
+    reading the body, as in `iter_response_chunks`.
+    """
+    with response:
+        batch: List[Dict[str, Any]] = []
+        chunks = iter_response_chunks(response, deadline)
+        for row in iter_json_array(chunks, "data", fields):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
@@ -0,0 +1,457 @@
+"""HTTP transport shared by the Definite clients."""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Optional, Set, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from definite_sdk.exceptions import CircuitOpenError, DeadlineExceededError
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 300.0
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed API call.
+
+    Delays grow exponentially with "full jitter" (a random delay between zero
+    and the exponential bound), and a `Retry-After` header sent by the API is
+    honoured instead. Idempotent calls (GET, DELETE and queries) are retried on
+    any transient failure. Other calls, such as KV store commits, are only
+    retried when the API cannot have acted on them: a rate limited (429)
+    response, or a connection that was never established.
+
+    Each endpoint also gets a circuit breaker. After
+    `circuit_failure_threshold` consecutive server errors or connection
+    failures, calls to that endpoint fail fast with CircuitOpenError for
+    `circuit_reset_timeout` seconds, after which a single trial call is let
+    through.
+
+    >>> client = DefiniteClient(
+    ...     "MY_API_KEY", retry_policy=RetryPolicy(max_attempts=5)
+    ... )
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        status_codes: FrozenSet[int] = RETRY_STATUS_CODES,
+        respect_retry_after: bool = True,
+        circuit_failure_threshold: Optional[int] = 5,
+        circuit_reset_timeout: float = 30.0,
+    ):
+        """
+        Args:
+            max_attempts (int): Total attempts per call, including the first.
+                Use 1 to disable retries.
+            backoff_factor (float): Upper bound in seconds of the first delay;
+                doubled on every further attempt.
+            max_backoff (float): Upper bound in seconds of any single delay.
+                A `Retry-After` longer than this is not waited for.
+            status_codes (FrozenSet[int]): Response codes that are retried.
+            respect_retry_after (bool): Whether to wait for `Retry-After`.
+            circuit_failure_threshold (Optional[int]): Consecutive failures
+                that open an endpoint's circuit. None disables the breaker.
+            circuit_reset_timeout (float): Seconds an open circuit fails fast
+                before letting a trial call through.
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.status_codes = status_codes
+        self.respect_retry_after = respect_retry_after
+        self.circuit_failure_threshold = circuit_failure_threshold
+        self.circuit_reset_timeout = circuit_reset_timeout
+
+    def backoff(self, attempt: int) -> float:
+        """Returns a jittered delay to wait after the given failed attempt."""
+        bound = min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1)))
+        return random.uniform(0, bound)
+
+    def delay_for_status(
+        self,
+        attempt: int,
+        status_code: int,
+        retry_after: Optional[str],
+        idempotent: bool,
+    ) -> Optional[float]:
+        """
+        Returns how long to wait before retrying a response, or None if the
+        response should be returned to the caller as is.
+        """
+        if attempt >= self.max_attempts or status_code not in self.status_codes:
+            return None
+        if not idempotent and status_code != 429:
+            return None
+
+        if self.respect_retry_after and retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return delay if delay <= self.max_backoff else None
+        return self.backoff(attempt)
+
+    def delay_for_error(
+        self, attempt: int, request_sent: bool, idempotent: bool
+    ) -> Optional[float]:
+        """
+        Returns how long to wait before retrying a connection error or
+        timeout, or None if it should be raised.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if request_sent and not idempotent:
+            return None
+        return self.backoff(attempt)
+
+
+class Deadline:
+    """
+    A point in time by which a call must finish.
+
+    A deadline covers every attempt and backoff delay of a call, and can be
+    passed on to each step of a multi-step operation so they share one
+    budget. Wherever the SDK accepts `deadline=`, a number of seconds can be
+    given instead of a Deadline.
+
+    >>> deadline = Deadline(30)
+    >>> result = sql_client.execute("SELECT 1", deadline=deadline)
+    """
+
+    def __init__(self, seconds: float):
+        """
+        Args:
+            seconds (float): Time from now until the deadline.
+        """
+        self.seconds = seconds
+        self._expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def coerce(cls, value: "DeadlineLike") -> Optional["Deadline"]:
+        """Returns `value` as a Deadline, starting now if given in seconds."""
+        if value is None or isinstance(value, Deadline):
+            return value
+        return cls(value)
+
+    def remaining(self) -> float:
+        """Returns the seconds left before the deadline."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self) -> None:
+        """
+        Raises:
+            DeadlineExceededError: If the deadline has passed.
+        """
+        if self.expired:
+            raise DeadlineExceededError(
+                f"Deadline of {self.seconds:g}s exceeded before the call completed"
+            )
+
+    def clamp(self, timeout: Tuple[float, float]) -> Tuple[float, float]:
+        """Shortens a (connect, read) timeout to fit in the remaining time."""
+        remaining = self.remaining()
+        return (min(timeout[0], remaining), min(timeout[1], remaining))
+
+
+DeadlineLike = Union[float, Deadline, None]
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Parses a `Retry-After` header given in seconds or as an HTTP date."""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def endpoint_key(url: str) -> str:
+    """
+    Returns the API endpoint a URL belongs to, such as
+    `api.definite.app/v1/store` for `.../v1/store/my_store`.
+    """
+    parts = urlsplit(url)
+    segments = [s for s in parts.path.split("/") if s]
+    kept = []
+    for segment in segments:
+        kept.append(segment)
+        if not (segment == "api" or (segment[:1] == "v" and segment[1:].isdigit())):
+            break
+    return parts.netloc + "/" + "/".join(kept)
+
+
+class CircuitBreaker:
+    """Fails fast on an endpoint after repeated consecutive failures."""
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_request(self) -> None:
+        """
+        Raises:
+            CircuitOpenError: If the circuit is open, or half open with a
+                trial call already in flight.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed >= self.reset_timeout and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        raise CircuitOpenError(
+            f"Circuit open for {self.name} after {self._failures} consecutive "
+            "failures; failing fast while the API recovers"
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Lets another call through after a trial that ended without an answer."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class CircuitBreakers:
+    """The circuit breakers of a retry policy, one per endpoint."""
+
+    def __init__(self, policy: RetryPolicy):
+        self._policy = policy
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> Optional[CircuitBreaker]:
+        if self._policy.circuit_failure_threshold is None:
+            return None
+        key = endpoint_key(url)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    key,
+                    self._policy.circuit_failure_threshold,
+                    self._policy.circuit_reset_timeout,
+                )
+                self._breakers[key] = breaker
+            return breaker
+
+
+def _request_was_sent(exc: requests.RequestException) -> bool:
+    """Whether a failed request may have reached the API."""
+    if isinstance(exc, requests.ConnectTimeout):
+        return False
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return not isinstance(reason, NewConnectionError)
+
+
+class DefiniteSession(requests.Session):
+    """
+    A `requests.Session` with a keep-alive connection pool sized for the SDK.
+
+    One session is owned by each DefiniteClient and handed to every store and
+    client it creates, so repeated calls reuse open TCP/TLS connections instead
+    of paying for a new handshake on every request. Calls are retried and
+    guarded by circuit breakers according to the session's RetryPolicy.
+
+    Besides the usual `requests` arguments, every request accepts
+    `idempotent=` to mark POSTs (such as queries) as safe to retry, and
+    `deadline=` to bound the call, retries included. Requests without an
+    explicit `timeout=` use the session's connect and read timeouts.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        retry_policy: Optional[RetryPolicy] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+    ):
+        """
+        Initializes the session and mounts a pooled adapter for http and https.
+
+        Args:
+            pool_connections (int): The number of host pools to cache.
+            pool_maxsize (int): The maximum number of connections kept open
+                per host.
+            retry_policy (Optional[RetryPolicy]): How failed calls are retried.
+                Defaults to RetryPolicy().
+            connect_timeout (float): Seconds to wait for a connection.
+            read_timeout (float): Seconds to wait for the API between bytes of
+                a response.
+        """
+        super().__init__()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.pool_maxsize = pool_maxsize
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breakers = CircuitBreakers(self.retry_policy)
+        self.timeout = (connect_timeout, read_timeout)
+        # The URLs that answered a PATCH as unsupported, so that every store
+        # sharing the session falls back to a full write without asking again.
+        self.patch_unsupported: Set[str] = set()
+
+    def request(  # type: ignore[override]
+        self,
+        method: str,
+        url: str,
+        *args: Any,
+        idempotent: Optional[bool] = None,
+        deadline: DeadlineLike = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        deadline = Deadline.coerce(deadline)
+        timeout = kwargs.pop("timeout", None) or self.timeout
+        policy = self.retry_policy
+        breaker = self.circuit_breakers.for_url(url)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_timeout = timeout
+            if deadline is not None:
+                deadline.check()
+                attempt_timeout = deadline.clamp(timeout)
+            if breaker is not None:
+                breaker.before_request()
+
+            kwargs["timeout"] = attempt_timeout
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if breaker is not None:
+                    breaker.record_failure()
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceededError(
+                        f"Deadline of {deadline.seconds:g}s exceeded: {exc}"
+                    ) from exc
+                delay = policy.delay_for_error(
+                    attempt, _request_was_sent(exc), idempotent
+                )
+                if delay is None or (breaker is not None and breaker.is_open):
+                    raise
+            except requests.RequestException:
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            except BaseException:
+                if breaker is not None:
+                    breaker.release_trial()
+                raise
+            else:
+                if breaker is not None:
+                    if response.status_code >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                delay = policy.delay_for_status(
+                    attempt,
+                    response.status_code,
+                    response.headers.get("Retry-After"),
+                    idempotent,
+                )
+                if delay is None or (breaker is not None and breaker.is_open):
+                    return response
+                response.close()
+
+            if deadline is not None and delay >= deadline.remaining():
+                raise DeadlineExceededError(
+                    f"Deadline of {deadline.seconds:g}s leaves no time to retry "
+                    f"{method} {url}"
+                )
+            time.sleep(delay)
+
+    if TYPE_CHECKING:
+        # The inherited helpers pass these keywords on to request() above;
+        # they are only redeclared so that type checkers accept them.
+
+        def get(  # type: ignore[override]
+            self,
+            url: str,
+            *,
+            idempotent: Optional[bool] = None,
+            deadline: DeadlineLike = None,
+            **kwargs: Any,
+        ) -> requests.Response: ...
+
+        def post(  # type: ignore[override]
+            self,
+            url: str,
+            data: Any = None,
+            json: Any = None,
+            *,
+            idempotent: Optional[bool] = None,
+            deadline: DeadlineLike = None,
+            **kwargs: Any,
+        ) -> requests.Response: ...
+
+        def patch(  # type: ignore[override]
+            self,
+            url: str,
+            data: Any = None,
+            *,
+            idempotent: Optional[bool] = None,
+            deadline: DeadlineLike = None,
+            **kwargs: Any,
+        ) -> requests.Response: ...
+
+        def delete(  # type: ignore[override]
+            self,
+            url: str,
+            *,
+            idempotent: Optional[bool] = None,
+            deadline: DeadlineLike = None,
+            **kwargs: Any,
+        ) -> requests.Response: ...
+
+
+def resolve_session(session: Optional[DefiniteSession]) -> DefiniteSession:
+    """Returns the given session, or a new one for standalone clients."""
+    return session if session is not None else DefiniteSession()
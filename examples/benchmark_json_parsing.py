@@ -0,0 +1,65 @@
+"""
+Times the JSON parsers used for query responses on a synthetic result:
+json.loads for whole bodies, and the ijson and pure Python parsers that
+execute_iter uses to stream rows.
+
+Run from the repository root: python examples/benchmark_json_parsing.py
+"""
+
+import json
+import time
+
+from definite_sdk import streaming
+from definite_sdk.streaming import STREAM_CHUNK_SIZE, iter_json_array
+
+ROWS = 300_000
+ROUNDS = 3
+
+
+def make_chunks():
+    body = json.dumps(
+        {
+            "schema": [{"name": "id", "type": "BIGINT"}],
+            "data": [
+                {"id": i, "name": f"row {i}", "score": i * 1.5, "ok": i % 2 == 0}
+                for i in range(ROWS)
+            ],
+        }
+    ).encode()
+    return [
+        body[i:][:STREAM_CHUNK_SIZE] for i in range(0, len(body), STREAM_CHUNK_SIZE)
+    ]
+
+
+def best_time(parse, chunks):
+    times = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        parse(chunks)
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def stream_rows(chunks):
+    for _ in iter_json_array(chunks):
+        pass
+
+
+def main():
+    chunks = make_chunks()
+    print(f"json.loads (whole body):  {best_time(streaming.load_json, chunks):.2f}s")
+
+    if streaming.ijson is not None:
+        print(f"ijson (streamed rows):    {best_time(stream_rows, chunks):.2f}s")
+    else:
+        print("ijson is not installed: pip install definite-sdk[ijson]")
+
+    ijson, streaming.ijson = streaming.ijson, None
+    try:
+        print(f"Python (streamed rows):   {best_time(stream_rows, chunks):.2f}s")
+    finally:
+        streaming.ijson = ijson
+
+
+if __name__ == "__main__":
+    main()
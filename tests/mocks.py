@@ -0,0 +1,22 @@
+"""Mock HTTP responses shared by the tests."""
+
+import json
+from unittest.mock import MagicMock
+
+import requests
+
+
+def make_response(payload=None, status_code=200, headers=None):
+    """Builds a mock streamed response with a JSON body."""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.status_code = status_code
+    response.headers = dict(headers or {})
+    response.json.return_value = payload
+    response.text = "" if payload is None else json.dumps(payload)
+    response.iter_content.return_value = iter([json.dumps(payload).encode()])
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(str(status_code))
+    else:
+        response.raise_for_status.return_value = None
+    return response
@@ -0,0 +1,275 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from definite_sdk.aio import (
+    AsyncDefiniteClient,
+    AsyncDefiniteKVStore,
+    AsyncDefiniteSqlClient,
+    RetryTransport,
+)
+from definite_sdk.exceptions import DeadlineExceededError, KVStoreConflictError
+from definite_sdk.transport import RetryPolicy
+
+TEST_API_KEY = "test_api_key"
+
+
+def make_client(handler):
+    client = AsyncDefiniteClient(TEST_API_KEY)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestAsyncDefiniteClient:
+    """Test cases for the asyncio client."""
+
+    def test_execute_sql(self):
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, json={"data": [{"count": 10}]})
+
+        async def run():
+            async with make_client(handler) as client:
+                sql_client = client.get_sql_client()
+                assert isinstance(sql_client, AsyncDefiniteSqlClient)
+                return await sql_client.execute(
+                    "SELECT COUNT(*) AS count FROM users", integration_id="db"
+                )
+
+        result = asyncio.run(run())
+
+        assert result == {"data": [{"count": 10}]}
+        request = requests_seen[0]
+        assert str(request.url) == "https://api.definite.app/v1/query"
+        assert request.headers["Authorization"] == "Bearer test_api_key"
+        assert json.loads(request.content) == {
+            "sql": "SELECT COUNT(*) AS count FROM users",
+            "integration_id": "db",
+        }
+
+    def test_execute_fan_out(self):
+        def handler(request):
+            sql = json.loads(request.content)["sql"]
+            return httpx.Response(200, json={"data": [{"sql": sql}]})
+
+        async def run():
+            async with make_client(handler) as client:
+                sql_client = client.get_sql_client()
+                return await asyncio.gather(
+                    *(sql_client.execute(f"SELECT {i}") for i in range(5))
+                )
+
+        results = asyncio.run(run())
+        assert [r["data"][0]["sql"] for r in results] == [
+            f"SELECT {i}" for i in range(5)
+        ]
+
+    def test_execute_http_error(self):
+        def handler(request):
+            return httpx.Response(500, json={"error": "boom"})
+
+        async def run():
+            async with make_client(handler) as client:
+                await client.get_sql_client().execute("SELECT 1")
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
+
+    def test_kv_store_load_and_commit(self):
+        posted = []
+
+        def handler(request):
+            if request.method == "GET":
+                return httpx.Response(
+                    200, json={"data": {"a": "1"}, "version_id": "v1"}
+                )
+            if request.method == "PATCH":
+                return httpx.Response(405)
+            posted.append(json.loads(request.content))
+            return httpx.Response(200, json={"version_id": "v2"})
+
+        async def run():
+            async with make_client(handler) as client:
+                store = await client.get_kv_store("my_store")
+                assert isinstance(store, AsyncDefiniteKVStore)
+                assert store["a"] == "1"
+                store["b"] = "2"
+                await store.commit()
+                return store
+
+        store = asyncio.run(run())
+        assert posted == [
+            {
+                "name": "my_store",
+                "data": {"a": "1", "b": "2"},
+                "existing_version_id": "v1",
+            }
+        ]
+        assert store._version_id == "v2"
+
+    def test_kv_store_commits_dirty_keys_and_merges(self):
+        patches = []
+        latest = {"data": {"a": "1", "b": "theirs"}, "version_id": "v2"}
+
+        def handler(request):
+            if request.method == "GET":
+                return httpx.Response(200, json=latest)
+            patches.append(json.loads(request.content))
+            if patches[-1]["existing_version_id"] == "v1":
+                return httpx.Response(409)
+            return httpx.Response(200, json={"version_id": "v3"})
+
+        async def run():
+            async with make_client(handler) as client:
+                store = await client.get_kv_store("my_store")
+                assert await store.commit() is False
+                store["a"] = "ours"
+                assert store.dirty_keys() == {"a"}
+                with pytest.raises(KVStoreConflictError):
+                    await store.commit()
+                latest["version_id"] = "v2"
+                assert await store.commit(merge="ours") is True
+                return store
+
+        latest["version_id"] = "v1"
+        store = asyncio.run(run())
+        assert patches[-1] == {
+            "name": "my_store",
+            "existing_version_id": "v2",
+            "set": {"a": "ours"},
+            "delete": [],
+        }
+        assert dict(store._data) == {"a": "ours", "b": "theirs"}
+        assert store.dirty_keys() == set()
+
+    def test_send_slack_message(self):
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, json={"ok": True})
+
+        async def run():
+            async with make_client(handler) as client:
+                return await client.get_message_client().send_slack_message(
+                    integration_id="slack_123", channel_id="C1", text="Hello"
+                )
+
+        assert asyncio.run(run()) == {"ok": True}
+        assert str(requests_seen[0].url) == "https://api.definite.app/v3/slack/message"
+        assert json.loads(requests_seen[0].content) == {
+            "integration_id": "slack_123",
+            "channel_id": "C1",
+            "text": "Hello",
+        }
+
+
+class TestRetryTransport:
+    """Test cases for retries in the asyncio client."""
+
+    def test_retries_query_on_503(self):
+        statuses = [503, 200]
+
+        def handler(request):
+            return httpx.Response(statuses.pop(0), json={"data": []})
+
+        async def run():
+            client = AsyncDefiniteClient(TEST_API_KEY)
+            transport = RetryTransport(
+                httpx.MockTransport(handler), RetryPolicy(backoff_factor=0)
+            )
+            client._http = httpx.AsyncClient(transport=transport)
+            async with client:
+                return await client.get_sql_client().execute("SELECT 1")
+
+        assert asyncio.run(run()) == {"data": []}
+        assert statuses == []
+
+    def test_message_post_not_retried_on_503(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        async def run():
+            client = AsyncDefiniteClient(TEST_API_KEY)
+            transport = RetryTransport(
+                httpx.MockTransport(handler), RetryPolicy(backoff_factor=0)
+            )
+            client._http = httpx.AsyncClient(transport=transport)
+            async with client:
+                await client.get_message_client().send_slack_message(
+                    integration_id="slack_123", channel_id="C1", text="Hello"
+                )
+
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(run())
+        assert len(calls) == 1
+
+    def test_deadline_exceeded(self):
+        def handler(request):
+            return httpx.Response(503, headers={"Retry-After": "10"})
+
+        async def run():
+            client = AsyncDefiniteClient(TEST_API_KEY)
+            transport = RetryTransport(httpx.MockTransport(handler), RetryPolicy())
+            client._http = httpx.AsyncClient(transport=transport)
+            async with client:
+                await client.get_sql_client().execute("SELECT 1", deadline=1.0)
+
+        with pytest.raises(DeadlineExceededError):
+            asyncio.run(run())
+
+    def test_retries_query_on_dropped_connection(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.RemoteProtocolError("Server disconnected", request=request)
+            return httpx.Response(200, json={"data": []})
+
+        async def run():
+            client = AsyncDefiniteClient(TEST_API_KEY)
+            transport = RetryTransport(
+                httpx.MockTransport(handler), RetryPolicy(backoff_factor=0)
+            )
+            client._http = httpx.AsyncClient(transport=transport)
+            async with client:
+                return await client.get_sql_client().execute("SELECT 1")
+
+        assert asyncio.run(run()) == {"data": []}
+        assert len(calls) == 2
+
+    def test_failed_trial_does_not_leave_circuit_stuck(self):
+        outcomes = [
+            httpx.Response(503),
+            ValueError("unexpected"),
+            httpx.Response(200, json={"data": []}),
+        ]
+
+        def handler(request):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        policy = RetryPolicy(
+            max_attempts=1, circuit_failure_threshold=1, circuit_reset_timeout=0
+        )
+        transport = RetryTransport(httpx.MockTransport(handler), policy)
+
+        async def run():
+            async with httpx.AsyncClient(transport=transport) as http:
+                url = "https://api.definite.app/v1/query"
+                await http.get(url)
+                with pytest.raises(ValueError):
+                    await http.get(url)
+                return await http.get(url)
+
+        assert asyncio.run(run()).status_code == 200
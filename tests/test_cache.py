@@ -0,0 +1,249 @@
+import io
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from definite_sdk.cache import (
+    DiskQueryCache,
+    QueryCache,
+    normalize_sql,
+    sql_cache_key,
+)
+from definite_sdk.client import DefiniteClient
+from tests.mocks import make_response
+
+TEST_API_KEY = "test_api_key"
+
+
+class TestNormalizeSql:
+    """Test cases for SQL cache key normalization."""
+
+    def test_collapses_whitespace_and_semicolons(self):
+        assert normalize_sql("  SELECT *\n\tFROM  t ;\n") == "SELECT * FROM t"
+
+    def test_keeps_quoted_text(self):
+        assert normalize_sql("SELECT 'a  b'  FROM \"my  t\"") == (
+            "SELECT 'a  b' FROM \"my  t\""
+        )
+
+    def test_equivalent_queries_share_a_key(self):
+        assert sql_cache_key("SELECT 1;", None) == sql_cache_key(" SELECT  1", None)
+        assert sql_cache_key("SELECT 1", "a") != sql_cache_key("SELECT 1", "b")
+
+
+class TestQueryCache:
+    """Test cases for the QueryCache class."""
+
+    def test_hit_and_miss_counters(self):
+        cache = QueryCache()
+        assert cache.get("k") is None
+        cache.put("k", {"data": [1]}, 5)
+        assert cache.get("k") == {"data": [1]}
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries, stats.size_bytes) == (
+            1,
+            1,
+            1,
+            5,
+        )
+
+    @patch("definite_sdk.cache.time.monotonic")
+    def test_entries_expire_after_ttl(self, mock_monotonic):
+        cache = QueryCache(ttl=10)
+        mock_monotonic.return_value = 100.0
+        cache.put("k", {"data": []}, 1)
+
+        mock_monotonic.return_value = 109.0
+        assert cache.get("k") is not None
+        mock_monotonic.return_value = 110.0
+        assert cache.get("k") is None
+        assert cache.stats().entries == 0
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = QueryCache(max_bytes=10)
+        cache.put("a", {"data": "a"}, 4)
+        cache.put("b", {"data": "b"}, 4)
+        cache.get("a")
+        cache.put("c", {"data": "c"}, 4)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats().evictions == 1
+        assert cache.stats().size_bytes == 8
+
+    def test_skips_results_larger_than_the_cache(self):
+        cache = QueryCache(max_bytes=10)
+        cache.put("k", {"data": []}, 11)
+        assert cache.stats().entries == 0
+
+
+class TestSqlClientCaching:
+    """Test cases for query result caching in DefiniteSqlClient."""
+
+    def setup_method(self):
+        self.cache = QueryCache()
+        self.client = DefiniteClient(TEST_API_KEY, query_cache=self.cache)
+        self.sql_client = self.client.get_sql_client()
+
+    @patch("requests.Session.post")
+    def test_execute_serves_repeated_queries_from_cache(self, mock_post):
+        mock_post.return_value = make_response({"data": [{"n": 1}]})
+
+        first = self.sql_client.execute("SELECT 1 AS n")
+        second = self.sql_client.execute("SELECT 1  AS n;")
+
+        assert first == second == {"data": [{"n": 1}]}
+        assert mock_post.call_count == 1
+        assert self.cache.stats().hits == 1
+
+    @patch("requests.Session.post")
+    def test_changing_a_result_does_not_change_the_cache(self, mock_post):
+        mock_post.return_value = make_response({"columns": ["n"], "data": [[1]]})
+
+        self.sql_client.execute("SELECT 1").pop("data")
+
+        assert self.sql_client.execute("SELECT 1") == {
+            "columns": ["n"],
+            "data": [[1]],
+        }
+        assert mock_post.call_count == 1
+
+    @patch("requests.Session.post")
+    def test_execute_use_cache_false_bypasses_cache(self, mock_post):
+        mock_post.side_effect = lambda *args, **kwargs: make_response({"data": []})
+
+        self.sql_client.execute("SELECT 1")
+        self.sql_client.execute("SELECT 1", use_cache=False)
+
+        assert mock_post.call_count == 2
+
+    @patch("requests.Session.post")
+    def test_cube_query_invalidate_refreshes_cache(self, mock_post):
+        cube_query = {"measures": ["sales.total"], "limit": 10}
+        mock_post.return_value = make_response({"data": [{"total": 1}]})
+        self.sql_client.execute_cube_query(cube_query)
+
+        mock_post.return_value = make_response({"data": [{"total": 2}]})
+        refreshed = self.sql_client.execute_cube_query(cube_query, invalidate=True)
+        cached = self.sql_client.execute_cube_query(cube_query)
+
+        assert refreshed == cached == {"data": [{"total": 2}]}
+        assert mock_post.call_count == 2
+
+    @patch("requests.Session.post")
+    def test_errors_are_not_cached(self, mock_post):
+        error = MagicMock()
+        error.raise_for_status.side_effect = requests.HTTPError("500")
+        mock_post.side_effect = [error, make_response({"data": []})]
+
+        with pytest.raises(requests.HTTPError):
+            self.sql_client.execute("SELECT 1")
+        assert self.sql_client.execute("SELECT 1") == {"data": []}
+        assert mock_post.call_count == 2
+
+    def test_client_without_cache_does_not_cache(self):
+        sql_client = DefiniteClient(TEST_API_KEY).get_sql_client()
+        assert sql_client._cache is None
+
+
+def make_arrow_response(pa, table):
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.headers = {"Content-Type": "application/vnd.apache.arrow.stream"}
+    response.raw = io.BytesIO(sink.getvalue().to_pybytes())
+    return response
+
+
+class TestDiskQueryCache:
+    """Test cases for the DiskQueryCache class."""
+
+    @pytest.mark.parametrize("format", ["arrow", "parquet"])
+    def test_round_trip(self, tmp_path, format):
+        pa = pytest.importorskip("pyarrow")
+        cache = DiskQueryCache(str(tmp_path), format=format)
+        table = pa.table({"id": [1, 2], "name": ["a", None]})
+
+        assert cache.get("k") is None
+        cache.put("k", table)
+
+        assert cache.get("k").equals(table)
+        assert os.path.exists(cache.path_for("k"))
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    def test_entries_are_shared_between_instances(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table({"id": [1]})
+        DiskQueryCache(str(tmp_path)).put(("sql", "SELECT 1", None), table)
+
+        cached = DiskQueryCache(str(tmp_path)).get(("sql", "SELECT 1", None))
+        assert cached.equals(table)
+
+    def test_entries_expire_after_ttl(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        cache = DiskQueryCache(str(tmp_path), ttl=60)
+        cache.put("k", pa.table({"id": [1]}))
+        path = cache.path_for("k")
+        old = os.stat(path).st_mtime - 120
+        os.utime(path, (old, old))
+
+        assert cache.get("k") is None
+        assert not os.path.exists(path)
+
+    def test_evicts_least_recently_read_files(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table({"id": list(range(1000))})
+        cache = DiskQueryCache(str(tmp_path))
+        cache.put("a", table)
+        cache.put("b", table)
+        size = os.path.getsize(cache.path_for("a"))
+        os.utime(cache.path_for("a"), (1, os.stat(cache.path_for("a")).st_mtime))
+
+        cache.max_bytes = size * 2
+        cache.put("c", table)
+
+        assert not os.path.exists(cache.path_for("a"))
+        assert cache.get("b") is not None
+        assert cache.stats().evictions == 1
+
+    def test_abandoned_tee_is_not_cached(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table({"id": [1, 2, 3, 4]})
+        cache = DiskQueryCache(str(tmp_path))
+
+        reader = cache.tee("k", table.to_reader(max_chunksize=2))
+        reader.read_next_batch()
+        del reader
+
+        assert cache.get("k") is None
+        assert os.listdir(tmp_path) == []
+
+    def test_rejects_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            DiskQueryCache(str(tmp_path), format="csv")
+
+    @patch("requests.Session.post")
+    def test_execute_arrow_serves_hits_from_disk(self, mock_post, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table({"id": [1, 2, 3]})
+        mock_post.side_effect = [
+            make_arrow_response(pa, table),
+            make_arrow_response(pa, table),
+        ]
+        cache = DiskQueryCache(str(tmp_path))
+        sql_client = DefiniteClient(TEST_API_KEY, disk_cache=cache).get_sql_client()
+
+        assert sql_client.execute_arrow("SELECT id FROM t").equals(table)
+        reader = sql_client.execute_arrow("SELECT id FROM t", as_reader=True)
+        assert reader.read_all().equals(table)
+        assert mock_post.call_count == 1
+
+        sql_client.execute_arrow("SELECT id FROM t", use_cache=False)
+        assert mock_post.call_count == 2
@@ -0,0 +1,208 @@
+import decimal
+from unittest.mock import patch
+
+import pytest
+
+from definite_sdk.client import DefiniteClient
+from definite_sdk.columns import (
+    CubeColumns,
+    SqlColumns,
+    factorize,
+    sql_type_kind,
+    to_datetime64,
+    to_numeric,
+)
+from tests.mocks import make_response
+
+np = pytest.importorskip("numpy")
+
+TEST_API_KEY = "test_api_key"
+
+CUBE_QUERY = {
+    "measures": ["sales.total"],
+    "dimensions": ["sales.region"],
+    "timeDimensions": [{"dimension": "sales.date", "granularity": "month"}],
+}
+
+CUBE_RESULT = {
+    "data": [
+        {
+            "sales.region": "US",
+            "sales.date.month": "2024-02-01T00:00:00.000",
+            "sales.total": "7",
+        },
+        {
+            "sales.region": "EU",
+            "sales.date.month": "2024-01-01T00:00:00.000",
+            "sales.total": "5",
+        },
+        {
+            "sales.region": "US",
+            "sales.date.month": "2024-01-01T00:00:00.000",
+            "sales.total": "3",
+        },
+    ]
+}
+
+
+class TestColumnDecoders:
+    """Test cases for the column decoding helpers."""
+
+    def test_to_datetime64_handles_nulls_and_utc(self):
+        result = to_datetime64(["2024-01-01T00:00:00.000Z", None])
+        assert result.dtype == np.dtype("datetime64[ms]")
+        assert result[0] == np.datetime64("2024-01-01T00:00:00.000")
+        assert np.isnat(result[1])
+
+    def test_to_numeric_keeps_integers(self):
+        assert to_numeric(["1", "2"]).dtype == np.int64
+        assert to_numeric([1, 2]).tolist() == [1, 2]
+
+    def test_to_numeric_floats_and_nulls(self):
+        result = to_numeric(["1.5", None])
+        assert result.dtype == np.float64
+        assert result[0] == 1.5 and np.isnan(result[1])
+        assert to_numeric(["1", None]).dtype == np.float64
+
+    def test_factorize(self):
+        categorical = factorize(["b", "a", None, "b"])
+        assert categorical.codes.tolist() == [0, 1, -1, 0]
+        assert categorical.categories.tolist() == ["b", "a"]
+        assert categorical.values().tolist() == ["b", "a", None, "b"]
+
+
+class TestCubeColumns:
+    """Test cases for the CubeColumns class."""
+
+    def test_from_result_types_members(self):
+        columns = CubeColumns.from_result(CUBE_RESULT, CUBE_QUERY)
+
+        assert len(columns) == 3
+        assert columns["sales.date.month"].dtype.kind == "M"
+        assert columns["sales.total"].tolist() == [7, 5, 3]
+        assert columns.dimensions["sales.region"].codes.tolist() == [0, 1, 0]
+        assert columns["sales.region"].tolist() == ["US", "EU", "US"]
+
+    def test_from_result_uses_annotation_without_query(self):
+        result = dict(
+            CUBE_RESULT,
+            annotation={
+                "measures": {"sales.total": {}},
+                "dimensions": {"sales.region": {}},
+                "timeDimensions": {"sales.date.month": {}},
+            },
+        )
+        columns = CubeColumns.from_result(result)
+
+        assert set(columns.measures) == {"sales.total"}
+        assert set(columns.time_dimensions) == {"sales.date.month"}
+
+    def test_pivot(self):
+        columns = CubeColumns.from_result(CUBE_RESULT, CUBE_QUERY)
+
+        pivot = columns.pivot("sales.date.month", "sales.region", "sales.total")
+
+        assert pivot.rows.tolist() == [
+            np.datetime64("2024-01-01T00:00:00.000"),
+            np.datetime64("2024-02-01T00:00:00.000"),
+        ]
+        assert pivot.columns.tolist() == ["EU", "US"]
+        np.testing.assert_array_equal(pivot.values, [[5.0, 3.0], [np.nan, 7.0]])
+
+    def test_pivot_without_columns(self):
+        columns = CubeColumns.from_result(CUBE_RESULT, CUBE_QUERY)
+        pivot = columns.pivot("sales.region", None, "sales.total", fill_value=0)
+        assert pivot.rows.tolist() == ["EU", "US"]
+        assert pivot.values.tolist() == [[5.0], [3.0]]
+
+    @patch("requests.Session.post")
+    def test_execute_cube_columns(self, mock_post):
+        mock_post.return_value = make_response(CUBE_RESULT)
+        sql_client = DefiniteClient(TEST_API_KEY).get_sql_client()
+
+        columns = sql_client.execute_cube_columns(CUBE_QUERY)
+
+        assert columns.measures["sales.total"].sum() == 15
+
+
+SQL_RESULT = {
+    "columns": [
+        {"name": "id", "type": "BIGINT"},
+        {"name": "amount", "type": "DECIMAL(18,2)"},
+        {"name": "day", "type": "DATE"},
+        {"name": "created_at", "type": "TIMESTAMP WITH TIME ZONE"},
+        {"name": "paid", "type": "BOOLEAN"},
+        {"name": "note", "type": "VARCHAR"},
+    ],
+    "data": [
+        {
+            "id": "1",
+            "amount": "10.25",
+            "day": "2024-01-02",
+            "created_at": "2024-01-02 10:00:00+02:00",
+            "paid": True,
+            "note": "first",
+        },
+        {
+            "id": None,
+            "amount": None,
+            "day": None,
+            "created_at": None,
+            "paid": None,
+            "note": None,
+        },
+    ],
+}
+
+
+class TestSqlColumns:
+    """Test cases for the SqlColumns class."""
+
+    def test_sql_type_kind(self):
+        assert sql_type_kind("DECIMAL(18,2)") == "decimal"
+        assert sql_type_kind("timestamp with time zone") == "timestamp"
+        assert sql_type_kind("VARCHAR") == "string"
+        assert sql_type_kind(None) is None
+
+    def test_decodes_typed_columns_with_null_masks(self):
+        columns = SqlColumns.from_result(SQL_RESULT)
+
+        assert len(columns) == 2
+        assert columns["id"].dtype == np.int64
+        assert columns["amount"].dtype == np.float64
+        assert columns["day"].dtype == np.dtype("datetime64[D]")
+        assert columns["created_at"][0] == np.datetime64("2024-01-02T08:00:00")
+        assert columns["paid"].dtype == bool
+        for name in columns:
+            assert np.ma.getmaskarray(columns[name]).tolist() == [False, True]
+
+    def test_decimals_as_decimal(self):
+        columns = SqlColumns.from_result(SQL_RESULT, decimals="decimal")
+        assert columns["amount"][0] == decimal.Decimal("10.25")
+
+    def test_infers_types_without_schema(self):
+        columns = SqlColumns.from_result(
+            {"data": [{"a": 1, "b": 1.5, "c": "x"}, {"a": None, "b": 2, "c": None}]}
+        )
+        assert columns["a"].dtype == np.int64
+        assert columns["b"].dtype == np.float64
+        assert columns["c"].dtype == object
+        assert columns.types == {"a": None, "b": None, "c": None}
+
+    def test_to_pandas_uses_nullable_dtypes(self):
+        pytest.importorskip("pandas")
+        df = SqlColumns.from_result(SQL_RESULT).to_pandas()
+
+        assert str(df["id"].dtype) == "Int64"
+        assert str(df["paid"].dtype) == "boolean"
+        assert df["id"].isna().tolist() == [False, True]
+        assert df["created_at"].isna().tolist() == [False, True]
+
+    @patch("requests.Session.post")
+    def test_execute_columns(self, mock_post):
+        mock_post.return_value = make_response(SQL_RESULT)
+        sql_client = DefiniteClient(TEST_API_KEY).get_sql_client()
+
+        columns = sql_client.execute_columns("SELECT * FROM orders")
+
+        assert columns["amount"].sum() == 10.25
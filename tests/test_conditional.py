@@ -0,0 +1,114 @@
+from unittest.mock import patch
+
+from definite_sdk.cache import QueryCache
+from definite_sdk.client import DefiniteClient
+from tests.mocks import make_response
+
+TEST_API_KEY = "test_api_key"
+
+
+class TestStoreRevalidation:
+    """Test cases for conditional reloads of DefiniteKVStore."""
+
+    @patch("requests.Session.get")
+    def test_unchanged_store_is_not_reloaded(self, mock_get):
+        mock_get.side_effect = [
+            make_response(
+                {"data": {"a": "1"}, "version_id": "v1"}, headers={"ETag": '"e1"'}
+            ),
+            make_response(status_code=304),
+        ]
+        store = DefiniteClient(TEST_API_KEY).get_kv_store("state")
+        assert "If-None-Match" not in mock_get.call_args.kwargs["headers"]
+
+        store["b"] = "2"
+        assert store.refresh() is False
+
+        assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"e1"'
+        assert {key: store[key] for key in store} == {"a": "1", "b": "2"}
+
+    @patch("requests.Session.get")
+    def test_changed_store_is_reloaded(self, mock_get):
+        mock_get.side_effect = [
+            make_response({"data": {"a": "1"}, "version_id": "v1"}),
+            make_response({"data": {"a": "2"}, "version_id": "v2"}),
+        ]
+        store = DefiniteClient(TEST_API_KEY).get_kv_store("state")
+
+        assert store.refresh() is True
+
+        # Without an ETag the version ID is used as the validator.
+        assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+        assert store["a"] == "2"
+
+    @patch("requests.Session.get")
+    def test_server_without_conditional_support(self, mock_get):
+        mock_get.side_effect = [
+            make_response({"data": {"a": "1"}, "version_id": "v1"}),
+            make_response({"data": {"a": "1"}, "version_id": "v1"}),
+        ]
+        store = DefiniteClient(TEST_API_KEY).get_kv_store("state")
+        store["b"] = "2"
+
+        assert store.refresh() is False
+        assert store["b"] == "2"
+
+
+class TestQueryRevalidation:
+    """Test cases for conditional requests of expired cached query results."""
+
+    def setup_method(self):
+        self.cache = QueryCache(ttl=0)
+        self.sql_client = DefiniteClient(
+            TEST_API_KEY, query_cache=self.cache
+        ).get_sql_client()
+
+    @patch("requests.Session.post")
+    def test_not_modified_serves_cached_result(self, mock_post):
+        mock_post.side_effect = [
+            make_response({"data": [{"n": 1}]}, headers={"ETag": '"q1"'}),
+            make_response(status_code=304),
+        ]
+
+        first = self.sql_client.execute("SELECT 1")
+        second = self.sql_client.execute("SELECT 1")
+
+        assert second == first
+        headers = mock_post.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"q1"'
+        assert self.cache.stats().revalidations == 1
+
+    @patch("requests.Session.post")
+    def test_modified_result_replaces_cached_result(self, mock_post):
+        mock_post.side_effect = [
+            make_response({"data": [{"n": 1}]}, headers={"ETag": '"q1"'}),
+            make_response({"data": [{"n": 2}]}, headers={"ETag": '"q2"'}),
+        ]
+
+        self.sql_client.execute("SELECT 1")
+        result = self.sql_client.execute("SELECT 1")
+
+        assert result == {"data": [{"n": 2}]}
+        assert self.cache.stale(("sql", "SELECT 1", None)) == (result, '"q2"')
+
+    @patch("requests.Session.post")
+    def test_results_without_etag_are_not_revalidated(self, mock_post):
+        mock_post.side_effect = lambda *a, **k: make_response({"data": []})
+
+        self.sql_client.execute("SELECT 1")
+        self.sql_client.execute("SELECT 1")
+
+        assert "If-None-Match" not in mock_post.call_args.kwargs["headers"]
+        assert self.cache.stats().entries == 1
+
+    @patch("requests.Session.post")
+    def test_invalidate_skips_revalidation(self, mock_post):
+        mock_post.side_effect = lambda *a, **k: make_response(
+            {"data": []}, headers={"ETag": '"c1"'}
+        )
+        cube_query = {"measures": ["sales.total"]}
+
+        self.sql_client.execute_cube_query(cube_query)
+        self.sql_client.execute_cube_query(cube_query, invalidate=True)
+
+        assert "If-None-Match" not in mock_post.call_args.kwargs["headers"]
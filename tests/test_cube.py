@@ -0,0 +1,147 @@
+from unittest.mock import patch
+
+from definite_sdk.client import DefiniteClient
+from definite_sdk.cube import is_mergeable, plan_cube_queries, split_cube_result
+from tests.mocks import make_response
+
+TEST_API_KEY = "test_api_key"
+
+BASE = {
+    "dimensions": ["sales.region"],
+    "timeDimensions": [{"dimension": "sales.date", "granularity": "month"}],
+    "filters": [{"member": "sales.channel", "operator": "equals", "values": ["web"]}],
+}
+
+
+class TestCubeQueryPlanning:
+    """Test cases for merging compatible Cube queries."""
+
+    def test_merges_queries_that_differ_only_in_measures(self):
+        queries = [
+            {**BASE, "measures": ["sales.total"]},
+            {**BASE, "measures": ["sales.count", "sales.total"]},
+            {**BASE, "dimensions": ["sales.city"], "measures": ["sales.total"]},
+        ]
+
+        plan = plan_cube_queries(queries)
+
+        assert len(plan) == 2
+        merged, indexes = plan[0]
+        assert indexes == [0, 1]
+        assert merged["measures"] == ["sales.total", "sales.count"]
+        assert queries[0]["measures"] == ["sales.total"]
+        assert plan[1][1] == [2]
+
+    def test_limited_queries_need_an_order_without_measures(self):
+        assert is_mergeable({**BASE, "measures": ["sales.total"]})
+        assert not is_mergeable({**BASE, "measures": ["sales.total"], "limit": 10})
+        assert not is_mergeable(
+            {
+                **BASE,
+                "measures": ["sales.total"],
+                "limit": 10,
+                "order": {"sales.total": "desc"},
+            }
+        )
+        assert is_mergeable(
+            {
+                **BASE,
+                "measures": ["sales.total"],
+                "limit": 10,
+                "order": [["sales.region", "asc"]],
+            }
+        )
+
+    def test_queries_need_an_order_or_a_time_granularity(self):
+        query = {"dimensions": ["sales.region"], "measures": ["sales.total"]}
+        assert not is_mergeable(query)
+        assert not is_mergeable(
+            {**query, "timeDimensions": [{"dimension": "sales.date"}]}
+        )
+        assert is_mergeable({**query, "order": {"sales.region": "asc"}})
+        assert not is_mergeable({**query, "order": {"sales.total": "desc"}})
+
+        plan = plan_cube_queries([query, {**query, "measures": ["sales.count"]}])
+        assert len(plan) == 2
+
+    def test_identical_unmergeable_queries_share_a_request(self):
+        query = {**BASE, "measures": ["sales.total"], "limit": 10}
+        plan = plan_cube_queries([query, dict(query)])
+        assert [indexes for _, indexes in plan] == [[0, 1]]
+
+    def test_split_removes_other_measures(self):
+        merged = {**BASE, "measures": ["sales.total", "sales.count"]}
+        result = {
+            "data": [{"sales.region": "EU", "sales.total": 5, "sales.count": 2}],
+            "annotation": {"measures": {"sales.total": {}, "sales.count": {}}},
+        }
+
+        split = split_cube_result(result, {**BASE, "measures": ["sales.count"]}, merged)
+
+        assert split["data"] == [{"sales.region": "EU", "sales.count": 2}]
+        assert list(split["annotation"]["measures"]) == ["sales.count"]
+        assert "sales.total" in result["data"][0]
+
+
+class TestExecuteCubeQueries:
+    """Test cases for DefiniteSqlClient.execute_cube_queries."""
+
+    def setup_method(self):
+        self.sql_client = DefiniteClient(TEST_API_KEY).get_sql_client()
+
+    @patch("requests.Session.post")
+    def test_merged_request_is_split_per_query(self, mock_post):
+        mock_post.return_value = make_response(
+            {"data": [{"sales.region": "EU", "sales.total": 5, "sales.count": 2}]}
+        )
+
+        totals, counts = self.sql_client.execute_cube_queries(
+            [
+                {**BASE, "measures": ["sales.total"]},
+                {**BASE, "measures": ["sales.count"]},
+            ]
+        )
+
+        assert mock_post.call_count == 1
+        sent = mock_post.call_args.kwargs["json"]["cube_query"]
+        assert sent["measures"] == ["sales.total", "sales.count"]
+        assert totals["data"] == [{"sales.region": "EU", "sales.total": 5}]
+        assert counts["data"] == [{"sales.region": "EU", "sales.count": 2}]
+
+    @patch("requests.Session.post")
+    def test_merge_false_sends_each_query(self, mock_post):
+        mock_post.side_effect = lambda *args, **kwargs: make_response({"data": []})
+
+        results = self.sql_client.execute_cube_queries(
+            [
+                {**BASE, "measures": ["sales.total"]},
+                {**BASE, "measures": ["sales.count"]},
+            ],
+            merge=False,
+        )
+
+        assert len(results) == 2
+        assert mock_post.call_count == 2
+
+    @patch("requests.Session.post")
+    def test_unsplittable_result_falls_back_to_single_queries(self, mock_post):
+        def respond(url, json, **kwargs):
+            measures = json["cube_query"]["measures"]
+            if len(measures) > 1:
+                return make_response({"results": "opaque"})
+            return make_response({"data": [{measures[0]: 1}]})
+
+        mock_post.side_effect = respond
+
+        results = self.sql_client.execute_cube_queries(
+            [
+                {**BASE, "measures": ["sales.total"]},
+                {**BASE, "measures": ["sales.count"]},
+            ]
+        )
+
+        assert results == [
+            {"data": [{"sales.total": 1}]},
+            {"data": [{"sales.count": 1}]},
+        ]
+        assert mock_post.call_count == 3
@@ -0,0 +1,102 @@
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from definite_sdk.client import DefiniteClient
+from definite_sdk.incremental import sql_literal
+from tests.mocks import make_response
+
+TEST_API_KEY = "test_api_key"
+
+
+class TestIncrementalQuery:
+    """Test cases for watermark-based incremental fetching."""
+
+    @patch("requests.Session.get")
+    def setup_method(self, method, mock_get):
+        mock_get.return_value = Mock(status_code=404)
+        self.client = DefiniteClient(TEST_API_KEY)
+        self.sql_client = self.client.get_sql_client()
+        self.store = self.client.get_kv_store("sync_state")
+
+    def test_sql_literal(self):
+        assert sql_literal(42) == "42"
+        assert sql_literal("it's") == "'it''s'"
+        assert sql_literal(True) == "TRUE"
+        with pytest.raises(TypeError):
+            sql_literal(["x"])
+
+    def test_first_run_fetches_everything(self):
+        sync = self.sql_client.incremental(
+            "SELECT * FROM orders", "updated_at", self.store, key="orders"
+        )
+        assert sync.build_sql(sync.watermark) == (
+            'SELECT * FROM (SELECT * FROM orders) AS incremental ORDER BY "updated_at"'
+        )
+
+    @patch("requests.Session.post")
+    def test_execute_incremental_advances_watermark(self, mock_post):
+        mock_post.side_effect = [
+            make_response({"data": [{"id": 3}, {"id": 7}, {"id": 5}]}),
+            make_response({"version_id": "v1"}),
+            make_response({"data": []}),
+        ]
+
+        result = self.sql_client.execute_incremental(
+            "SELECT * FROM events", "id", self.store, key="events", initial=2
+        )
+
+        assert len(result["data"]) == 3
+        first_sql = mock_post.call_args_list[0].kwargs["json"]["sql"]
+        assert first_sql.endswith('WHERE "id" > 2 ORDER BY "id"')
+        commit = mock_post.call_args_list[1].kwargs["json"]
+        assert commit["data"] == {"events": "7"}
+        assert self.store["events"] == "7"
+
+        self.sql_client.execute_incremental(
+            "SELECT * FROM events", "id", self.store, key="events"
+        )
+        second_sql = mock_post.call_args_list[2].kwargs["json"]["sql"]
+        assert 'WHERE "id" > 7' in second_sql
+        assert mock_post.call_count == 3  # nothing new, so no commit
+
+    @patch("requests.Session.post")
+    def test_fetch_iter_commits_processed_batches(self, mock_post):
+        rows = [{"ts": f"2024-01-0{i}"} for i in range(1, 6)]
+        mock_post.side_effect = [
+            make_response({"data": rows}),
+            make_response({"version_id": "v1"}),
+        ]
+        sync = self.sql_client.incremental("SELECT * FROM t", "ts", self.store, key="t")
+
+        batches = sync.fetch_iter(batch_size=2)
+        next(batches)
+        next(batches)
+        batches.close()
+
+        assert sync.commit() is True
+        assert json.loads(self.store["t"]) == "2024-01-02"
+        assert sync.commit() is False
+
+    @patch("requests.Session.post")
+    def test_fetch_iter_holds_back_last_cursor_value(self, mock_post):
+        rows = [{"t": 5}, {"t": 5}, {"t": 5}, {"t": 6}]
+        mock_post.side_effect = lambda *a, **k: make_response({"data": rows[:3]})
+        sync = self.sql_client.incremental("SELECT * FROM t", "t", self.store, key="t")
+
+        batches = sync.fetch_iter(batch_size=2)
+        assert next(batches) == rows[:2]
+        next(batches)
+        batches.close()
+
+        # The third row with t = 5 was never processed.
+        assert sync.commit() is False
+
+        mock_post.side_effect = [
+            make_response({"data": rows}),
+            make_response({"version_id": "v1"}),
+        ]
+        assert sum(len(batch) for batch in sync.fetch_iter(batch_size=2)) == 4
+        assert sync.commit() is True
+        assert self.store["t"] == "6"
@@ -0,0 +1,108 @@
+import itertools
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from definite_sdk.client import DefiniteClient
+from definite_sdk.exceptions import DeadlineExceededError, QueryJobError
+from definite_sdk.jobs import QueryJob
+from tests.mocks import make_response
+
+TEST_API_KEY = "test_api_key"
+JOBS_URL = "https://api.definite.app/v1/query/jobs"
+
+
+class TestQueryJobs:
+    """Test cases for submitting and polling query jobs."""
+
+    def setup_method(self):
+        self.client = DefiniteClient(TEST_API_KEY)
+        self.sql_client = self.client.get_sql_client()
+
+    @patch("requests.Session.post")
+    def test_submit_returns_job(self, mock_post):
+        mock_post.return_value = make_response({"job_id": "j1", "status": "queued"})
+
+        job = self.sql_client.submit("SELECT * FROM big", integration_id="int")
+
+        assert isinstance(job, QueryJob)
+        assert job.job_id == "j1"
+        mock_post.assert_called_once_with(
+            JOBS_URL,
+            json={"sql": "SELECT * FROM big", "integration_id": "int"},
+            headers={"Authorization": "Bearer test_api_key"},
+            deadline=None,
+        )
+
+    @patch("definite_sdk.jobs.time.sleep")
+    @patch("requests.Session.get")
+    def test_result_polls_with_growing_interval(self, mock_get, mock_sleep):
+        mock_get.side_effect = [
+            make_response({"status": "running"}),
+            make_response({"status": "running"}),
+            make_response({"status": "running"}),
+            make_response({"status": "succeeded"}),
+            make_response({"data": [{"n": 1}]}),
+        ]
+        job = self.sql_client.get_job("j1")
+
+        assert job.result() == {"data": [{"n": 1}]}
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.25, 0.375, 0.5625]
+        assert mock_get.call_args_list[-1].args[0] == f"{JOBS_URL}/j1/result"
+
+    @patch("definite_sdk.jobs.time.sleep")
+    @patch("requests.Session.get")
+    def test_wait_honors_retry_after(self, mock_get, mock_sleep):
+        mock_get.side_effect = [
+            make_response({"status": "queued"}, headers={"Retry-After": "3"}),
+            make_response({"status": "succeeded"}),
+        ]
+
+        assert self.sql_client.get_job("j1").wait() == "succeeded"
+        mock_sleep.assert_called_once_with(3.0)
+
+    @patch("requests.Session.get")
+    def test_result_of_failed_job_raises(self, mock_get):
+        mock_get.return_value = make_response(
+            {"status": "failed", "error": "Division by zero"}
+        )
+
+        with pytest.raises(QueryJobError) as exc_info:
+            self.sql_client.get_job("j1").result()
+
+        assert str(exc_info.value) == "Division by zero"
+        assert exc_info.value.status == "failed"
+
+    @patch("definite_sdk.jobs.time.sleep")
+    @patch("definite_sdk.transport.time.monotonic")
+    @patch("requests.Session.get")
+    def test_wait_timeout(self, mock_get, mock_monotonic, mock_sleep):
+        mock_monotonic.side_effect = itertools.chain([0.0], itertools.repeat(11.0))
+        mock_get.return_value = make_response({"status": "running"})
+
+        with pytest.raises(DeadlineExceededError):
+            self.sql_client.get_job("j1").wait(timeout=10)
+
+    @patch("requests.Session.get")
+    def test_iter_result_streams_batches(self, mock_get):
+        body = json.dumps({"data": [{"id": i} for i in range(5)]}).encode()
+        result_response = MagicMock()
+        result_response.__enter__.return_value = result_response
+        result_response.iter_content.return_value = iter([body])
+        mock_get.side_effect = [make_response({"status": "succeeded"}), result_response]
+
+        batches = list(self.sql_client.get_job("j1").iter_result(batch_size=2))
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert mock_get.call_args.kwargs["stream"] is True
+
+    @patch("requests.Session.delete")
+    def test_cancel(self, mock_delete):
+        mock_delete.side_effect = [make_response({}), make_response({}, 409)]
+        job = self.sql_client.get_job("j1")
+
+        assert job.cancel() is True
+        assert job.info["status"] == "cancelled"
+        assert job.cancel() is False
+        assert mock_delete.call_args.args[0] == f"{JOBS_URL}/j1"
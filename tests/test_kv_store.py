@@ -0,0 +1,382 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from definite_sdk.client import DefiniteClient
+from definite_sdk.exceptions import KVStoreConflictError
+from tests.mocks import make_response
+
+TEST_API_KEY = "test_api_key"
+
+
+def load_store(data, version_id="v1", name="state"):
+    with patch("requests.Session.get") as mock_get:
+        mock_get.return_value = make_response({"data": data, "version_id": version_id})
+        return DefiniteClient(TEST_API_KEY).get_kv_store(name)
+
+
+class TestDeltaCommit:
+    """Test cases for committing only the changed keys of a store."""
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.patch")
+    def test_commit_sends_patch(self, mock_patch, mock_post):
+        mock_patch.return_value = make_response({"version_id": "v2"})
+        store = load_store({"a": "1", "b": "2", "big": "x" * 1000})
+
+        store["a"] = "10"
+        store["c"] = "3"
+        del store["b"]
+        store.commit()
+
+        mock_post.assert_not_called()
+        assert mock_patch.call_args.kwargs["json"] == {
+            "name": "state",
+            "existing_version_id": "v1",
+            "set": {"a": "10", "c": "3"},
+            "delete": ["b"],
+        }
+        assert store._version_id == "v2"
+
+        store["d"] = "4"
+        store.commit()
+        patch_body = mock_patch.call_args.kwargs["json"]
+        assert patch_body["existing_version_id"] == "v2"
+        assert patch_body["set"] == {"d": "4"}
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.patch")
+    def test_falls_back_to_full_write(self, mock_patch, mock_post):
+        mock_patch.return_value = make_response(status_code=405)
+        mock_post.return_value = make_response({"version_id": "v2"})
+        store = load_store({"a": "1"})
+
+        store["b"] = "2"
+        store.commit()
+        store["c"] = "3"
+        store.commit()
+
+        assert mock_patch.call_count == 1
+        assert mock_post.call_count == 2
+        assert mock_post.call_args.kwargs["json"] == {
+            "name": "state",
+            "data": {"a": "1", "b": "2", "c": "3"},
+            "existing_version_id": "v2",
+        }
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.patch")
+    def test_patch_not_found_is_not_remembered(self, mock_patch, mock_post):
+        mock_patch.return_value = make_response(status_code=404)
+        mock_post.return_value = make_response({"version_id": "v2"})
+        store = load_store({"a": "1"})
+
+        store["b"] = "2"
+        store.commit()
+        store["c"] = "3"
+        store.commit()
+
+        assert mock_patch.call_count == 2
+        assert mock_post.call_count == 2
+        assert store._session.patch_unsupported == set()
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.patch")
+    def test_patch_support_is_shared_by_the_session(self, mock_patch, mock_post):
+        mock_patch.return_value = make_response(status_code=405)
+        mock_post.return_value = make_response({"version_id": "v2"})
+        client = DefiniteClient(TEST_API_KEY)
+        with patch("requests.Session.get") as mock_get:
+            mock_get.side_effect = lambda *a, **k: make_response(
+                {"data": {"a": "1"}, "version_id": "v1"}
+            )
+            stores = [client.get_kv_store(name) for name in ["one", "two"]]
+
+        for store in stores:
+            store["b"] = "2"
+            store.commit()
+
+        assert mock_patch.call_count == 1
+        assert mock_post.call_count == 2
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.patch")
+    def test_new_store_is_written_in_full(self, mock_patch, mock_post):
+        mock_post.return_value = make_response({"version_id": "v1"})
+        with patch("requests.Session.get") as mock_get:
+            mock_get.return_value = make_response(status_code=404)
+            store = DefiniteClient(TEST_API_KEY).get_kv_store("state")
+
+        store["a"] = "1"
+        store.commit()
+
+        mock_patch.assert_not_called()
+        assert mock_post.call_args.kwargs["json"]["data"] == {"a": "1"}
+
+    @patch("requests.Session.patch")
+    def test_conflict_raises(self, mock_patch):
+        mock_patch.return_value = make_response(status_code=409)
+        store = load_store({"a": "1"})
+        store["a"] = "2"
+
+        with pytest.raises(KVStoreConflictError):
+            store.commit()
+        assert store.dirty_keys() == {"a"}
+
+
+class TestDirtyTracking:
+    """Test cases for tracking the changed keys of a store."""
+
+    def test_dirty_keys(self):
+        store = load_store({"a": "1", "b": "2"})
+        assert store.dirty_keys() == set()
+
+        store["a"] = "10"
+        store["c"] = "3"
+        del store["b"]
+        assert store.dirty_keys() == {"a", "b", "c"}
+
+        store["a"] = "1"
+        store["b"] = "2"
+        del store["c"]
+        assert store.dirty_keys() == set()
+
+    def test_missing_key_delete_raises(self):
+        store = load_store({})
+        with pytest.raises(KeyError):
+            del store["missing"]
+        assert store.dirty_keys() == set()
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.patch")
+    def test_clean_commit_is_a_no_op(self, mock_patch, mock_post):
+        store = load_store({"a": "1"})
+        store["a"] = "1"
+
+        assert store.commit() is False
+
+        mock_patch.assert_not_called()
+        mock_post.assert_not_called()
+        assert store._version_id == "v1"
+
+    @patch("requests.Session.patch")
+    def test_commit_clears_dirty_keys(self, mock_patch):
+        mock_patch.return_value = make_response({"version_id": "v2"})
+        store = load_store({"a": "1"})
+        store["a"] = "2"
+
+        assert store.commit() is True
+        assert store.dirty_keys() == set()
+        assert store.commit() is False
+        assert mock_patch.call_count == 1
+
+
+class TestLazyLoading:
+    """Test cases for deferring the load of a store."""
+
+    @patch("requests.Session.get")
+    def test_lazy_store_loads_on_first_read(self, mock_get):
+        mock_get.return_value = make_response({"data": {"a": "1"}, "version_id": "v1"})
+        store = DefiniteClient(TEST_API_KEY).get_kv_store("state", lazy=True)
+
+        assert not store.loaded
+        assert "not loaded" in repr(store)
+        mock_get.assert_not_called()
+
+        assert store["a"] == "1"
+        assert store.loaded
+        assert len(store) == 1
+        assert mock_get.call_count == 1
+
+    @patch("requests.Session.get")
+    def test_prefetch(self, mock_get):
+        mock_get.return_value = make_response(status_code=404)
+        store = DefiniteClient(TEST_API_KEY).get_kv_store("state", lazy=True)
+
+        store.prefetch()
+        store.prefetch()
+
+        assert store.loaded
+        assert mock_get.call_count == 1
+
+    @patch("requests.Session.post")
+    @patch("requests.Session.get")
+    def test_untouched_lazy_commit_makes_no_request(self, mock_get, mock_post):
+        store = DefiniteClient(TEST_API_KEY).get_kv_store("state", lazy=True)
+
+        assert store.commit() is False
+
+        mock_get.assert_not_called()
+        mock_post.assert_not_called()
+
+    @patch("requests.Session.patch")
+    @patch("requests.Session.get")
+    def test_blind_writes_are_kept_until_commit(self, mock_get, mock_patch):
+        mock_get.return_value = make_response(
+            {"data": {"a": "1", "b": "2"}, "version_id": "v1"}
+        )
+        mock_patch.return_value = make_response({"version_id": "v2"})
+        store = DefiniteClient(TEST_API_KEY).get_kv_store("state", lazy=True)
+
+        store["a"] = "1"
+        store["b"] = "20"
+        mock_get.assert_not_called()
+
+        assert store.commit() is True
+        assert mock_get.call_count == 1
+        assert mock_patch.call_args.kwargs["json"]["set"] == {"b": "20"}
+        assert store["a"] == "1" and store["b"] == "20"
+
+
+class TestMergeOnConflict:
+    """Test cases for three-way merging when a commit conflicts."""
+
+    def setup_method(self):
+        self.store = load_store({"a": "1", "b": "2", "c": "3"})
+        self.store["a"] = "ours"  # changed on both sides
+        self.store["b"] = "ours"  # changed here only
+        del self.store["c"]  # deleted here, unchanged remotely
+        self.latest = make_response(
+            {
+                "data": {"a": "theirs", "b": "2", "c": "3", "d": "new"},
+                "version_id": "v2",
+            },
+        )
+
+    def commit(self, merge, mock_get, mock_patch):
+        mock_get.return_value = self.latest
+        mock_patch.side_effect = [
+            make_response(status_code=409),
+            make_response({"version_id": "v3"}),
+        ]
+        with patch("time.sleep"):
+            assert self.store.commit(merge=merge) is True
+        return mock_patch.call_args.kwargs["json"]
+
+    @patch("requests.Session.patch")
+    @patch("requests.Session.get")
+    def test_merge_ours(self, mock_get, mock_patch):
+        body = self.commit("ours", mock_get, mock_patch)
+
+        assert body["existing_version_id"] == "v2"
+        assert body["set"] == {"a": "ours", "b": "ours"}
+        assert body["delete"] == ["c"]
+        assert {key: self.store[key] for key in self.store} == {
+            "a": "ours",
+            "b": "ours",
+            "d": "new",
+        }
+        assert self.store._version_id == "v3"
+
+    @patch("requests.Session.patch")
+    @patch("requests.Session.get")
+    def test_merge_theirs(self, mock_get, mock_patch):
+        body = self.commit("theirs", mock_get, mock_patch)
+
+        assert body["set"] == {"b": "ours"}
+        assert self.store["a"] == "theirs"
+
+    @patch("requests.Session.patch")
+    @patch("requests.Session.get")
+    def test_merge_callback(self, mock_get, mock_patch):
+        calls = []
+
+        def resolve(key, base, ours, theirs):
+            calls.append((key, base, ours, theirs))
+            return f"{ours}+{theirs}"
+
+        body = self.commit(resolve, mock_get, mock_patch)
+
+        assert calls == [("a", "1", "ours", "theirs")]
+        assert body["set"]["a"] == "ours+theirs"
+
+    @patch("requests.Session.patch")
+    @patch("requests.Session.get")
+    def test_gives_up_after_max_attempts(self, mock_get, mock_patch):
+        mock_get.return_value = self.latest
+        mock_patch.return_value = make_response(status_code=412)
+
+        with patch("time.sleep"), pytest.raises(KVStoreConflictError):
+            self.store.commit(merge="ours", max_attempts=3)
+        assert mock_patch.call_count == 3
+
+    def test_rejects_unknown_policy(self):
+        with pytest.raises(ValueError):
+            self.store.commit(merge="mine")
+
+
+class TestBatchStores:
+    """Test cases for opening and committing many stores at once."""
+
+    def setup_method(self):
+        self.client = DefiniteClient(TEST_API_KEY)
+
+    @patch("requests.Session.get")
+    def test_get_kv_stores(self, mock_get):
+        mock_get.side_effect = lambda url, **kwargs: make_response(
+            {"data": {"url": url}, "version_id": "v1"}
+        )
+        names = [f"dlt_state_{i}" for i in range(10)]
+
+        stores = self.client.get_kv_stores(names, max_workers=4)
+
+        assert list(stores) == names
+        assert mock_get.call_count == 10
+        for name, store in stores.items():
+            assert store.loaded
+            assert store["url"].endswith(f"/{name}")
+
+    @patch("requests.Session.get")
+    def test_get_kv_stores_raises_on_failure(self, mock_get):
+        mock_get.return_value = make_response(status_code=500)
+
+        with pytest.raises(Exception, match="Failed to load"):
+            self.client.get_kv_stores(["a", "b"])
+
+    @patch("requests.Session.patch")
+    def test_commit_all(self, mock_patch):
+        def patch_store(url, json, **kwargs):
+            if json["name"] == "bad":
+                return make_response(status_code=409)
+            return make_response({"version_id": "v2"})
+
+        mock_patch.side_effect = patch_store
+        stores = []
+        for name in ["good", "bad", "clean"]:
+            store = load_store({"a": "1"}, name=name)
+            if name != "clean":
+                store["a"] = "2"
+            stores.append(store)
+
+        outcomes = self.client.commit_all(stores, max_workers=2)
+
+        assert [outcome.name for outcome in outcomes] == ["good", "bad", "clean"]
+        good, bad, clean = outcomes
+        assert good.ok and good.committed
+        assert not bad.ok and isinstance(bad.error, KVStoreConflictError)
+        assert clean.ok and not clean.committed
+        assert mock_patch.call_count == 2
+
+    @patch("requests.Session.patch")
+    @patch("requests.Session.get")
+    def test_commit_all_skips_unloaded_stores(self, mock_get, mock_patch):
+        stores = [self.client.get_kv_store(name, lazy=True) for name in ["a", "b"]]
+
+        outcomes = self.client.commit_all(stores)
+
+        assert [outcome.committed for outcome in outcomes] == [False, False]
+        mock_get.assert_not_called()
+        mock_patch.assert_not_called()
+
+    @patch("requests.Session.get")
+    def test_max_workers_defaults_to_pool_size(self, mock_get):
+        mock_get.side_effect = lambda *a, **k: make_response(status_code=404)
+        client = DefiniteClient(TEST_API_KEY, pool_maxsize=3)
+
+        with patch(
+            "definite_sdk.client.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+        ) as executor:
+            client.get_kv_stores([f"s{i}" for i in range(5)])
+
+        assert executor.call_args.kwargs["max_workers"] == 3
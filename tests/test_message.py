@@ -20,7 +20,7 @@ class TestDefiniteMessageClient:
         assert client._api_key == api_key
         assert client._message_url == "https://api.definite.app/v3"
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_slack_message_simple(self, mock_post, message_client):
         # Mock response
         mock_response = Mock()
@@ -45,11 +45,12 @@ class TestDefiniteMessageClient:
                 "text": "Hello from test!",
             },
             headers={"Authorization": "Bearer test_api_key"},
+            deadline=None,
         )
 
         assert result == {"ok": True, "ts": "1234567890.123456"}
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_slack_message_with_blocks(self, mock_post, message_client):
         # Mock response
         mock_response = Mock()
@@ -81,9 +82,10 @@ class TestDefiniteMessageClient:
                 "blocks": blocks,
             },
             headers={"Authorization": "Bearer test_api_key"},
+            deadline=None,
         )
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_slack_message_with_thread(self, mock_post, message_client):
         # Mock response
         mock_response = Mock()
@@ -110,9 +112,10 @@ class TestDefiniteMessageClient:
                 "thread_ts": "1234567890.000000",
             },
             headers={"Authorization": "Bearer test_api_key"},
+            deadline=None,
         )
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_slack_message_convenience_method(self, mock_post, message_client):
         # Mock response
         mock_response = Mock()
@@ -136,6 +139,7 @@ class TestDefiniteMessageClient:
                 "text": "Hello from convenience method!",
             },
             headers={"Authorization": "Bearer test_api_key"},
+            deadline=None,
         )
 
         assert result == {"ok": True, "ts": "1234567890.123456"}
@@ -149,7 +153,7 @@ class TestDefiniteMessageClient:
                 content="Hello",
             )
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_email_message_simple(self, mock_post, message_client):
         mock_response = Mock()
         mock_response.status_code = 200
@@ -172,10 +176,11 @@ class TestDefiniteMessageClient:
                 "body": "<p>Hello!</p>",
             },
             headers={"Authorization": "Bearer test_api_key"},
+            deadline=None,
         )
         assert result == {"ok": True}
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_email_message_multiple_recipients(self, mock_post, message_client):
         mock_response = Mock()
         mock_response.status_code = 200
@@ -198,9 +203,10 @@ class TestDefiniteMessageClient:
                 "body": "<p>Team update</p>",
             },
             headers={"Authorization": "Bearer test_api_key"},
+            deadline=None,
         )
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_email_message_convenience_method(self, mock_post, message_client):
         mock_response = Mock()
         mock_response.status_code = 200
@@ -221,10 +227,11 @@ class TestDefiniteMessageClient:
                 "body": "<h1>Report</h1>",
             },
             headers={"Authorization": "Bearer test_api_key"},
+            deadline=None,
         )
         assert result == {"ok": True}
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_send_message_with_additional_kwargs(self, mock_post, message_client):
         # Mock response
         mock_response = Mock()
@@ -0,0 +1,107 @@
+import datetime
+import decimal
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from definite_sdk.cache import QueryCache, sql_cache_key
+from definite_sdk.client import DefiniteClient
+from definite_sdk.params import encode_params, params_key
+from tests.mocks import make_response
+
+TEST_API_KEY = "test_api_key"
+
+
+class TestEncodeParams:
+    """Test cases for encoding bound parameters."""
+
+    def test_encodes_values(self):
+        params = [
+            1,
+            "a",
+            None,
+            datetime.date(2024, 5, 1),
+            datetime.datetime(2024, 5, 1, 12, 30),
+            decimal.Decimal("1.10"),
+            (1, 2),
+        ]
+        assert encode_params(params) == [
+            1,
+            "a",
+            None,
+            "2024-05-01",
+            "2024-05-01T12:30:00",
+            "1.10",
+            [1, 2],
+        ]
+        assert encode_params({"day": datetime.date(2024, 5, 1)}) == {
+            "day": "2024-05-01"
+        }
+
+    def test_rejects_unsupported_values(self):
+        with pytest.raises(TypeError):
+            encode_params([object()])
+        with pytest.raises(TypeError):
+            encode_params("abc")
+
+    def test_cache_key_includes_params(self):
+        assert params_key({"b": 1, "a": 2}) == params_key({"a": 2, "b": 1})
+        assert sql_cache_key("SELECT $1", None, [1]) != sql_cache_key(
+            "SELECT $1", None, [2]
+        )
+        assert sql_cache_key("SELECT 1", None) == ("sql", "SELECT 1", None)
+
+
+class TestParameterizedQueries:
+    """Test cases for executing queries with bound parameters."""
+
+    def setup_method(self):
+        self.cache = QueryCache()
+        self.sql_client = DefiniteClient(
+            TEST_API_KEY, query_cache=self.cache
+        ).get_sql_client()
+
+    @patch("requests.Session.post")
+    def test_execute_sends_params(self, mock_post):
+        mock_post.side_effect = lambda *a, **k: make_response({"data": [{"n": 1}]})
+        sql = "SELECT * FROM orders WHERE day = $day"
+
+        self.sql_client.execute(sql, params={"day": datetime.date(2024, 5, 1)})
+
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload == {"sql": sql, "params": {"day": "2024-05-01"}}
+
+    @patch("requests.Session.post")
+    def test_cache_keys_on_template_and_params(self, mock_post):
+        mock_post.side_effect = lambda *a, **k: make_response({"data": []})
+        sql = "SELECT * FROM orders WHERE id = $1"
+
+        self.sql_client.execute(sql, params=[1])
+        self.sql_client.execute(sql, params=[2])
+        self.sql_client.execute(sql, params=(1,))
+
+        assert mock_post.call_count == 2
+        assert self.cache.stats().hits == 1
+
+    @patch("requests.Session.post")
+    def test_execute_many_groups_by_template(self, mock_post):
+        sent = []
+        lock = threading.Lock()
+
+        def post(*args, **kwargs):
+            with lock:
+                sent.append(kwargs["json"]["sql"])
+            return make_response({"data": []})
+
+        mock_post.side_effect = post
+        a = "SELECT * FROM a WHERE id = $1"
+        b = "SELECT * FROM b WHERE id = $1"
+        queries = [(a, [1]), (b, [1]), (a, [2]), "SELECT 1", (b, [2])]
+
+        outcomes = self.sql_client.execute_many(queries, max_workers=1)
+
+        assert sent == [a, a, b, b, "SELECT 1"]
+        assert [outcome.position for outcome in outcomes] == [0, 1, 2, 3, 4]
+        assert [outcome.params for outcome in outcomes] == [[1], [1], [2], None, [2]]
+        assert all(outcome.ok for outcome in outcomes)
@@ -0,0 +1,158 @@
+import json
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from definite_sdk.cache import QueryCache
+from definite_sdk.client import DefiniteClient
+from definite_sdk.profile import QueryProfile, QueryProfileLog, parse_server_timing
+from tests.mocks import make_response
+
+TEST_API_KEY = "test_api_key"
+
+
+def make_profile(kind="sql", total_time=1.0, started_at=0.0, **kwargs):
+    fields = dict(
+        kind=kind,
+        query="SELECT 1",
+        started_at=started_at,
+        total_time=total_time,
+        time_to_first_byte=0.0,
+        transfer_time=0.0,
+        decode_time=0.0,
+        request_bytes=10,
+        response_bytes=100,
+        row_count=1,
+        status_code=200,
+        server_timing={},
+    )
+    fields.update(kwargs)
+    return QueryProfile(**fields)
+
+
+class TestParseServerTiming:
+    """Test cases for reading server-side timing headers."""
+
+    def test_server_timing_header(self):
+        headers = {"Server-Timing": 'db;dur=53.2, cache;desc="Cache", app;dur="4"'}
+        assert parse_server_timing(headers) == {"db": 53.2, "app": 4.0}
+
+    def test_custom_timing_headers(self):
+        headers = {
+            "X-Query-Time": "120",
+            "X-Response-Duration": "15ms",
+            "X-Db-Time": "1.5s",
+            "X-Cache-Elapsed": "soon",
+            "X-Request-Id": "abc",
+            "X-Timezone": "5",
+            "X-Time-Zone-Offset": "60",
+            "Content-Type": "application/json",
+        }
+        assert parse_server_timing(headers) == {
+            "x-query-time": 120.0,
+            "x-response-duration": 15.0,
+            "x-db-time": 1500.0,
+        }
+
+
+class TestQueryProfileLog:
+    """Test cases for the QueryProfileLog class."""
+
+    def test_keeps_latest_profiles(self):
+        log = QueryProfileLog(maxlen=2)
+        for started_at in range(3):
+            log.record(make_profile(started_at=started_at))
+
+        assert len(log) == 2
+        assert [profile.started_at for profile in log] == [1, 2]
+        assert log.last().started_at == 2
+
+    def test_filters_and_slowest(self):
+        log = QueryProfileLog()
+        log.record(make_profile(kind="sql", total_time=0.5))
+        log.record(make_profile(kind="cube", total_time=3.0))
+        log.record(make_profile(kind="sql", total_time=2.0, cached=True))
+
+        assert len(log.profiles(kind="sql")) == 2
+        assert len(log.profiles(min_total_time=1.0)) == 2
+        assert len(log.profiles(cached=False)) == 2
+        assert [p.total_time for p in log.slowest(2)] == [3.0, 2.0]
+
+    def test_summary(self):
+        log = QueryProfileLog()
+        log.record(make_profile(total_time=1.0))
+        log.record(make_profile(total_time=3.0, error="HTTPError()"))
+
+        summary = log.summary()["sql"]
+        assert summary["count"] == 2
+        assert summary["errors"] == 1
+        assert summary["mean_time"] == 2.0
+        assert summary["response_bytes"] == 200
+
+    def test_empty_log(self):
+        log = QueryProfileLog()
+        assert log.last() is None
+        assert log.summary() == {}
+
+
+class TestQueryProfiling:
+    """Test cases for profiling DefiniteSqlClient queries."""
+
+    @patch("requests.Session.post")
+    def test_execute_records_profile(self, mock_post):
+        payload = {"data": [{"id": 1}, {"id": 2}]}
+        mock_post.return_value = make_response(
+            payload, headers={"Server-Timing": "query;dur=12"}
+        )
+        log = QueryProfileLog()
+        client = DefiniteClient(TEST_API_KEY, profile_log=log).get_sql_client()
+
+        client.execute("SELECT id FROM t")
+
+        profile = log.last()
+        assert profile.kind == "sql"
+        assert profile.query == "SELECT id FROM t"
+        assert profile.row_count == 2
+        assert profile.response_bytes == len(json.dumps(payload))
+        assert profile.request_bytes == len(json.dumps({"sql": "SELECT id FROM t"}))
+        assert profile.status_code == 200
+        assert profile.server_timing == {"query": 12.0}
+        assert profile.total_time >= profile.time_to_first_byte >= 0
+        assert not profile.cached and profile.error is None
+
+    @patch("requests.Session.post")
+    def test_cube_query_and_cache_hit(self, mock_post):
+        mock_post.side_effect = lambda *a, **k: make_response({"data": [{"a": 1}]})
+        log = QueryProfileLog()
+        client = DefiniteClient(
+            TEST_API_KEY, query_cache=QueryCache(), profile_log=log
+        ).get_sql_client()
+        cube_query = {"measures": ["sales.total"]}
+
+        client.execute_cube_query(cube_query)
+        client.execute_cube_query(cube_query)
+
+        first, second = log.profiles(kind="cube")
+        assert json.loads(first.query) == cube_query
+        assert not first.cached and first.response_bytes > 0
+        assert second.cached and second.response_bytes == 0
+        assert second.row_count == 1
+        assert mock_post.call_count == 1
+
+    @patch("requests.Session.post")
+    def test_failed_query_records_error(self, mock_post):
+        response = make_response({})
+        response.status_code = 500
+        response.raise_for_status.side_effect = requests.HTTPError("500")
+        mock_post.return_value = response
+        log = QueryProfileLog()
+        client = DefiniteClient(TEST_API_KEY, profile_log=log).get_sql_client()
+
+        with pytest.raises(requests.HTTPError):
+            client.execute("SELECT 1")
+
+        profile = log.last()
+        assert profile.status_code == 500
+        assert "500" in profile.error
+        assert profile.row_count is None
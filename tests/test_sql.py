@@ -1,11 +1,17 @@
+import io
+import json
 import os
-from unittest.mock import Mock, patch
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 
+from definite_sdk import streaming
 from definite_sdk.client import DefiniteClient
 from definite_sdk.sql import DefiniteSqlClient
+from tests.mocks import make_response
 
 # Mock API key for testing
 TEST_API_KEY = "test_api_key"
@@ -25,17 +31,17 @@ class TestDefiniteSqlClient:
         assert self.sql_client._api_key == TEST_API_KEY
         assert self.sql_client._sql_url == "https://api.definite.app/v1/query"
 
-    @patch("definite_sdk.sql.requests.post")
+    @patch("requests.Session.post")
     def test_execute_sql_without_integration_id(self, mock_post):
         """Test executing SQL query without integration ID."""
         # Mock successful response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "data": [{"count": 10}],
-            "columns": ["count"],
-            "success": True,
-        }
-        mock_response.raise_for_status.return_value = None
+        mock_response = make_response(
+            {
+                "data": [{"count": 10}],
+                "columns": ["count"],
+                "success": True,
+            }
+        )
         mock_post.return_value = mock_response
 
         # Execute query
@@ -46,23 +52,26 @@ class TestDefiniteSqlClient:
             "https://api.definite.app/v1/query",
             json={"sql": "SELECT COUNT(*) as count FROM users"},
             headers={"Authorization": "Bearer test_api_key"},
+            idempotent=True,
+            deadline=None,
+            stream=True,
         )
 
         # Verify the result
         assert result["success"] is True
         assert result["data"] == [{"count": 10}]
 
-    @patch("definite_sdk.sql.requests.post")
+    @patch("requests.Session.post")
     def test_execute_sql_with_integration_id(self, mock_post):
         """Test executing SQL query with integration ID."""
         # Mock successful response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "data": [{"id": 1, "name": "John"}],
-            "columns": ["id", "name"],
-            "success": True,
-        }
-        mock_response.raise_for_status.return_value = None
+        mock_response = make_response(
+            {
+                "data": [{"id": 1, "name": "John"}],
+                "columns": ["id", "name"],
+                "success": True,
+            }
+        )
         mock_post.return_value = mock_response
 
         # Execute query
@@ -78,22 +87,25 @@ class TestDefiniteSqlClient:
                 "integration_id": "my_db_integration",
             },
             headers={"Authorization": "Bearer test_api_key"},
+            idempotent=True,
+            deadline=None,
+            stream=True,
         )
 
         # Verify the result
         assert result["success"] is True
         assert result["data"] == [{"id": 1, "name": "John"}]
 
-    @patch("definite_sdk.sql.requests.post")
+    @patch("requests.Session.post")
     def test_execute_cube_query_without_integration_id(self, mock_post):
         """Test executing Cube query without integration ID."""
         # Mock successful response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "data": [{"sales.total_amount": 50000}],
-            "success": True,
-        }
-        mock_response.raise_for_status.return_value = None
+        mock_response = make_response(
+            {
+                "data": [{"sales.total_amount": 50000}],
+                "success": True,
+            }
+        )
         mock_post.return_value = mock_response
 
         # Prepare cube query
@@ -112,22 +124,25 @@ class TestDefiniteSqlClient:
             "https://api.definite.app/v1/query",
             json={"cube_query": cube_query, "persist": True},
             headers={"Authorization": "Bearer test_api_key"},
+            idempotent=True,
+            deadline=None,
+            stream=True,
         )
 
         # Verify the result
         assert result["success"] is True
         assert result["data"] == [{"sales.total_amount": 50000}]
 
-    @patch("definite_sdk.sql.requests.post")
+    @patch("requests.Session.post")
     def test_execute_cube_query_with_integration_id(self, mock_post):
         """Test executing Cube query with integration ID."""
         # Mock successful response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "data": [{"deals.win_rate": 0.85}],
-            "success": True,
-        }
-        mock_response.raise_for_status.return_value = None
+        mock_response = make_response(
+            {
+                "data": [{"deals.win_rate": 0.85}],
+                "success": True,
+            }
+        )
         mock_post.return_value = mock_response
 
         # Prepare cube query
@@ -154,22 +169,25 @@ class TestDefiniteSqlClient:
                 "persist": True,
             },
             headers={"Authorization": "Bearer test_api_key"},
+            idempotent=True,
+            deadline=None,
+            stream=True,
         )
 
         # Verify the result
         assert result["success"] is True
         assert result["data"] == [{"deals.win_rate": 0.85}]
 
-    @patch("definite_sdk.sql.requests.post")
+    @patch("requests.Session.post")
     def test_execute_cube_query_with_raw_parameter(self, mock_post):
         """Test executing Cube query with raw parameter."""
         # Mock successful response
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "raw_data": [{"value": 100}],
-            "success": True,
-        }
-        mock_response.raise_for_status.return_value = None
+        mock_response = make_response(
+            {
+                "raw_data": [{"value": 100}],
+                "success": True,
+            }
+        )
         mock_post.return_value = mock_response
 
         # Prepare cube query
@@ -193,17 +211,20 @@ class TestDefiniteSqlClient:
                 "persist": True,
             },
             headers={"Authorization": "Bearer test_api_key"},
+            idempotent=True,
+            deadline=None,
+            stream=True,
         )
 
         # Verify the result
         assert result["success"] is True
         assert result["raw_data"] == [{"value": 100}]
 
-    @patch("definite_sdk.sql.requests.post")
+    @patch("requests.Session.post")
     def test_execute_sql_http_error(self, mock_post):
         """Test handling of HTTP errors during SQL execution."""
         # Mock error response
-        mock_response = Mock()
+        mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.HTTPError("API Error")
         mock_post.return_value = mock_response
 
@@ -211,11 +232,11 @@ class TestDefiniteSqlClient:
         with pytest.raises(requests.HTTPError):
             self.sql_client.execute("SELECT * FROM non_existent_table")
 
-    @patch("definite_sdk.sql.requests.post")
+    @patch("requests.Session.post")
     def test_execute_cube_query_http_error(self, mock_post):
         """Test handling of HTTP errors during Cube query execution."""
         # Mock error response
-        mock_response = Mock()
+        mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.HTTPError("API Error")
         mock_post.return_value = mock_response
 
@@ -226,6 +247,400 @@ class TestDefiniteSqlClient:
         with pytest.raises(requests.HTTPError):
             self.sql_client.execute_cube_query(cube_query)
 
+    @patch("requests.Session.post")
+    def test_execute_many_returns_outcomes_in_order(self, mock_post):
+        """Test running a batch of queries with a failing query."""
+
+        def respond(url, json, **kwargs):
+            if json["sql"] == "SELECT broken":
+                mock_response = MagicMock()
+                mock_response.raise_for_status.side_effect = requests.HTTPError("400")
+                return mock_response
+            return make_response({"data": [{"sql": json["sql"]}]})
+
+        mock_post.side_effect = respond
+        queries = [f"SELECT {i}" for i in range(20)] + ["SELECT broken"]
+
+        outcomes = self.sql_client.execute_many(queries, max_workers=4)
+
+        assert [outcome.position for outcome in outcomes] == list(range(21))
+        assert [outcome.sql for outcome in outcomes] == queries
+        assert all(outcome.ok for outcome in outcomes[:20])
+        assert outcomes[3].result == {"data": [{"sql": "SELECT 3"}]}
+        assert not outcomes[20].ok
+        assert isinstance(outcomes[20].error, requests.HTTPError)
+        assert mock_post.call_count == 21
+
+    @patch("requests.Session.post")
+    def test_execute_many_iter_yields_as_completed(self, mock_post):
+        """Test that outcomes are yielded as soon as their query finishes."""
+        release = threading.Event()
+
+        def respond(url, json, **kwargs):
+            if json["sql"] == "SELECT slow":
+                assert release.wait(5)
+            return make_response({"data": []})
+
+        mock_post.side_effect = respond
+        outcomes = self.sql_client.execute_many_iter(
+            ["SELECT slow", "SELECT fast"], max_workers=2
+        )
+
+        assert next(outcomes).sql == "SELECT fast"
+        release.set()
+        assert next(outcomes).sql == "SELECT slow"
+
+    @patch("requests.Session.post")
+    def test_execute_many_defaults_to_pool_size(self, mock_post):
+        """Test that the default concurrency is the client's pool size."""
+        mock_post.side_effect = lambda *a, **k: make_response({"data": []})
+        sql_client = DefiniteClient(TEST_API_KEY, pool_maxsize=3).get_sql_client()
+
+        with patch(
+            "definite_sdk.sql.ThreadPoolExecutor", wraps=ThreadPoolExecutor
+        ) as executor:
+            sql_client.execute_many([f"SELECT {i}" for i in range(5)])
+
+        assert executor.call_args.kwargs["max_workers"] == 3
+
+    def test_execute_many_iter_validates_eagerly(self):
+        """Test that invalid arguments raise before iteration starts."""
+        with pytest.raises(ValueError):
+            self.sql_client.execute_many_iter(["SELECT 1"], max_workers=0)
+
+    def test_execute_many_empty_batch(self):
+        """Test that an empty batch makes no requests."""
+        assert self.sql_client.execute_many([]) == []
+
+    @patch("requests.Session.post")
+    def test_execute_iter_streams_batches(self, mock_post):
+        """Test streaming SQL results in batches."""
+        body = json.dumps({"data": [{"id": i} for i in range(5)]}).encode()
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.iter_content.return_value = iter(
+            [body[i:][:4] for i in range(0, len(body), 4)]
+        )
+        mock_post.return_value = mock_response
+
+        batches = list(self.sql_client.execute_iter("SELECT id FROM t", batch_size=2))
+
+        assert batches == [[{"id": 0}, {"id": 1}], [{"id": 2}, {"id": 3}], [{"id": 4}]]
+        mock_post.assert_called_once_with(
+            "https://api.definite.app/v1/query",
+            json={"sql": "SELECT id FROM t"},
+            headers={"Authorization": "Bearer test_api_key"},
+            idempotent=True,
+            deadline=None,
+            stream=True,
+        )
+        mock_response.__exit__.assert_called_once()
+
+    @patch("requests.Session.post")
+    def test_execute_iter_http_error(self, mock_post):
+        """Test handling of HTTP errors when streaming SQL results."""
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.raise_for_status.side_effect = requests.HTTPError("API Error")
+        mock_post.return_value = mock_response
+
+        with pytest.raises(requests.HTTPError):
+            list(self.sql_client.execute_iter("SELECT * FROM non_existent_table"))
+
+    @patch("requests.Session.post")
+    def test_execute_arrow_reads_ipc_stream(self, mock_post):
+        """Test reading an Arrow IPC stream response."""
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table({"id": [1, 2, 3], "name": ["a", "b", None]})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=2)
+
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers = {"Content-Type": "application/vnd.apache.arrow.stream"}
+        mock_response.raw = io.BytesIO(sink.getvalue().to_pybytes())
+        mock_post.return_value = mock_response
+
+        result = self.sql_client.execute_arrow("SELECT id, name FROM t")
+
+        assert result.equals(table)
+        headers = mock_post.call_args.kwargs["headers"]
+        assert headers["Accept"].startswith("application/vnd.apache.arrow.stream")
+        mock_response.__exit__.assert_called_once()
+
+    @patch("requests.Session.post")
+    def test_execute_arrow_falls_back_to_json(self, mock_post):
+        """Test converting a JSON response to Arrow."""
+        pa = pytest.importorskip("pyarrow")
+        rows = [{"id": i, "amount": i * 1.5, "name": f"n{i}"} for i in range(5)]
+        body = json.dumps({"data": rows}).encode()
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.iter_content.return_value = iter([body])
+        mock_post.return_value = mock_response
+
+        reader = self.sql_client.execute_arrow(
+            "SELECT * FROM t", as_reader=True, batch_size=2
+        )
+
+        assert isinstance(reader, pa.RecordBatchReader)
+        batches = list(reader)
+        assert [b.num_rows for b in batches] == [2, 2, 1]
+        assert pa.Table.from_batches(batches).to_pylist() == rows
+
+    def test_json_to_arrow_widens_types(self):
+        """Test that inferred types are widened over the first batches."""
+        pa = pytest.importorskip("pyarrow")
+        from definite_sdk.arrow import rows_to_record_batches
+
+        reader = rows_to_record_batches(
+            [[{"a": 1, "b": None}], [{"a": 2.5, "b": None}], [{"a": 3, "b": "x"}]]
+        )
+
+        assert reader.schema == pa.schema([("a", pa.float64()), ("b", pa.string())])
+        assert reader.read_all().to_pylist() == [
+            {"a": 1.0, "b": None},
+            {"a": 2.5, "b": None},
+            {"a": 3.0, "b": "x"},
+        ]
+
+    def test_json_to_arrow_never_narrows_later_batches(self):
+        """Test that later batches that do not fit the inferred schema raise."""
+        pytest.importorskip("pyarrow")
+        from definite_sdk.arrow import rows_to_record_batches
+
+        reader = rows_to_record_batches([[{"a": 1}], [{"a": 2.5}]])
+        with pytest.raises(ValueError, match="'a'"):
+            reader.read_all()
+
+        reader = rows_to_record_batches([[{"a": 1}], [{"a": 2, "b": "new"}]])
+        with pytest.raises(ValueError, match="'b'"):
+            reader.read_all()
+
+    @patch("requests.Session.post")
+    def test_execute_arrow_uses_response_schema(self, mock_post):
+        """Test converting JSON rows to the types the response declares."""
+        pa = pytest.importorskip("pyarrow")
+        body = json.dumps(
+            {
+                "schema": [
+                    {"name": "id", "type": "BIGINT"},
+                    {"name": "amount", "type": "DECIMAL(18,2)"},
+                    {"name": "day", "type": "DATE"},
+                    {"name": "note", "type": "VARCHAR"},
+                ],
+                "data": [
+                    {"id": 1, "amount": 1, "day": "2024-05-01", "note": None},
+                    {"id": 2, "amount": 2.5, "day": None, "note": None},
+                    {"id": 3, "amount": 3, "day": "2024-05-03", "note": "x", "y": 1},
+                ],
+            }
+        ).encode()
+        mock_response = make_response({})
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.iter_content.return_value = iter([body])
+        mock_post.return_value = mock_response
+
+        table = self.sql_client.execute_arrow("SELECT * FROM t", batch_size=1)
+
+        assert table.schema == pa.schema(
+            [
+                ("id", pa.int64()),
+                ("amount", pa.float64()),
+                ("day", pa.date32()),
+                ("note", pa.string()),
+            ]
+        )
+        assert table.column("amount").to_pylist() == [1.0, 2.5, 3.0]
+
+        mock_response.iter_content.return_value = iter(
+            [b'{"schema": [{"name": "id", "type": "BIGINT"}, "x"], "data": []}']
+        )
+        table = self.sql_client.execute_arrow("SELECT * FROM t")
+        assert table.num_rows == 0
+        assert table.schema == pa.schema([("id", pa.int64()), ("x", pa.string())])
+
+    @pytest.mark.parametrize("use_ijson", [True, False])
+    @pytest.mark.parametrize("num_rows", [10, 20_000])
+    @patch("requests.Session.post")
+    def test_execute_arrow_schema_order(
+        self, mock_post, monkeypatch, use_ijson, num_rows
+    ):
+        """Test that the schema is used the same way for any result size."""
+        pa = pytest.importorskip("pyarrow")
+        if not use_ijson:
+            monkeypatch.setattr(streaming, "ijson", None)
+        schema = [{"name": "day", "type": "DATE"}]
+        rows = [{"day": "2024-05-01"}] * num_rows
+
+        def arrow_type(body):
+            mock_response = make_response({})
+            mock_response.headers = {"Content-Type": "application/json"}
+            chunks = [body[i:][:4096] for i in range(0, len(body), 4096)]
+            mock_response.iter_content.return_value = iter(chunks)
+            mock_post.return_value = mock_response
+            table = self.sql_client.execute_arrow("SELECT day FROM t")
+            return table.schema.field("day").type
+
+        before = json.dumps({"schema": schema, "data": rows}).encode()
+        after = json.dumps({"data": rows, "schema": schema}).encode()
+        assert arrow_type(before) == pa.date32()
+        assert arrow_type(after) == pa.string()
+
+    @patch("requests.Session.post")
+    def test_execute_to_file_parquet_row_groups(self, mock_post, tmp_path):
+        """Test writing a JSON response to Parquet one row group per batch."""
+        pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+
+        rows = [{"id": i, "name": f"n{i}"} for i in range(5)]
+        mock_response = make_response({"data": rows})
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_post.return_value = mock_response
+        path = tmp_path / "out.parquet"
+
+        written = self.sql_client.execute_to_file(
+            "SELECT * FROM t", str(path), batch_size=2
+        )
+
+        assert written == 5
+        assert pq.ParquetFile(path).num_row_groups == 3
+        assert pq.read_table(path).to_pylist() == rows
+        assert not (tmp_path / "out.parquet.part").exists()
+
+    @patch("requests.Session.post")
+    def test_execute_to_file_csv(self, mock_post, tmp_path):
+        """Test writing an Arrow IPC response to CSV."""
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table({"id": [1, 2], "name": ["a", "b"]})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.headers = {"Content-Type": "application/vnd.apache.arrow.stream"}
+        mock_response.raw = io.BytesIO(sink.getvalue().to_pybytes())
+        mock_post.return_value = mock_response
+        path = tmp_path / "out.csv"
+
+        assert self.sql_client.execute_to_file("SELECT 1", str(path), "csv") == 2
+        assert path.read_text().splitlines() == ['"id","name"', '1,"a"', '2,"b"']
+
+    @patch("requests.Session.post")
+    def test_execute_to_file_ndjson(self, mock_post, tmp_path):
+        """Test writing rows as newline-delimited JSON."""
+        rows = [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": []}]
+        mock_post.return_value = make_response({"data": rows})
+        path = tmp_path / "out.ndjson"
+
+        assert self.sql_client.execute_to_file("SELECT 1", str(path), "ndjson") == 2
+        assert [json.loads(line) for line in path.read_text().splitlines()] == rows
+
+    @patch("requests.Session.post")
+    def test_execute_to_file_failure_leaves_no_file(self, mock_post, tmp_path):
+        """Test that a failed download does not leave a partial file."""
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.iter_content.return_value = iter([b'{"data": [{"id": 1}, {'])
+        mock_post.return_value = mock_response
+        path = tmp_path / "out.ndjson"
+
+        with pytest.raises(ValueError):
+            self.sql_client.execute_to_file("SELECT 1", str(path), "ndjson")
+        assert list(tmp_path.iterdir()) == []
+
+    @patch("requests.Session.post")
+    def test_execute_into_duckdb(self, mock_post):
+        """Test loading a result into a local DuckDB table."""
+        pa = pytest.importorskip("pyarrow")
+        duckdb = pytest.importorskip("duckdb")
+
+        def respond(*args, **kwargs):
+            table = pa.table({"region": ["EU", "US"], "total": [5.0, 7.5]})
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            mock_response = MagicMock()
+            mock_response.__enter__.return_value = mock_response
+            mock_response.headers = {
+                "Content-Type": "application/vnd.apache.arrow.stream"
+            }
+            mock_response.raw = io.BytesIO(sink.getvalue().to_pybytes())
+            return mock_response
+
+        mock_post.side_effect = respond
+        conn = duckdb.connect()
+        conn.execute("CREATE SCHEMA remote")
+
+        loaded = self.sql_client.execute_into_duckdb(
+            "SELECT region, total FROM sales", conn, "remote.totals"
+        )
+        assert loaded == 2
+        assert conn.sql("SELECT * FROM remote.totals ORDER BY 1").fetchall() == [
+            ("EU", 5.0),
+            ("US", 7.5),
+        ]
+
+        self.sql_client.execute_into_duckdb(
+            "SELECT region, total FROM sales", conn, "remote.totals", if_exists="append"
+        )
+        assert conn.sql("SELECT COUNT(*) FROM remote.totals").fetchone() == (4,)
+
+        with pytest.raises(duckdb.CatalogException):
+            self.sql_client.execute_into_duckdb(
+                "SELECT 1", conn, "remote.totals", if_exists="fail"
+            )
+        views = conn.sql("SELECT view_name FROM duckdb_views() WHERE NOT internal")
+        assert views.fetchall() == []
+
+    @patch("requests.Session.post")
+    def test_execute_into_duckdb_empty_result(self, mock_post):
+        """Test loading an empty JSON result into DuckDB."""
+        pytest.importorskip("pyarrow")
+        duckdb = pytest.importorskip("duckdb")
+        schema = [{"name": "id", "type": "BIGINT"}, {"name": "day", "type": "DATE"}]
+        conn = duckdb.connect()
+
+        mock_post.return_value = make_response({"schema": schema, "data": []})
+        mock_post.return_value.headers = {}
+        assert self.sql_client.execute_into_duckdb("SELECT 1", conn, "t") == 0
+        assert conn.sql("DESCRIBE t").fetchall()[1][:2] == ("day", "DATE")
+
+        responses = []
+
+        def respond(*args, **kwargs):
+            responses.append(make_response({"data": []}))
+            responses[-1].headers = {}
+            return responses[-1]
+
+        mock_post.side_effect = respond
+        with pytest.raises(ValueError, match="declare its columns"):
+            self.sql_client.execute_into_duckdb("SELECT 1", conn, "t")
+        assert (
+            self.sql_client.execute_into_duckdb(
+                "SELECT 1", conn, "t", if_exists="append"
+            )
+            == 0
+        )
+        for response in responses:
+            response.close.assert_called()
+
+    @patch("requests.Session.post")
+    def test_execute_into_duckdb_closes_unread_response(self, mock_post):
+        """Test closing the response when the statement fails before reading."""
+        pytest.importorskip("pyarrow")
+        duckdb = pytest.importorskip("duckdb")
+        mock_post.return_value = make_response({"data": [{"n": 1}]})
+        mock_post.return_value.headers = {}
+        conn = duckdb.connect()
+        conn.execute("CREATE TABLE t (n INTEGER)")
+
+        with pytest.raises(duckdb.CatalogException):
+            self.sql_client.execute_into_duckdb("SELECT 1", conn, "t", if_exists="fail")
+        mock_post.return_value.close.assert_called_once()
+
 
 # Integration tests (require real API key)
 @pytest.mark.integration
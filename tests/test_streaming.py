@@ -0,0 +1,177 @@
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from definite_sdk import streaming
+from definite_sdk.exceptions import DeadlineExceededError
+from definite_sdk.streaming import (
+    JsonArrayStream,
+    iter_json_array,
+    iter_response_chunks,
+    load_json,
+    read_json_response,
+)
+from definite_sdk.transport import Deadline
+
+BODY = json.dumps(
+    {
+        "columns": ["id", "name", "score"],
+        "data": [
+            {"id": i, "name": f'naïve "{i}"', "score": i * 1.5 - 1000}
+            for i in range(50)
+        ],
+        "meta": {"nested": [1, {"x": None}], "ok": True},
+    }
+).encode()
+
+
+def split(body, size):
+    return [body[i:][:size] for i in range(0, len(body), size)]
+
+
+class TestJsonArrayStream:
+    """Test cases for incremental response parsing."""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100_000])
+    def test_items_match_full_parse(self, size):
+        stream = JsonArrayStream("data")
+        items = []
+        for chunk in split(BODY, size):
+            items.extend(stream.feed(chunk))
+        items.extend(stream.close())
+
+        expected = json.loads(BODY)
+        assert items == expected["data"]
+        assert stream.fields == {
+            "columns": expected["columns"],
+            "meta": expected["meta"],
+        }
+
+    def test_items_yielded_before_body_ends(self):
+        stream = JsonArrayStream("data")
+        assert stream.feed(b'{"data": [{"a": 1}, {"a": 2}, ') == [{"a": 1}, {"a": 2}]
+
+    def test_number_split_across_chunks(self):
+        assert list(iter_json_array([b'{"data": [12', b"34, 5", b"6]}"])) == [1234, 56]
+
+    def test_empty_and_missing_array(self):
+        assert list(iter_json_array([b'{"data": []}'])) == []
+        assert list(iter_json_array([b'{"success": true}'])) == []
+
+    def test_truncated_body_raises(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array([b'{"data": [{"a": 1}, {"a"']))
+
+    def test_non_object_body_raises(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array([b"[1, 2, 3]"]))
+
+
+@pytest.fixture(params=["ijson", "python"])
+def backend(request, monkeypatch):
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(streaming, "ijson", None)
+    return request.param
+
+
+class TestJsonBackends:
+    """Test cases that run against both the ijson and pure Python parsers."""
+
+    @pytest.mark.parametrize("size", [1, 7, 100_000])
+    def test_load_json_matches_full_parse(self, backend, size):
+        assert load_json(split(BODY, size)) == json.loads(BODY)
+
+    def test_load_json_without_data(self, backend):
+        assert load_json([b'{"success": true, "data": null}']) == {
+            "success": True,
+            "data": None,
+        }
+
+    def test_iter_json_array(self, backend):
+        items = list(iter_json_array(split(BODY, 5)))
+        assert items == json.loads(BODY)["data"]
+
+    @pytest.mark.parametrize("size", [5, len(BODY)])
+    def test_iter_json_array_fields(self, backend, size):
+        fields = {}
+        items = iter_json_array(split(BODY, size), fields=fields)
+
+        next(items)
+        assert fields == {"columns": ["id", "name", "score"]}
+        list(items)
+        # Fields after a non-empty array are skipped however the body is split.
+        assert fields == {"columns": ["id", "name", "score"]}
+
+        fields = {}
+        body = b'{"schema": [{"name": "a", "type": "INT"}], "data": [], "n": {"x": 1}}'
+        assert list(iter_json_array(split(body, 3), fields=fields)) == []
+        assert fields == {"schema": [{"name": "a", "type": "INT"}], "n": {"x": 1}}
+
+    def test_invalid_bodies_raise(self, backend):
+        with pytest.raises(ValueError):
+            load_json([b'{"data": [1, 2'])
+        with pytest.raises(ValueError):
+            list(iter_json_array([b"[1, 2, 3]"]))
+
+    def test_read_json_response(self, backend):
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_content.return_value = iter(split(BODY, 1000))
+
+        body = read_json_response(response)
+
+        assert body.value == json.loads(BODY)
+        assert body.size == len(BODY)
+        assert body.transfer_time >= 0 and body.decode_time >= 0
+        response.__exit__.assert_called_once()
+
+    def test_read_json_response_error_status(self, backend):
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.raise_for_status.side_effect = requests.HTTPError("500")
+
+        with pytest.raises(requests.HTTPError):
+            read_json_response(response)
+        response.__exit__.assert_called_once()
+
+
+class TestIterResponseChunks:
+    """Test cases for reading a response body within a deadline."""
+
+    def stalled_response(self, stall):
+        def content(chunk_size):
+            yield b'{"data": ['
+            time.sleep(stall)
+            raise requests.ConnectionError("Read timed out.")
+
+        response = MagicMock()
+        response.iter_content.side_effect = content
+        return response
+
+    def test_read_timeout_after_deadline(self):
+        chunks = iter_response_chunks(self.stalled_response(0.05), Deadline(0.01))
+        assert next(chunks) == b'{"data": ['
+        with pytest.raises(DeadlineExceededError):
+            next(chunks)
+
+    def test_read_timeout_before_deadline(self):
+        chunks = iter_response_chunks(self.stalled_response(0), Deadline(60))
+        next(chunks)
+        with pytest.raises(requests.ConnectionError) as excinfo:
+            next(chunks)
+        assert not isinstance(excinfo.value, DeadlineExceededError)
+
+    def test_deadline_checked_between_chunks(self):
+        response = MagicMock()
+        response.iter_content.return_value = iter([b"{", b"}"])
+        deadline = Deadline(0.01)
+        chunks = iter_response_chunks(response, deadline)
+        assert next(chunks) == b"{"
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceededError):
+            next(chunks)
@@ -0,0 +1,278 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from definite_sdk.client import DefiniteClient
+from definite_sdk.exceptions import CircuitOpenError, DeadlineExceededError
+from definite_sdk.sql import DefiniteSqlClient
+from definite_sdk.transport import (
+    Deadline,
+    DefiniteSession,
+    RetryPolicy,
+    endpoint_key,
+)
+from tests.mocks import make_response
+
+TEST_API_KEY = "test_api_key"
+
+
+class TestDefiniteSession:
+    """Test cases for the pooled HTTP session."""
+
+    def test_pool_size_is_configurable(self):
+        session = DefiniteSession(pool_connections=3, pool_maxsize=25)
+        adapter = session.get_adapter("https://api.definite.app")
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 25
+
+    def test_client_shares_session_with_sub_clients(self):
+        client = DefiniteClient(TEST_API_KEY, pool_maxsize=4)
+        sessions = {
+            id(client.get_sql_client()._session),
+            id(client.get_secret_store()._session),
+            id(client.get_integration_store()._session),
+            id(client.get_message_client()._session),
+        }
+        assert sessions == {id(client._session)}
+
+    def test_standalone_client_creates_own_session(self):
+        sql_client = DefiniteSqlClient(TEST_API_KEY, "https://api.definite.app")
+        assert isinstance(sql_client._session, DefiniteSession)
+
+
+@patch("definite_sdk.transport.time.sleep")
+class TestRetryPolicy:
+    """Test cases for retries and circuit breaking in DefiniteSession."""
+
+    def test_retries_idempotent_call_on_503(self, mock_sleep):
+        session = DefiniteSession(retry_policy=RetryPolicy(max_attempts=3))
+        responses = [
+            make_response(status_code=503),
+            make_response(status_code=502),
+            make_response(status_code=200),
+        ]
+        with patch("requests.Session.request", side_effect=responses) as mock_req:
+            response = session.get("https://api.definite.app/v1/store/s")
+
+        assert response.status_code == 200
+        assert mock_req.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    def test_gives_up_after_max_attempts(self, mock_sleep):
+        session = DefiniteSession(retry_policy=RetryPolicy(max_attempts=2))
+        responses = [make_response(status_code=503), make_response(status_code=503)]
+        with patch("requests.Session.request", side_effect=responses):
+            response = session.post(
+                "https://api.definite.app/v1/query", json={}, idempotent=True
+            )
+
+        assert response.status_code == 503
+
+    def test_respects_retry_after(self, mock_sleep):
+        session = DefiniteSession()
+        responses = [
+            make_response(status_code=429, headers={"Retry-After": "7"}),
+            make_response(status_code=200),
+        ]
+        with patch("requests.Session.request", side_effect=responses):
+            session.get("https://api.definite.app/v1/api/secret")
+
+        mock_sleep.assert_called_once_with(7.0)
+
+    def test_non_idempotent_post_not_retried_on_5xx(self, mock_sleep):
+        session = DefiniteSession()
+        with patch(
+            "requests.Session.request", return_value=make_response(status_code=502)
+        ) as mock_req:
+            response = session.post("https://api.definite.app/v1/store", json={})
+
+        assert response.status_code == 502
+        assert mock_req.call_count == 1
+
+    def test_non_idempotent_post_retried_on_429(self, mock_sleep):
+        session = DefiniteSession()
+        responses = [make_response(status_code=429), make_response(status_code=200)]
+        with patch("requests.Session.request", side_effect=responses) as mock_req:
+            session.post("https://api.definite.app/v1/store", json={})
+
+        assert mock_req.call_count == 2
+
+    def test_non_idempotent_post_not_retried_after_read_timeout(self, mock_sleep):
+        session = DefiniteSession()
+        with patch(
+            "requests.Session.request", side_effect=requests.ReadTimeout()
+        ) as mock_req:
+            with pytest.raises(requests.ReadTimeout):
+                session.post("https://api.definite.app/v1/store", json={})
+
+        assert mock_req.call_count == 1
+
+    def test_circuit_opens_and_fails_fast(self, mock_sleep):
+        policy = RetryPolicy(max_attempts=1, circuit_failure_threshold=2)
+        session = DefiniteSession(retry_policy=policy)
+        with patch(
+            "requests.Session.request", return_value=make_response(status_code=503)
+        ) as mock_req:
+            session.get("https://api.definite.app/v1/query/a")
+            session.get("https://api.definite.app/v1/query/b")
+            with pytest.raises(CircuitOpenError):
+                session.get("https://api.definite.app/v1/query/c")
+            # Other endpoints are not affected.
+            session.get("https://api.definite.app/v1/store/s")
+
+        assert mock_req.call_count == 3
+
+    def test_circuit_closes_after_successful_trial(self, mock_sleep):
+        policy = RetryPolicy(
+            max_attempts=1, circuit_failure_threshold=1, circuit_reset_timeout=0
+        )
+        session = DefiniteSession(retry_policy=policy)
+        responses = [
+            make_response(status_code=503),
+            make_response(status_code=200),
+            make_response(status_code=200),
+        ]
+        with patch("requests.Session.request", side_effect=responses):
+            session.get("https://api.definite.app/v1/query")
+            session.get("https://api.definite.app/v1/query")
+            session.get("https://api.definite.app/v1/query")
+
+        breaker = session.circuit_breakers.for_url("https://api.definite.app/v1/query")
+        assert not breaker.is_open
+
+    def test_failed_trial_does_not_leave_circuit_stuck(self, mock_sleep):
+        policy = RetryPolicy(
+            max_attempts=1, circuit_failure_threshold=1, circuit_reset_timeout=0
+        )
+        session = DefiniteSession(retry_policy=policy)
+        url = "https://api.definite.app/v1/query"
+        responses = [
+            make_response(status_code=503),
+            requests.TooManyRedirects("Exceeded 30 redirects."),
+            ValueError("unexpected"),
+            make_response(status_code=200),
+        ]
+        with patch("requests.Session.request", side_effect=responses):
+            session.get(url)
+            with pytest.raises(requests.TooManyRedirects):
+                session.get(url)
+            with pytest.raises(ValueError):
+                session.get(url)
+            session.get(url)
+
+        assert not session.circuit_breakers.for_url(url).is_open
+
+
+def test_endpoint_key():
+    assert endpoint_key("https://api.definite.app/v1/store/s") == (
+        "api.definite.app/v1/store"
+    )
+    assert endpoint_key("https://api.definite.app/v1/api/integrations/x/syncs") == (
+        "api.definite.app/v1/api/integrations"
+    )
+    assert endpoint_key("https://api.definite.app/v3/slack/message") == (
+        "api.definite.app/v3/slack"
+    )
+
+
+class TestTimeoutsAndDeadlines:
+    """Test cases for client timeouts and per-call deadlines."""
+
+    def test_default_timeouts_are_applied(self):
+        session = DefiniteSession(connect_timeout=3, read_timeout=20)
+        with patch(
+            "requests.Session.request", return_value=make_response(status_code=200)
+        ) as mock_req:
+            session.get("https://api.definite.app/v1/store/s")
+
+        assert mock_req.call_args.kwargs["timeout"] == (3, 20)
+
+    def test_deadline_shortens_timeouts(self):
+        session = DefiniteSession(connect_timeout=3, read_timeout=20)
+        with patch(
+            "requests.Session.request", return_value=make_response(status_code=200)
+        ) as mock_req:
+            session.get("https://api.definite.app/v1/store/s", deadline=1.0)
+
+        connect, read = mock_req.call_args.kwargs["timeout"]
+        assert 0 < connect <= 1.0 and 0 < read <= 1.0
+
+    def test_expired_deadline_fails_without_request(self):
+        session = DefiniteSession()
+        with patch("requests.Session.request") as mock_req:
+            with pytest.raises(DeadlineExceededError):
+                session.get("https://api.definite.app/v1/store/s", deadline=0)
+
+        mock_req.assert_not_called()
+
+    def test_deadline_too_short_for_retry_after(self):
+        session = DefiniteSession()
+        with patch(
+            "requests.Session.request",
+            return_value=make_response(status_code=503, headers={"Retry-After": "10"}),
+        ) as mock_req:
+            with pytest.raises(DeadlineExceededError):
+                session.get("https://api.definite.app/v1/store/s", deadline=1.0)
+
+        assert mock_req.call_count == 1
+
+    def test_deadline_is_a_timeout(self):
+        assert issubclass(DeadlineExceededError, requests.Timeout)
+
+    def test_deadline_shared_across_calls(self):
+        deadline = Deadline(5)
+        assert Deadline.coerce(deadline) is deadline
+        assert 0 < Deadline.coerce(5).remaining() <= 5
+        assert Deadline.coerce(None) is None
+
+
+@pytest.fixture
+def stalling_server():
+    """A server that sends the start of a query result and then stalls."""
+    release = threading.Event()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = b'{"data": [{"a": 1}, '
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", "1000")
+            self.end_headers()
+            self.wfile.write(body)
+            self.wfile.flush()
+            release.wait(5)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    release.set()
+    server.shutdown()
+    server.server_close()
+
+
+class TestDeadlineWhileReadingBody:
+    """Test cases for deadlines that run out while a response body streams."""
+
+    def test_execute(self, stalling_server):
+        sql_client = DefiniteSqlClient(TEST_API_KEY, stalling_server)
+        with pytest.raises(DeadlineExceededError):
+            sql_client.execute("SELECT 1", deadline=0.5)
+
+    def test_execute_iter(self, stalling_server):
+        sql_client = DefiniteSqlClient(TEST_API_KEY, stalling_server)
+        with pytest.raises(DeadlineExceededError):
+            list(sql_client.execute_iter("SELECT 1", deadline=0.5))
+
+    def test_execute_arrow(self, stalling_server):
+        pytest.importorskip("pyarrow")
+        sql_client = DefiniteSqlClient(TEST_API_KEY, stalling_server)
+        with pytest.raises(DeadlineExceededError):
+            sql_client.execute_arrow("SELECT 1", deadline=0.5).read_all()